@@ -0,0 +1,102 @@
+"""Compare the sync and async database paths under concurrent requests.
+
+Usage: python benchmarks/bench_async.py [--requests N] [--concurrency C]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import APIRouter, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.connection import (
+    dispose_async_engine,
+    dispose_engine,
+    get_engine,
+)
+from projeto_final_poo.db.models import Address, Client, table_registry
+from projeto_final_poo.helpers.settings import env
+from projeto_final_poo.routers import client
+from projeto_final_poo.routers.aio import client as aio_client
+
+PAGE_SIZE = 20
+
+
+def seed(clients: int) -> None:
+    engine = get_engine()
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        for i in range(clients):
+            db_client = Client(name=f'Client {i}', phone_number=f'{i:011d}')
+            db_client.addresses.append(
+                Address(
+                    street=f'{i} Elm St',
+                    neighborhood=f'Neighborhood {i % 10}',
+                    reference=f'Reference {i}',
+                    number=str(i),
+                    client_id=db_client.id,
+                )
+            )
+            session.add(db_client)
+
+        session.commit()
+
+
+async def run(router: APIRouter, requests: int, concurrency: int) -> float:
+    app = FastAPI()
+    app.include_router(router)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://bench'
+    ) as http:
+
+        async def request(i: int) -> None:
+            async with semaphore:
+                response = await http.get(
+                    '/clients/',
+                    params={'limit': PAGE_SIZE, 'offset': i % 50},
+                )
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request(i) for i in range(requests)))
+
+        return time.perf_counter() - start
+
+
+async def main(requests: int, concurrency: int, clients: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        env.DATABASE_URL = f'sqlite:///{Path(directory) / "bench.db"}'
+        seed(clients)
+
+        for mode, router in (
+            ('sync', client.router),
+            ('async', aio_client.router),
+        ):
+            await run(router, concurrency, concurrency)  # warm up the pool
+            elapsed = await run(router, requests, concurrency)
+            print(
+                f'{mode:>5}: {requests} requests in {elapsed:.2f}s '
+                f'({requests / elapsed:.0f} req/s, '
+                f'concurrency {concurrency})'
+            )
+
+        dispose_engine()
+        await dispose_async_engine()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--clients', type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.clients))
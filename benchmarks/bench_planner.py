@@ -0,0 +1,123 @@
+"""Time planning a busy day: load its schedules and split them into routes.
+
+Usage: python benchmarks/bench_planner.py [--jobs N] [--technicians T]
+"""
+
+import argparse
+import datetime
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.models import (
+    Address,
+    Client,
+    Schedule,
+    Service,
+    ShiftEnum,
+    table_registry,
+)
+from projeto_final_poo.db.planner import assign, plan, plan_rows
+
+CLIENTS = 20_000
+NEIGHBORHOODS = 60
+DAY = datetime.date(2024, 10, 1)
+OTHER_DAYS = 30
+
+
+def seed(session: Session, jobs: int) -> None:
+    session.execute(
+        insert(Service),
+        [{'type': 'Cleaning', 'description': 'Bench', 'price': 100}],
+    )
+    session.execute(
+        insert(Client),
+        [
+            {'name': f'Client {i}', 'phone_number': f'{i:011d}'}
+            for i in range(CLIENTS)
+        ],
+    )
+    session.execute(
+        insert(Address),
+        [
+            {
+                'client_id': i + 1,
+                'street': f'{i} Elm St',
+                'neighborhood': f'Neighborhood {i % NEIGHBORHOODS}',
+                'reference': f'Reference {i}',
+                'number': str(i),
+            }
+            for i in range(CLIENTS)
+        ],
+    )
+
+    # The planned day plus a month of equally busy days around it.
+    shifts = list(ShiftEnum)
+    for offset in range(-OTHER_DAYS // 2, OTHER_DAYS // 2 + 1):
+        session.execute(
+            insert(Schedule),
+            [
+                {
+                    'client_id': random.randint(1, CLIENTS),
+                    'service_id': 1,
+                    'date': DAY + datetime.timedelta(days=offset),
+                    'shift': random.choice(shifts),
+                    'description': 'Bench',
+                }
+                for _ in range(jobs)
+            ],
+        )
+    session.commit()
+
+
+def main(jobs: int, technicians: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f'sqlite:///{Path(tmp) / "bench.db"}')
+        table_registry.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            seed(session, jobs)
+
+            start = time.perf_counter()
+            rows = session.execute(plan_rows(DAY)).all()
+            loaded = time.perf_counter()
+            day = plan(rows, DAY, technicians)
+            planned = time.perf_counter()
+
+        engine.dispose()
+
+    shifts = {}
+    for row in rows:
+        shifts.setdefault(row.shift, []).append(row)
+    start_assign = time.perf_counter()
+    for shift_rows in shifts.values():
+        assign(shift_rows, technicians)
+    assigned = time.perf_counter() - start_assign
+
+    routes = [route for shift in day['shifts'] for route in shift['routes']]
+    loads = [len(route['schedules']) for route in routes]
+    split = sum(len(route['neighborhoods']) for route in routes)
+    print(
+        f'{len(rows):,} jobs, {technicians} technicians per shift: '
+        f'query {(loaded - start) * 1000:.0f} ms, '
+        f'plan {(planned - loaded) * 1000:.0f} ms '
+        f'(assignment {assigned * 1000:.0f} ms), '
+        f'total {(planned - start) * 1000:.0f} ms'
+    )
+    print(
+        f'{min(loads)}-{max(loads)} jobs per route, '
+        f'{split / len(routes):.1f} neighborhoods per route'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--technicians', type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.jobs, args.technicians)
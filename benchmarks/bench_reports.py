@@ -0,0 +1,137 @@
+"""Time year-to-date revenue and utilization reports.
+
+Seeds a year of schedules ending today, then runs each report cold (closed
+months rolled up on the way) and warm (served from the rollups).
+
+Usage: python benchmarks/bench_reports.py [--schedules N] [--repeat R]
+"""
+
+import argparse
+import datetime
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.models import (
+    Address,
+    Client,
+    Schedule,
+    Service,
+    ShiftEnum,
+    table_registry,
+)
+from projeto_final_poo.db.reports import revenue_report, utilization_report
+from projeto_final_poo.db.slots import rebuild
+
+CLIENTS = 10_000
+SERVICES = 20
+BATCH = 50_000
+
+
+def seed(session: Session, schedules: int) -> None:
+    session.execute(
+        insert(Service),
+        [
+            {'type': f'Service {i}', 'description': 'Bench', 'price': 50 + i}
+            for i in range(SERVICES)
+        ],
+    )
+    session.execute(
+        insert(Client),
+        [
+            {'name': f'Client {i}', 'phone_number': f'{i:011d}'}
+            for i in range(CLIENTS)
+        ],
+    )
+    session.execute(
+        insert(Address),
+        [
+            {
+                'client_id': i + 1,
+                'street': f'{i} Elm St',
+                'neighborhood': f'Neighborhood {i % 50}',
+                'reference': f'Reference {i}',
+                'number': str(i),
+            }
+            for i in range(CLIENTS)
+        ],
+    )
+
+    today = datetime.date.today()
+    shifts = list(ShiftEnum)
+    for offset in range(0, schedules, BATCH):
+        rows = []
+        for _ in range(min(BATCH, schedules - offset)):
+            service = random.randint(1, SERVICES)
+            days_ago = datetime.timedelta(days=random.randint(0, 364))
+            rows.append({
+                'client_id': random.randint(1, CLIENTS),
+                'service_id': service,
+                'date': today - days_ago,
+                'shift': random.choice(shifts),
+                'description': 'Bench',
+                'price': 49 + service,
+            })
+        session.execute(insert(Schedule), rows)
+
+    rebuild(session)
+    session.commit()
+
+
+def timed(report: Callable[[], list], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        report()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main(schedules: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f'sqlite:///{Path(tmp) / "bench.db"}')
+        table_registry.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            seed(session, schedules)
+
+            end = datetime.date.today()
+            start = end.replace(month=1, day=1)
+            cases = {
+                'revenue': lambda: revenue_report(
+                    session, start, end, 'month'
+                ),
+                'revenue by neighborhood': lambda: revenue_report(
+                    session, start, end, 'month', 'neighborhood'
+                ),
+                'utilization by service': lambda: utilization_report(
+                    session, start, end, 'month', by_service=True
+                ),
+            }
+
+            print(f'{schedules:,} schedules, {start} to {end}')
+            for name, report in cases.items():
+                cold = timed(report, 1)
+                session.commit()
+                warm = timed(report, repeat)
+                print(
+                    f'{name:>24}: cold {cold * 1000:.0f} ms, '
+                    f'warm {warm * 1000:.0f} ms'
+                )
+
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--schedules', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.schedules, args.repeat)
@@ -0,0 +1,126 @@
+"""Compare the FTS5 client search with a LIKE '%...%' scan.
+
+Usage: python benchmarks/bench_search.py [--clients N] [--repeat R]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.models import Address, Client, table_registry
+from projeto_final_poo.db.queries import client_matches
+
+BATCH = 50_000
+LIMIT = 20
+FIRST_NAMES = (
+    'Ana João Maria José Francisca Antônio Adriana Carlos Juliana Paulo '
+    'Márcia Lucas Fernanda Pedro Aline Rafael Patrícia Marcos Camila Raimundo'
+).split()
+LAST_NAMES = (
+    'Silva Santos Oliveira Souza Rodrigues Ferreira Alves Pereira Lima Gomes '
+    'Costa Ribeiro Martins Carvalho Almeida Lopes Soares Fernandes Vieira '
+    'Barbosa Rocha Dias Nascimento Andrade Moreira'
+).split()
+NEIGHBORHOODS = [
+    'Centro',
+    'Aldeota',
+    'Meireles',
+    'Benfica',
+    'São Gerardo',
+    'Fátima',
+    'Messejana',
+    'Parangaba',
+    'Montese',
+    'Papicu',
+    'Cocó',
+    'Varjota',
+]
+QUERIES = [
+    'silv',
+    'maria olive',
+    'sao ger',
+    'adriana barbosa rocha papicu',
+    'zzz',
+]
+
+
+def seed(session: Session, clients: int) -> None:
+    for offset in range(0, clients, BATCH):
+        ids = range(offset + 1, min(offset + BATCH, clients) + 1)
+        session.execute(
+            insert(Client),
+            [
+                {
+                    'id': i,
+                    'name': ' '.join([
+                        random.choice(FIRST_NAMES),
+                        *random.sample(LAST_NAMES, 2),
+                    ]),
+                    'phone_number': f'{i:011d}',
+                }
+                for i in ids
+            ],
+        )
+        session.execute(
+            insert(Address),
+            [
+                {
+                    'client_id': i,
+                    'street': f'Rua {random.choice(LAST_NAMES)}',
+                    'neighborhood': random.choice(NEIGHBORHOODS),
+                    'reference': f'Casa {i % 500}',
+                    'number': str(i % 2000),
+                }
+                for i in ids
+            ],
+        )
+    session.commit()
+
+
+def timed(session: Session, q: str, dialect: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        session.scalars(client_matches(q, dialect).limit(LIMIT)).all()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main(clients: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f'sqlite:///{Path(tmp) / "bench.db"}')
+        table_registry.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            start = time.perf_counter()
+            seed(session, clients)
+            print(
+                f'{clients:,} clients indexed in '
+                f'{time.perf_counter() - start:.1f} s'
+            )
+
+            for q in QUERIES:
+                # 'default' takes the LIKE path the other backends use.
+                fts = timed(session, q, 'sqlite', repeat)
+                scan = timed(session, q, 'default', 1)
+                print(
+                    f'{q!r:>16}: fts5 {fts * 1000:.1f} ms, '
+                    f'like scan {scan * 1000:.0f} ms'
+                )
+
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clients', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.clients, args.repeat)
@@ -0,0 +1,155 @@
+"""Measure the cost of serializing list responses per 1,000 rows.
+
+Compares FastAPI's response_model path (validation, jsonable conversion and
+json.dumps) with the fast path used by the list handlers.
+
+Usage: python benchmarks/bench_serialization.py [--rows N] [--repeat R]
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import time
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, selectinload
+
+from projeto_final_poo.db.models import (
+    Address,
+    Client,
+    Schedule,
+    Service,
+    ShiftEnum,
+    table_registry,
+)
+from projeto_final_poo.db.queries import schedule_from_row, schedule_page
+from projeto_final_poo.db.queries import schedule_rows as schedule_query
+from projeto_final_poo.helpers.serialization import (
+    model_response,
+    trusted_response,
+)
+from projeto_final_poo.schemas.schemas import ClientList, ScheduleList
+
+
+def seed(session: Session, rows: int) -> None:
+    service = Service(type='Instalação', description='Split', price=250.0)
+    session.add(service)
+
+    for i in range(rows):
+        client = Client(name=f'Client {i}', phone_number=f'{i:011d}')
+        client.addresses.append(
+            Address(
+                street=f'{i} Elm St',
+                neighborhood=f'Neighborhood {i % 10}',
+                reference=f'Reference {i}',
+                number=str(i),
+                client_id=client.id,
+            )
+        )
+        session.add(client)
+    session.flush()
+
+    shifts = list(ShiftEnum)
+    session.add_all(
+        Schedule(
+            client_id=i + 1,
+            service_id=service.id,
+            date=datetime.date(2024, 1, 1) + datetime.timedelta(days=i),
+            shift=shifts[i % len(shifts)],
+            description=f'Schedule {i}',
+        )
+        for i in range(rows)
+    )
+    session.commit()
+
+
+loop = asyncio.new_event_loop()
+
+
+def response_model_body(schema: type, content: dict) -> bytes:
+    field = create_model_field(name='response', type_=schema)
+    serialized = loop.run_until_complete(
+        serialize_response(
+            field=field, response_content=content, exclude_none=True
+        )
+    )
+
+    return JSONResponse(serialized).body
+
+
+def timed(render: Callable[[], bytes], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main(rows: int, repeat: int) -> None:
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        seed(session, rows)
+
+        clients = session.scalars(
+            select(Client).options(selectinload(Client.addresses))
+        ).all()
+        schedule_rows = session.execute(schedule_query()).all()
+
+        cases = {
+            'clients': (
+                lambda: response_model_body(
+                    ClientList, {'clients': clients, 'next_cursor': None}
+                ),
+                lambda: model_response(
+                    ClientList,
+                    {'clients': clients, 'next_cursor': None},
+                    exclude_none=True,
+                ).body,
+            ),
+            'schedules': (
+                lambda: response_model_body(
+                    ScheduleList,
+                    {
+                        'schedules': [
+                            schedule_from_row(row) for row in schedule_rows
+                        ],
+                        'next_cursor': None,
+                    },
+                ),
+                lambda: trusted_response(
+                    schedule_page(schedule_rows, None)
+                ).body,
+            ),
+        }
+
+        for name, (before, after) in cases.items():
+            assert json.loads(before()) == json.loads(after())
+
+            per_thousand = 1000 / rows * 1000
+            slow = timed(before, repeat) * per_thousand
+            fast = timed(after, repeat) * per_thousand
+            print(
+                f'{name:>9}: response_model {slow:.2f} ms, '
+                f'fast path {fast:.2f} ms per 1,000 rows '
+                f'({slow / fast:.1f}x)'
+            )
+
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.rows, args.repeat)
@@ -0,0 +1,101 @@
+"""Add client search index
+
+Revision ID: baaeaced399f
+Revises: 1ae69508a2f0
+Create Date: 2026-10-18 09:43:33.174267
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'baaeaced399f'
+down_revision: Union[str, None] = '1ae69508a2f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGGERS = (
+    'client_search_insert',
+    'client_search_update',
+    'client_search_delete',
+    'client_search_address_insert',
+    'client_search_address_update',
+    'client_search_address_delete',
+)
+
+
+def addresses_of(client_id: str) -> str:
+    return ', '.join(
+        f"{column} = (SELECT coalesce(group_concat({column}, ' '), '') "
+        f'FROM addresses WHERE client_id = {client_id})'
+        for column in ('street', 'neighborhood', 'reference')
+    )
+
+
+def upgrade() -> None:
+    # FTS5 is SQLite only; other backends search with a plain scan.
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(
+        'CREATE VIRTUAL TABLE client_search USING fts5('
+        'name, street, neighborhood, reference, '
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    op.execute(
+        'CREATE TRIGGER client_search_insert AFTER INSERT ON clients BEGIN '
+        'INSERT INTO client_search (rowid, name) VALUES (new.id, new.name); '
+        'END'
+    )
+    op.execute(
+        'CREATE TRIGGER client_search_update '
+        'AFTER UPDATE OF name ON clients BEGIN '
+        'UPDATE client_search SET name = new.name WHERE rowid = new.id; END'
+    )
+    op.execute(
+        'CREATE TRIGGER client_search_delete AFTER DELETE ON clients BEGIN '
+        'DELETE FROM client_search WHERE rowid = old.id; END'
+    )
+    op.execute(
+        'CREATE TRIGGER client_search_address_insert '
+        'AFTER INSERT ON addresses BEGIN '
+        f'UPDATE client_search SET {addresses_of("new.client_id")} '
+        'WHERE rowid = new.client_id; END'
+    )
+    op.execute(
+        'CREATE TRIGGER client_search_address_update '
+        'AFTER UPDATE ON addresses BEGIN '
+        f'UPDATE client_search SET {addresses_of("old.client_id")} '
+        'WHERE rowid = old.client_id; '
+        f'UPDATE client_search SET {addresses_of("new.client_id")} '
+        'WHERE rowid = new.client_id; END'
+    )
+    op.execute(
+        'CREATE TRIGGER client_search_address_delete '
+        'AFTER DELETE ON addresses BEGIN '
+        f'UPDATE client_search SET {addresses_of("old.client_id")} '
+        'WHERE rowid = old.client_id; END'
+    )
+
+    addresses = ', '.join(
+        f"(SELECT coalesce(group_concat({column}, ' '), '') "
+        'FROM addresses WHERE client_id = clients.id)'
+        for column in ('street', 'neighborhood', 'reference')
+    )
+    op.execute(
+        'INSERT INTO client_search '
+        '(rowid, name, street, neighborhood, reference) '
+        f'SELECT clients.id, clients.name, {addresses} FROM clients'
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER {trigger}')
+    op.execute('DROP TABLE client_search')
@@ -0,0 +1,54 @@
+"""Cascade client and service deletes
+
+Revision ID: d47a9e2b6c15
+Revises: 8c1f4a6d2e73
+Create Date: 2026-10-18 15:21:09.730154
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd47a9e2b6c15'
+down_revision: Union[str, None] = '8c1f4a6d2e73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The foreign keys were created unnamed; SQLite can only change them by
+# recreating the table, and batch mode needs names to find them.
+naming_convention = {
+    'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s',
+}
+
+FOREIGN_KEYS = [
+    ('addresses', 'client_id', 'clients'),
+    ('schedules', 'client_id', 'clients'),
+    ('schedules', 'service_id', 'services'),
+]
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table in ('addresses', 'schedules'):
+        with op.batch_alter_table(
+            table, naming_convention=naming_convention, recreate='auto'
+        ) as batch_op:
+            for source, column, referent in FOREIGN_KEYS:
+                if source != table:
+                    continue
+
+                name = f'fk_{table}_{column}_{referent}'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(
+                    name, referent, [column], ['id'], ondelete=ondelete
+                )
+
+
+def upgrade() -> None:
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    _replace_foreign_keys(None)
@@ -1,12 +1,62 @@
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.exc import IntegrityError
+
+from projeto_final_poo.db.connection import (
+    dispose_async_engine,
+    dispose_engine,
+    pool_capacity,
+)
+from projeto_final_poo.helpers.compression import CompressionMiddleware
+from projeto_final_poo.helpers.exceptions import integrity_error_handler
+from projeto_final_poo.helpers.settings import env
+from projeto_final_poo.routers import (
+    address,
+    cache,
+    client,
+    imports,
+    reports,
+    schedules,
+    services,
+)
+from projeto_final_poo.routers.aio import address as aio_address
+from projeto_final_poo.routers.aio import client as aio_client
+from projeto_final_poo.routers.aio import schedules as aio_schedules
+from projeto_final_poo.routers.aio import services as aio_services
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync handlers run in the threadpool and each one holds a pooled
+    # connection, so more threads than connections only queue on the pool.
+    to_thread.current_default_thread_limiter().total_tokens = pool_capacity()
+    yield
+    dispose_engine()
+    await dispose_async_engine()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_exception_handler(IntegrityError, integrity_error_handler)
+app.add_middleware(CompressionMiddleware)
 
-from projeto_final_poo.routers import address, client, schedules, services
+# The async routers only cover the CRUD endpoints; they are registered first
+# so they take precedence, and anything else falls through to the sync ones.
+if env.ASYNC_DATABASE:  # pragma: no cover
+    app.include_router(aio_client.router)
+    app.include_router(aio_address.router)
+    app.include_router(aio_services.router)
+    app.include_router(aio_schedules.router)
 
-app = FastAPI()
 app.include_router(client.router)
 app.include_router(address.router)
 app.include_router(services.router)
 app.include_router(schedules.router)
+app.include_router(imports.router)
+app.include_router(reports.router)
+app.include_router(cache.router)
 
 
 @app.get('/')
@@ -1,8 +1,10 @@
 from typing import Annotated
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from projeto_final_poo.db.connection import get_session
+from projeto_final_poo.db.connection import get_async_session, get_session
 
 T_Session = Annotated[Session, Depends(get_session)]
+T_AsyncSession = Annotated[AsyncSession, Depends(get_async_session)]
@@ -0,0 +1,77 @@
+import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import Row, Select, func, select
+
+from projeto_final_poo.db.models import Schedule, ShiftEnum
+from projeto_final_poo.helpers.settings import env
+
+
+def shift_capacity(service_id: Optional[int] = None) -> int:
+    if service_id is None:
+        return env.SCHEDULE_SLOTS_PER_SHIFT
+
+    return env.SERVICE_SLOTS_PER_SHIFT.get(
+        service_id, env.SCHEDULE_SLOTS_PER_SHIFT
+    )
+
+
+def occupancy(
+    start: datetime.date,
+    end: datetime.date,
+    service_id: Optional[int] = None,
+) -> Select:
+    # One grouped pass over ix_schedules_date_shift_service_id; the service
+    # count is a FILTER on the same groups, so it costs no second scan.
+    service_booked = (
+        func.count().filter(Schedule.service_id == service_id)
+        if service_id is not None
+        else func.count()
+    )
+
+    return (
+        select(
+            Schedule.date,
+            Schedule.shift,
+            func.count().label('booked'),
+            service_booked.label('service_booked'),
+        )
+        .where(Schedule.date.between(start, end))
+        .group_by(Schedule.date, Schedule.shift)
+    )
+
+
+def availability(
+    rows: Iterable[Row],
+    start: datetime.date,
+    end: datetime.date,
+    service_id: Optional[int] = None,
+) -> dict:
+    booked = {
+        (row.date, row.shift): (row.booked, row.service_booked) for row in rows
+    }
+    total_capacity = shift_capacity()
+    capacity = shift_capacity(service_id)
+
+    days = []
+    for offset in range((end - start).days + 1):
+        day = start + datetime.timedelta(days=offset)
+        shifts = []
+        for shift in ShiftEnum:
+            total, taken = booked.get((day, shift), (0, 0))
+            # A service's own limit never lets it overbook the whole team.
+            free = min(capacity - taken, total_capacity - total)
+            shifts.append({
+                'shift': shift,
+                'capacity': capacity,
+                'booked': taken,
+                'free': max(free, 0),
+            })
+        days.append({'date': day, 'shifts': shifts})
+
+    return {
+        'start_date': start,
+        'end_date': end,
+        'service_id': service_id,
+        'days': days,
+    }
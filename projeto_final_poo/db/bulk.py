@@ -0,0 +1,69 @@
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+
+def dialect_insert(session: Session | AsyncSession, model: type):
+    # ON CONFLICT lives on the dialect-specific insert constructs; both
+    # supported backends spell it the same way.
+    name = session.get_bind().dialect.name
+    return (postgresql if name == 'postgresql' else sqlite).insert(model)
+
+
+def lookup(
+    session: Session,
+    key: InstrumentedAttribute,
+    keys: Iterable[Any],
+    *values: InstrumentedAttribute,
+) -> dict:
+    keys = set(keys)
+
+    if not keys:
+        return {}
+
+    rows = session.execute(
+        select(key, *(values or (key,))).where(key.in_(keys))
+    )
+
+    # Several value columns map each key to its whole row.
+    if len(values) > 1:
+        return {row[0]: row for row in rows}
+
+    return dict(rows.all())
+
+
+def insert_returning(
+    session: Session,
+    model: type,
+    rows: list[dict],
+    *columns: InstrumentedAttribute,
+) -> Sequence:
+    if not rows:
+        return []
+
+    dialect = session.get_bind().dialect
+    statement = insert(model)
+
+    # SQLite hands out rowids in VALUES order within a statement but can
+    # only promise RETURNING order by sending one row per statement, so
+    # batch the INSERT and sort by the primary key (the first column).
+    if dialect.name == 'sqlite':
+        result = session.execute(statement.returning(*columns), rows)
+        return sorted(result.all(), key=lambda row: row[0])
+
+    # Otherwise one executemany INSERT ... RETURNING, with rows coming back
+    # in the order they were sent, when the dialect can guarantee it.
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        return session.execute(
+            statement.returning(*columns, sort_by_parameter_order=True),
+            rows,
+        ).all()
+
+    objects = [model(**row) for row in rows]
+    session.add_all(objects)
+    session.flush()
+
+    return objects
@@ -1,34 +1,185 @@
 import sys
+from functools import cache
 
-from sqlalchemy import create_engine
-from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    AsyncAdaptedQueuePool,
+    Engine,
+    create_engine,
+    event,
+    make_url,
+)
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
 
 from projeto_final_poo.helpers.settings import env
 
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+psycopg',
+}
 
-def _get_engine():  # pragma: no cover
+# throughput: WAL lets readers run alongside the single writer and
+#   synchronous=NORMAL only fsyncs at checkpoints, so a power loss may roll
+#   back the last transactions but never corrupts the database.
+# durability: every commit is fsynced (synchronous=FULL), with a smaller
+#   cache and no memory-mapped I/O.
+SQLITE_PROFILES = {
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 268_435_456,
+        'cache_size': -64_000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5_000,
+    },
+    'durability': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -16_000,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 10_000,
+    },
+}
+
+
+def _is_memory_database(url: str) -> bool:
+    database = make_url(url).database
+    return database in {None, '', ':memory:'}
+
+
+def _pool_options(url: str) -> dict:
+    options = {
+        'pool_pre_ping': env.DATABASE_POOL_PRE_PING,
+        'pool_recycle': env.DATABASE_POOL_RECYCLE,
+    }
+
+    # In-memory SQLite uses a single shared connection, so there is no
+    # pool to size.
+    if not (url.startswith('sqlite') and _is_memory_database(url)):
+        options['pool_size'] = env.DATABASE_POOL_SIZE
+        options['max_overflow'] = env.DATABASE_MAX_OVERFLOW
+
+    return options
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(
+        hide_password=False
+    )
+
+
+def sqlite_pragmas() -> dict:
+    pragmas = dict(SQLITE_PROFILES[env.SQLITE_PROFILE])
+    overrides = {
+        'journal_mode': env.SQLITE_JOURNAL_MODE,
+        'synchronous': env.SQLITE_SYNCHRONOUS,
+        'mmap_size': env.SQLITE_MMAP_SIZE,
+        'cache_size': env.SQLITE_CACHE_SIZE,
+        'temp_store': env.SQLITE_TEMP_STORE,
+        'busy_timeout': env.SQLITE_BUSY_TIMEOUT,
+    }
+    pragmas.update({
+        name: value for name, value in overrides.items() if value is not None
+    })
+
+    return pragmas
+
+
+def _install_sqlite_pragmas(engine: Engine) -> None:
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # SQLite leaves foreign keys (and their ON DELETE CASCADE) off per
+        # connection unless asked; this is not a tuning knob.
+        cursor.execute('PRAGMA foreign_keys=ON')
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def pool_capacity() -> int:
+    return env.DATABASE_POOL_SIZE + env.DATABASE_MAX_OVERFLOW
+
+
+@cache
+def get_engine() -> Engine:
     try:
-        return create_engine(env.DATABASE_URL)
-    except OperationalError as e:
+        engine = create_engine(
+            env.DATABASE_URL, **_pool_options(env.DATABASE_URL)
+        )
+        _install_sqlite_pragmas(engine)
+
+        return engine
+    except OperationalError as e:  # pragma: no cover
         print(f'Operational error creating the database engine: {e}')
         sys.exit(1)
-    except SQLAlchemyError as e:
+    except SQLAlchemyError as e:  # pragma: no cover
         print(f'General error creating the database engine: {e}')
         sys.exit(1)
 
 
+@cache
+def get_session_factory() -> sessionmaker[Session]:
+    return sessionmaker(bind=get_engine())
+
+
+@cache
+def get_async_engine() -> AsyncEngine:
+    options = _pool_options(env.DATABASE_URL)
+
+    # aiosqlite defaults to NullPool for files, which would open a new
+    # connection (and thread) per session.
+    if 'pool_size' in options:
+        options['poolclass'] = AsyncAdaptedQueuePool
+
+    engine = create_async_engine(
+        async_database_url(env.DATABASE_URL), **options
+    )
+    _install_sqlite_pragmas(engine.sync_engine)
+
+    return engine
+
+
+@cache
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_engine(), expire_on_commit=False)
+
+
+def dispose_engine() -> None:
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+
+    get_session_factory.cache_clear()
+    get_engine.cache_clear()
+
+
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
+    get_async_session_factory.cache_clear()
+    get_async_engine.cache_clear()
+
+
 def get_session():  # pragma: no cover
-    try:
-        engine = _get_engine()
-        with Session(engine) as session:
-            yield session
-    except IntegrityError as e:
-        print(f'Database integrity error: {e}')
-        sys.exit(1)
-    except OperationalError as e:
-        print(f'Operational error accessing the database: {e}')
-        sys.exit(1)
-    except SQLAlchemyError as e:
-        print(f'General error accessing the database: {e}')
-        sys.exit(1)
+    with get_session_factory()() as session:
+        yield session
+
+
+async def get_async_session():  # pragma: no cover
+    async with get_async_session_factory()() as session:
+        yield session
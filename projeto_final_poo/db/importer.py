@@ -0,0 +1,216 @@
+import argparse
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Literal
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.bulk import dialect_insert, lookup
+from projeto_final_poo.db.connection import get_session_factory
+from projeto_final_poo.db.models import (
+    Address,
+    Client,
+    ImportJob,
+    Schedule,
+    Service,
+    precise_now,
+)
+from projeto_final_poo.db.slots import reserve_many
+from projeto_final_poo.helpers.cache import response_cache
+from projeto_final_poo.helpers.settings import env
+from projeto_final_poo.schemas.schemas import ClientSchema, ScheduleCreate
+
+ImportKind = Literal['clients', 'schedules']
+ImportFormat = Literal['ndjson', 'csv']
+
+# Raised while reading the upload itself, as opposed to its rows.
+FILE_ERRORS = (UnicodeDecodeError, csv.Error)
+
+
+def load_clients(session: Session, clients: list[ClientSchema]) -> int:
+    # Later rows win when a chunk repeats a phone number; a single
+    # ON CONFLICT statement may not touch the same row twice.
+    by_phone = {client.phone_number: client for client in clients}
+    existing = lookup(session, Client.phone_number, by_phone)
+
+    statement = dialect_insert(session, Client)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Client.phone_number],
+        set_={'name': statement.excluded.name, 'updated_at': precise_now()},
+    ).returning(Client.phone_number, Client.id)
+
+    client_ids = dict(
+        session.execute(
+            statement,
+            [
+                {'name': client.name, 'phone_number': phone_number}
+                for phone_number, client in by_phone.items()
+            ],
+        ).all()
+    )
+
+    new_addresses = [
+        {
+            'client_id': client_ids[phone_number],
+            'street': client.street,
+            'neighborhood': client.neighborhood,
+            'reference': client.reference,
+            'number': client.number,
+        }
+        for phone_number, client in by_phone.items()
+        if phone_number not in existing
+    ]
+    if new_addresses:
+        session.execute(insert(Address), new_addresses)
+
+    return 0
+
+
+def load_schedules(session: Session, schedules: list[ScheduleCreate]) -> int:
+    clients = lookup(session, Client.id, (s.client_id for s in schedules))
+    prices = lookup(
+        session, Service.id, (s.service_id for s in schedules), Service.price
+    )
+
+    candidates = [
+        schedule
+        for schedule in schedules
+        if schedule.client_id in clients and schedule.service_id in prices
+    ]
+    booked = reserve_many(
+        session, [(s.date, s.shift, s.service_id) for s in candidates]
+    )
+
+    rows = [
+        {**schedule.model_dump(), 'price': prices[schedule.service_id]}
+        for schedule, fits in zip(candidates, booked)
+        if fits
+    ]
+    if rows:
+        session.execute(insert(Schedule), rows)
+
+    return len(schedules) - len(rows)
+
+
+IMPORTERS: dict[str, tuple[type[BaseModel], Callable]] = {
+    'clients': (ClientSchema, load_clients),
+    'schedules': (ScheduleCreate, load_schedules),
+}
+
+
+def read_records(lines: Iterable[str], file_format: ImportFormat) -> Iterator:
+    if file_format == 'csv':
+        yield from csv.DictReader(lines)
+        return
+
+    yield from (line for line in lines if line.strip())
+
+
+def _validate(schema: type[BaseModel], record) -> BaseModel:
+    if isinstance(record, str):
+        return schema.model_validate_json(record)
+
+    return schema.model_validate(record)
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def run_import(
+    session: Session,
+    job: ImportJob,
+    lines: Iterable[str],
+    chunk_size: int = env.IMPORT_CHUNK_SIZE,
+) -> Iterator[ImportJob]:
+    schema, load = IMPORTERS[job.kind]
+
+    # Rows up to rows_processed were committed by an earlier run of this
+    # job, so a resumed import reads past them without touching the DB.
+    records = enumerate(read_records(lines, job.file_format))
+    records = islice(records, job.rows_processed, None)
+
+    job.status = 'running'
+    session.commit()
+
+    try:
+        for chunk in _chunks(records, chunk_size):
+            valid, failed = [], 0
+            for index, record in chunk:
+                try:
+                    valid.append(_validate(schema, record))
+                except ValidationError as e:
+                    failed += 1
+                    job.last_error = f'Row {index}: {e.errors()[0]["msg"]}'
+
+            rejected = load(session, valid) if valid else 0
+
+            job.rows_processed += len(chunk)
+            job.rows_imported += len(valid) - rejected
+            job.rows_failed += failed + rejected
+            session.commit()
+
+            # Upserts may rename existing clients, which schedules embed.
+            if job.kind == 'clients':
+                response_cache.invalidate('clients', 'schedules')
+
+            yield job
+    except (SQLAlchemyError, *FILE_ERRORS) as e:
+        session.rollback()
+        job.status = 'failed'
+        job.last_error = str(e)
+        session.commit()
+        raise
+
+    job.status = 'completed'
+    session.commit()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Import clients or schedules from a CSV/NDJSON file'
+    )
+    parser.add_argument('kind', choices=IMPORTERS)
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--format', choices=['ndjson', 'csv'])
+    parser.add_argument(
+        '--chunk-size', type=int, default=env.IMPORT_CHUNK_SIZE
+    )
+    parser.add_argument(
+        '--resume', type=int, metavar='JOB_ID', help='Resume a failed job'
+    )
+    args = parser.parse_args(argv)
+
+    file_format = args.format or (
+        'csv' if args.path.suffix.lower() == '.csv' else 'ndjson'
+    )
+
+    with get_session_factory()() as session:
+        if args.resume:
+            job = session.get(ImportJob, args.resume)
+            if not job:
+                parser.error(f'Import job {args.resume} not found')
+        else:
+            job = ImportJob(kind=args.kind, file_format=file_format)
+            session.add(job)
+            session.commit()
+
+        with args.path.open(encoding='utf-8', newline='') as lines:
+            for progress in run_import(session, job, lines, args.chunk_size):
+                print(
+                    f'Job {progress.id}: {progress.rows_processed} rows '
+                    f'processed, {progress.rows_imported} imported, '
+                    f'{progress.rows_failed} failed'
+                )
+
+        print(f'Job {job.id} {job.status}')
+
+
+if __name__ == '__main__':
+    main()
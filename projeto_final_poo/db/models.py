@@ -1,12 +1,50 @@
 from datetime import date, datetime
 from enum import Enum
+from typing import Optional
 
-from sqlalchemy import ForeignKey, Numeric, func
-from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
+from sqlalchemy import (
+    DDL,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    PrimaryKeyConstraint,
+    event,
+    func,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import (
+    Mapped,
+    ORMExecuteState,
+    Session,
+    mapped_column,
+    registry,
+    relationship,
+)
+from sqlalchemy.sql.expression import FunctionElement
+
+from projeto_final_poo.db.bulk import dialect_insert
 
 table_registry = registry()
 
 
+class precise_now(FunctionElement):
+    # SQLite's CURRENT_TIMESTAMP stops at the second, so two edits within
+    # one would leave the same updated_at behind (and the same ETag).
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(precise_now)
+def _precise_now(element, compiler, **kw):
+    return compiler.process(func.now(), **kw)
+
+
+@compiles(precise_now, 'sqlite')
+def _precise_now_sqlite(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+
 class ShiftEnum(str, Enum):
     MORNING = 'morning'
     AFTERNOON = 'afternoon'
@@ -27,13 +65,15 @@ class Client:
     updated_at: Mapped[datetime] = mapped_column(
         init=False,
         server_default=func.now(),
-        onupdate=func.now(),
+        insert_default=precise_now(),
+        onupdate=precise_now(),
     )
 
     addresses: Mapped[list['Address']] = relationship(
         'Address',
         uselist=True,
         init=False,
+        passive_deletes=True,
     )
 
 
@@ -47,7 +87,9 @@ class Address:
     reference: Mapped[str]
     number: Mapped[str]
 
-    client_id: Mapped[int] = mapped_column(ForeignKey('clients.id'))
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey('clients.id', ondelete='CASCADE'), index=True
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
@@ -55,7 +97,8 @@ class Address:
     updated_at: Mapped[datetime] = mapped_column(
         init=False,
         server_default=func.now(),
-        onupdate=func.now(),
+        insert_default=precise_now(),
+        onupdate=precise_now(),
     )
 
 
@@ -74,21 +117,56 @@ class Service:
     updated_at: Mapped[datetime] = mapped_column(
         init=False,
         server_default=func.now(),
-        onupdate=func.now(),
+        insert_default=precise_now(),
+        onupdate=precise_now(),
     )
 
 
 @table_registry.mapped_as_dataclass
 class Schedule:
     __tablename__ = 'schedules'
+    __table_args__ = (
+        # Keyset pages walk (date, shift, id) in index order; the id comes
+        # along as the rowid, so this index must stay this narrow.
+        Index('ix_schedules_date_shift', 'date', 'shift'),
+        # Covers the per-day occupancy count, including its service filter.
+        Index(
+            'ix_schedules_date_shift_service_id', 'date', 'shift', 'service_id'
+        ),
+        # Likewise for a single client or service: the shift is what keeps
+        # the page from sorting each day's rows.
+        Index(
+            'ix_schedules_client_id_date_shift', 'client_id', 'date', 'shift'
+        ),
+        Index(
+            'ix_schedules_service_id_date_shift', 'service_id', 'date', 'shift'
+        ),
+        Index('ix_schedules_shift_date', 'shift', 'date'),
+        # Lets revenue reports scan a date range without touching the table.
+        Index(
+            'ix_schedules_date_revenue',
+            'date',
+            'service_id',
+            'client_id',
+            'price',
+        ),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
-    client_id: Mapped[int] = mapped_column(ForeignKey('clients.id'))
-    service_id: Mapped[int] = mapped_column(ForeignKey('services.id'))
+    client_id: Mapped[int] = mapped_column(
+        ForeignKey('clients.id', ondelete='CASCADE')
+    )
+    service_id: Mapped[int] = mapped_column(
+        ForeignKey('services.id', ondelete='CASCADE')
+    )
 
     date: Mapped[date]
     shift: Mapped[ShiftEnum]
     description: Mapped[str]
+    # The service price when booked, so reports survive price changes.
+    price: Mapped[Optional[float]] = mapped_column(
+        Numeric(precision=10, scale=2), default=None
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
@@ -96,8 +174,213 @@ class Schedule:
     updated_at: Mapped[datetime] = mapped_column(
         init=False,
         server_default=func.now(),
-        onupdate=func.now(),
+        insert_default=precise_now(),
+        onupdate=precise_now(),
     )
 
     client: Mapped['Client'] = relationship('Client', init=False)
     service: Mapped['Service'] = relationship('Service', init=False)
+
+
+@table_registry.mapped_as_dataclass
+class SlotOccupancy:
+    __tablename__ = 'slot_occupancy'
+    __table_args__ = (PrimaryKeyConstraint('date', 'shift', 'service_id'),)
+
+    date: Mapped[date]
+    shift: Mapped[ShiftEnum]
+    # 0 counts every booking in the slot; any other id, that service's only.
+    service_id: Mapped[int]
+    booked: Mapped[int] = mapped_column(default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+        insert_default=precise_now(),
+        onupdate=precise_now(),
+    )
+
+
+@table_registry.mapped_as_dataclass
+class MonthlyRevenue:
+    __tablename__ = 'monthly_revenue'
+    __table_args__ = (
+        PrimaryKeyConstraint('month', 'service_id', 'neighborhood'),
+    )
+
+    # First day of a closed month.
+    month: Mapped[date]
+    service_id: Mapped[int]
+    neighborhood: Mapped[str]
+    schedules: Mapped[int]
+    revenue: Mapped[float] = mapped_column(Numeric(precision=14, scale=2))
+
+    built_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+
+
+@table_registry.mapped_as_dataclass
+class TableVersion:
+    __tablename__ = 'table_versions'
+
+    # One row per table in VERSIONED_TABLES, bumped in the same transaction
+    # as every write to it, so the list ETags probe a primary key instead
+    # of scanning the table for max(updated_at) and count(*).
+    name: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(default=1)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+        insert_default=precise_now(),
+        onupdate=precise_now(),
+    )
+
+
+@table_registry.mapped_as_dataclass
+class ImportJob:
+    __tablename__ = 'import_jobs'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    kind: Mapped[str]
+    file_format: Mapped[str]
+    status: Mapped[str] = mapped_column(default='running')
+    rows_processed: Mapped[int] = mapped_column(default=0)
+    rows_imported: Mapped[int] = mapped_column(default=0)
+    rows_failed: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(default=None)
+
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+        insert_default=precise_now(),
+        onupdate=precise_now(),
+    )
+
+
+# Full-text index over clients and their addresses for SQLite: one FTS5
+# document per client (rowid = client id), kept in sync by triggers so every
+# write path, raw SQL and imports included, updates it. Not part of the
+# mapped metadata; migrations/env.py leaves it out of autogenerate.
+CLIENT_SEARCH = 'client_search'
+
+
+def _client_search_addresses(client_id: str) -> str:
+    # SET clause copying every address of the client into its document.
+    return ', '.join(
+        f"{column} = (SELECT coalesce(group_concat({column}, ' '), '') "
+        f'FROM addresses WHERE client_id = {client_id})'
+        for column in ('street', 'neighborhood', 'reference')
+    )
+
+
+CLIENT_SEARCH_DDL = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {CLIENT_SEARCH} USING fts5('
+    'name, street, neighborhood, reference, '
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    'CREATE TRIGGER IF NOT EXISTS client_search_insert '
+    'AFTER INSERT ON clients BEGIN '
+    f'INSERT INTO {CLIENT_SEARCH} (rowid, name) VALUES (new.id, new.name); '
+    'END',
+    'CREATE TRIGGER IF NOT EXISTS client_search_update '
+    'AFTER UPDATE OF name ON clients BEGIN '
+    f'UPDATE {CLIENT_SEARCH} SET name = new.name WHERE rowid = new.id; END',
+    'CREATE TRIGGER IF NOT EXISTS client_search_delete '
+    'AFTER DELETE ON clients BEGIN '
+    f'DELETE FROM {CLIENT_SEARCH} WHERE rowid = old.id; END',
+    'CREATE TRIGGER IF NOT EXISTS client_search_address_insert '
+    'AFTER INSERT ON addresses BEGIN '
+    f'UPDATE {CLIENT_SEARCH} SET {_client_search_addresses("new.client_id")} '
+    'WHERE rowid = new.client_id; END',
+    'CREATE TRIGGER IF NOT EXISTS client_search_address_update '
+    'AFTER UPDATE ON addresses BEGIN '
+    f'UPDATE {CLIENT_SEARCH} SET {_client_search_addresses("old.client_id")} '
+    'WHERE rowid = old.client_id; '
+    f'UPDATE {CLIENT_SEARCH} SET {_client_search_addresses("new.client_id")} '
+    'WHERE rowid = new.client_id; END',
+    'CREATE TRIGGER IF NOT EXISTS client_search_address_delete '
+    'AFTER DELETE ON addresses BEGIN '
+    f'UPDATE {CLIENT_SEARCH} SET {_client_search_addresses("old.client_id")} '
+    'WHERE rowid = old.client_id; END',
+)
+
+for statement in CLIENT_SEARCH_DDL:
+    event.listen(
+        table_registry.metadata,
+        'after_create',
+        DDL(statement).execute_if(dialect='sqlite'),
+    )
+event.listen(
+    table_registry.metadata,
+    'before_drop',
+    DDL(f'DROP TABLE IF EXISTS {CLIENT_SEARCH}').execute_if(dialect='sqlite'),
+)
+
+
+# Rows cascaded away by the database (ON DELETE CASCADE) never pass through
+# the session, but their parent's delete does, and every probe covering a
+# child table covers its parents too.
+VERSIONED_TABLES = frozenset({'clients', 'addresses', 'services', 'schedules'})
+
+
+def bump_table_versions(session: Session, tables: set[str]) -> None:
+    names = sorted(VERSIONED_TABLES.intersection(tables))
+    if not names:
+        return
+
+    statement = dialect_insert(session, TableVersion)
+    statement = statement.on_conflict_do_update(
+        index_elements=[TableVersion.name],
+        set_={
+            'version': TableVersion.version + 1,
+            'updated_at': precise_now(),
+        },
+    )
+    # On the connection, so the bump is not an ORM execution of its own.
+    session.connection().execute(statement, [{'name': name} for name in names])
+
+
+def _changed_tables(session: Session) -> set[str]:
+    return session.info.setdefault('changed_tables', set())
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flushed_tables(session: Session, flush_context) -> None:
+    changed = [
+        *session.new,
+        *session.deleted,
+        *(
+            instance
+            for instance in session.dirty
+            if session.is_modified(instance, include_collections=False)
+        ),
+    ]
+    _changed_tables(session).update(
+        instance.__table__.name for instance in changed
+    )
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _record_executed_tables(state: ORMExecuteState) -> None:
+    # Bulk INSERT/UPDATE/DELETE statements skip the flush entirely.
+    if state.is_insert or state.is_update or state.is_delete:
+        _changed_tables(state.session).add(state.statement.table.name)
+
+
+@event.listens_for(Session, 'before_commit')
+def _bump_committed_tables(session: Session) -> None:
+    # One bump per transaction rather than per statement: the version rows
+    # are shared by every writer, so they are locked as late as possible,
+    # just before COMMIT releases them. The flush has to come first so
+    # its tables are recorded.
+    session.flush()
+    bump_table_versions(session, session.info.pop('changed_tables', set()))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_changed_tables(session: Session) -> None:
+    session.info.pop('changed_tables', None)
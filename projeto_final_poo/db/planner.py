@@ -0,0 +1,135 @@
+import argparse
+import datetime
+from typing import Iterable, Sequence
+
+from sqlalchemy import Row, Select, select
+
+from projeto_final_poo.db.connection import get_session_factory
+from projeto_final_poo.db.models import Client, Schedule, Service, ShiftEnum
+from projeto_final_poo.db.queries import client_neighborhood
+
+
+def plan_rows(day: datetime.date) -> Select:
+    # The whole day in one query, off the (date, shift, service_id) index.
+    return (
+        select(
+            Schedule.id,
+            Schedule.shift,
+            Schedule.client_id,
+            Client.name.label('client_name'),
+            Service.type.label('service_type'),
+            client_neighborhood().label('neighborhood'),
+        )
+        .join(Client, Schedule.client_id == Client.id)
+        .join(Service, Schedule.service_id == Service.id)
+        .where(Schedule.date == day)
+        .order_by(Schedule.id)
+    )
+
+
+def assign(jobs: Sequence[Row], technicians: int) -> list[list[Row]]:
+    # Lines the jobs up neighborhood by neighborhood, largest first, and
+    # cuts the line into even routes: loads differ by one job at most and
+    # only a cut splits a neighborhood, so at most technicians - 1 are
+    # shared. Linear apart from sorting the neighborhoods.
+    clusters: dict[str | None, list[Row]] = {}
+    for job in jobs:
+        clusters.setdefault(job.neighborhood, []).append(job)
+
+    line = [
+        job
+        for neighborhood in sorted(
+            clusters,
+            key=lambda key: (-len(clusters[key]), key is None, key or ''),
+        )
+        for job in clusters[neighborhood]
+    ]
+
+    size, extra = divmod(len(line), technicians)
+    routes, start = [], 0
+    for technician in range(technicians):
+        end = start + size + (technician < extra)
+        routes.append(line[start:end])
+        start = end
+
+    return routes
+
+
+def plan(rows: Iterable[Row], day: datetime.date, technicians: int) -> dict:
+    shifts: dict[ShiftEnum, list[Row]] = {}
+    for row in rows:
+        shifts.setdefault(row.shift, []).append(row)
+
+    return {
+        'date': day,
+        'technicians': technicians,
+        'shifts': [
+            {
+                'shift': shift,
+                'routes': [
+                    {
+                        'technician': technician,
+                        'neighborhoods': list(
+                            dict.fromkeys(
+                                job.neighborhood
+                                for job in route
+                                if job.neighborhood is not None
+                            )
+                        ),
+                        'schedules': [
+                            {
+                                'id': job.id,
+                                'client_id': job.client_id,
+                                'client_name': job.client_name,
+                                'service_type': job.service_type,
+                                'neighborhood': job.neighborhood,
+                            }
+                            for job in route
+                        ],
+                    }
+                    for technician, route in enumerate(
+                        assign(shifts[shift], technicians), start=1
+                    )
+                ],
+            }
+            for shift in ShiftEnum
+            if shift in shifts
+        ],
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Split a day's schedules between technicians"
+    )
+    parser.add_argument('date', type=datetime.date.fromisoformat)
+    parser.add_argument('--technicians', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.technicians < 1:
+        parser.error('--technicians must be at least 1')
+
+    with get_session_factory()() as session:
+        rows = session.execute(plan_rows(args.date))
+        day = plan(rows, args.date, args.technicians)
+
+    if not day['shifts']:
+        print(f'No schedules on {args.date}')
+
+    for shift in day['shifts']:
+        print(shift['shift'].value)
+        for route in shift['routes']:
+            print(
+                f'  Technician {route["technician"]}: '
+                f'{len(route["schedules"])} schedules '
+                f'({", ".join(route["neighborhoods"])})'
+            )
+            for job in route['schedules']:
+                print(
+                    f'    #{job["id"]} {job["client_name"]}, '
+                    f'{job["service_type"]} - {job["neighborhood"] or "?"}'
+                )
+
+
+if __name__ == '__main__':
+    main()
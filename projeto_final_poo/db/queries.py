@@ -0,0 +1,263 @@
+import datetime
+import re
+from typing import Optional, Sequence
+
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    ScalarSelect,
+    Select,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+
+from projeto_final_poo.db.models import (
+    CLIENT_SEARCH,
+    Address,
+    Client,
+    Schedule,
+    Service,
+    ShiftEnum,
+    TableVersion,
+)
+from projeto_final_poo.schemas.schemas import ScheduleQueryParams
+
+SCHEDULE_ID_KEY = ((Schedule.id, int),)
+
+client_search = table(CLIENT_SEARCH, column('rowid', Integer))
+# bm25 weights of the name, street, neighborhood and reference columns.
+SEARCH_WEIGHTS = (10.0, 1.0, 4.0, 1.0)
+SEARCH_CANDIDATES = 5000
+SCHEDULE_CALENDAR_KEY = (
+    (Schedule.date, datetime.date.fromisoformat),
+    (Schedule.shift, ShiftEnum),
+    (Schedule.id, int),
+)
+
+
+def schedule_rows() -> Select:
+    return (
+        select(
+            Schedule.id,
+            Schedule.date,
+            Schedule.shift,
+            Schedule.description,
+            Client.id.label('client_id'),
+            Client.name.label('client_name'),
+            Service.type.label('service_type'),
+        )
+        .join(Client, Schedule.client_id == Client.id)
+        .join(Service, Schedule.service_id == Service.id)
+        .order_by(Schedule.id)
+    )
+
+
+def schedule_returning() -> tuple:
+    # Same shape as schedule_rows(), for UPDATE ... RETURNING, which can
+    # only read the joined tables through correlated subqueries.
+    return (
+        Schedule.id,
+        Schedule.date,
+        Schedule.shift,
+        Schedule.description,
+        Schedule.client_id,
+        select(Client.name)
+        .where(Client.id == Schedule.client_id)
+        .scalar_subquery()
+        .label('client_name'),
+        select(Service.type)
+        .where(Service.id == Schedule.service_id)
+        .scalar_subquery()
+        .label('service_type'),
+    )
+
+
+def schedule_from_row(row: Row) -> dict:
+    return {
+        'id': row.id,
+        'date': row.date,
+        'shift': row.shift,
+        'description': row.description,
+        'client': {'id': row.client_id, 'name': row.client_name},
+        'service': {'type': row.service_type},
+    }
+
+
+def schedule_page(rows: Sequence[Row], cursor: Optional[str]) -> dict:
+    # Matches ScheduleList with exclude_none, so the page can be encoded
+    # as is without going through the response model.
+    page = {'schedules': [schedule_from_row(row) for row in rows]}
+    if cursor is not None:
+        page['next_cursor'] = cursor
+
+    return page
+
+
+def client_addresses(client_id: int) -> Select:
+    # The AddressInClient columns, for client responses built from an
+    # UPDATE ... RETURNING row instead of a loaded Client.
+    return (
+        select(
+            Address.id,
+            Address.street,
+            Address.neighborhood,
+            Address.reference,
+            Address.number,
+        )
+        .where(Address.client_id == client_id)
+        .order_by(Address.id)
+    )
+
+
+def client_neighborhood() -> ScalarSelect:
+    # Schedules carry no address of their own; they are placed at the
+    # client's first one.
+    return (
+        select(Address.neighborhood)
+        .where(Address.client_id == Schedule.client_id)
+        .order_by(Address.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def search_words(q: str) -> list[str]:
+    return re.findall(r'\w+', q)
+
+
+def client_matches(q: str, dialect: str) -> Select:
+    words = search_words(q)
+
+    if dialect == 'sqlite':
+        # Every word must match, as a prefix; quoting keeps any FTS5 syntax
+        # in the input literal. Name hits rank above neighborhood, street
+        # and reference ones. bm25 costs a few microseconds per hit, so only
+        # the newest SEARCH_CANDIDATES hits are ranked: exact for anything
+        # an agent would type in full, recent clients first for a bare
+        # prefix matching a large share of the table.
+        match = ' '.join(f'"{word}"*' for word in words)
+        candidates = (
+            select(
+                client_search.c.rowid,
+                func.bm25(
+                    literal_column(CLIENT_SEARCH), *SEARCH_WEIGHTS
+                ).label('score'),
+            )
+            .where(literal_column(CLIENT_SEARCH).op('MATCH')(match))
+            .order_by(client_search.c.rowid.desc())
+            .limit(SEARCH_CANDIDATES)
+            .subquery()
+        )
+        return (
+            select(Client)
+            .join(candidates, candidates.c.rowid == Client.id)
+            .order_by(candidates.c.score, Client.id)
+        )
+
+    # No FTS5 elsewhere: a substring scan, good enough off SQLite.
+    return (
+        select(Client)
+        .where(
+            *(
+                or_(
+                    Client.name.icontains(word, autoescape=True),
+                    Client.addresses.any(
+                        or_(
+                            Address.street.icontains(word, autoescape=True),
+                            Address.neighborhood.icontains(
+                                word, autoescape=True
+                            ),
+                            Address.reference.icontains(word, autoescape=True),
+                        )
+                    ),
+                )
+                for word in words
+            )
+        )
+        .order_by(Client.id)
+    )
+
+
+def schedule_id_key(row: Row) -> list:
+    return [row.id]
+
+
+def schedule_calendar_key(row: Row) -> list:
+    return [row.date, row.shift, row.id]
+
+
+def filter_schedules(query: Select, params: ScheduleQueryParams) -> Select:
+    if params.start_date:
+        query = query.filter(Schedule.date >= params.start_date)
+
+    if params.end_date:
+        query = query.filter(Schedule.date <= params.end_date)
+
+    if params.client_id:
+        query = query.filter(Schedule.client_id == params.client_id)
+
+    if params.service_id:
+        query = query.filter(Schedule.service_id == params.service_id)
+
+    if params.shift:
+        query = query.filter(Schedule.shift == params.shift)
+
+    return query
+
+
+def freshness(model: type, *where: ColumnElement) -> tuple:
+    return (
+        select(func.max(model.updated_at)).where(*where).scalar_subquery(),
+        select(func.count())
+        .select_from(model)
+        .where(*where)
+        .scalar_subquery(),
+    )
+
+
+def table_version(model: type) -> tuple:
+    row = TableVersion.name == model.__tablename__
+    return (
+        select(TableVersion.version).where(row).scalar_subquery(),
+        select(TableVersion.updated_at).where(row).scalar_subquery(),
+    )
+
+
+def probe_services() -> Select:
+    return select(*table_version(Service))
+
+
+def probe_service(id: int) -> Select:
+    return select(Service.updated_at).where(Service.id == id)
+
+
+def probe_clients() -> Select:
+    return select(*table_version(Client), *table_version(Address))
+
+
+def probe_client(id: int) -> Select:
+    return select(
+        Client.updated_at, *freshness(Address, Address.client_id == id)
+    ).where(Client.id == id)
+
+
+def probe_schedules() -> Select:
+    return select(
+        *table_version(Schedule),
+        *table_version(Client),
+        *table_version(Service),
+    )
+
+
+def probe_schedule(id: int) -> Select:
+    return (
+        select(Schedule.updated_at, Client.updated_at, Service.updated_at)
+        .join(Client, Schedule.client_id == Client.id)
+        .join(Service, Schedule.service_id == Service.id)
+        .where(Schedule.id == id)
+    )
@@ -0,0 +1,261 @@
+import datetime
+from collections import Counter, defaultdict
+from typing import Literal, Optional
+
+from sqlalchemy import (
+    Select,
+    delete,
+    func,
+    insert,
+    null,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.availability import shift_capacity
+from projeto_final_poo.db.models import (
+    MonthlyRevenue,
+    Schedule,
+    ShiftEnum,
+    SlotOccupancy,
+)
+from projeto_final_poo.db.queries import client_neighborhood
+from projeto_final_poo.db.slots import TEAM
+
+Period = Literal['month', 'year']
+RevenueGrouping = Literal['service', 'neighborhood']
+
+ONE_DAY = datetime.timedelta(days=1)
+
+
+def month_start(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def next_month(day: datetime.date) -> datetime.date:
+    return (day.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def month_end(month: datetime.date) -> datetime.date:
+    return next_month(month) - ONE_DAY
+
+
+def months(start: datetime.date, end: datetime.date) -> list[datetime.date]:
+    month, months = month_start(start), []
+    while month <= end:
+        months.append(month)
+        month = next_month(month)
+
+    return months
+
+
+def period_of(day: datetime.date, period: Period) -> str:
+    return day.strftime('%Y-%m') if period == 'month' else str(day.year)
+
+
+def closed_months(
+    start: datetime.date, end: datetime.date, today: datetime.date
+) -> list[datetime.date]:
+    # Months wholly inside the range and wholly in the past: only those are
+    # read from (and written to) the rollups.
+    current = month_start(today)
+
+    return [
+        month
+        for month in months(start, end)
+        if month >= start
+        and month_end(month) <= end
+        and next_month(month) <= current
+    ]
+
+
+def revenue_rows(
+    first: datetime.date, last: datetime.date, by_neighborhood: bool = True
+) -> Select:
+    # One row per service and neighborhood of a range within one month, off
+    # the covering date index; the price snapshot means no join to services.
+    # The neighborhood lookup is the expensive part, so it is left out when
+    # not needed.
+    grouping = [Schedule.service_id]
+    neighborhood = null()
+    if by_neighborhood:
+        neighborhood = func.coalesce(client_neighborhood(), '')
+        grouping.append(neighborhood)
+
+    return (
+        select(
+            Schedule.service_id,
+            neighborhood.label('neighborhood'),
+            func.count().label('schedules'),
+            func.coalesce(func.sum(Schedule.price), 0).label('revenue'),
+        )
+        .where(Schedule.date.between(first, last))
+        .group_by(*grouping)
+    )
+
+
+def refresh_rollups(session: Session, closed: list[datetime.date]) -> None:
+    # A rollup is stale once any slot counter of its month changed after it
+    # was built: every booking, move and delete goes through the counters,
+    # and client changes and address edits touch them (slots.touch).
+    # Edits that leave the slot and its neighborhood alone keep it.
+    if not closed:
+        return
+
+    built = dict(
+        session.execute(
+            select(MonthlyRevenue.month, func.min(MonthlyRevenue.built_at))
+            .where(MonthlyRevenue.month.in_(closed))
+            .group_by(MonthlyRevenue.month)
+        ).all()
+    )
+
+    changed = {}
+    for day, updated_at in session.execute(
+        select(SlotOccupancy.date, func.max(SlotOccupancy.updated_at))
+        .where(
+            SlotOccupancy.date.between(closed[0], month_end(closed[-1])),
+            SlotOccupancy.service_id == TEAM,
+        )
+        .group_by(SlotOccupancy.date)
+    ):
+        month = month_start(day)
+        changed[month] = max(changed.get(month, updated_at), updated_at)
+
+    stale = [
+        month
+        for month in closed
+        if month not in built
+        or (month in changed and changed[month] >= built[month])
+    ]
+    if not stale:
+        return
+
+    session.execute(
+        delete(MonthlyRevenue).where(MonthlyRevenue.month.in_(stale))
+    )
+    rollups = [
+        {'month': month, **row._asdict()}
+        for month in stale
+        for row in session.execute(revenue_rows(month, month_end(month)))
+    ]
+    if rollups:
+        session.execute(insert(MonthlyRevenue), rollups)
+
+
+def revenue_report(
+    session: Session,
+    start: datetime.date,
+    end: datetime.date,
+    period: Period,
+    group_by: Optional[RevenueGrouping] = None,
+) -> list[dict]:
+    closed = closed_months(start, end, datetime.date.today())
+    refresh_rollups(session, closed)
+
+    rows = []
+    if closed:
+        rows += session.execute(
+            select(
+                MonthlyRevenue.month,
+                MonthlyRevenue.service_id,
+                MonthlyRevenue.neighborhood,
+                MonthlyRevenue.schedules,
+                MonthlyRevenue.revenue,
+            ).where(MonthlyRevenue.month.in_(closed))
+        ).all()
+    # The open edges of the range, and the months not closed yet, are read
+    # from the schedules one month at a time.
+    for month in months(start, end):
+        if month in closed:
+            continue
+        rows += [
+            (month, *row)
+            for row in session.execute(
+                revenue_rows(
+                    max(start, month),
+                    min(end, month_end(month)),
+                    by_neighborhood=group_by == 'neighborhood',
+                )
+            )
+        ]
+
+    report = defaultdict(lambda: [0, 0])
+    for month, service_id, neighborhood, schedules, revenue in rows:
+        key = {'service': service_id, 'neighborhood': neighborhood}.get(
+            group_by
+        )
+        total = report[period_of(month, period), key]
+        total[0] += schedules
+        total[1] += revenue
+
+    field = {'service': 'service_id', 'neighborhood': 'neighborhood'}.get(
+        group_by
+    )
+    return [
+        {
+            'period': period_key,
+            **({field: key} if field else {}),
+            'schedules': schedules,
+            'revenue': round(float(revenue), 2),
+        }
+        for (period_key, key), (schedules, revenue) in sorted(report.items())
+    ]
+
+
+def utilization_report(
+    session: Session,
+    start: datetime.date,
+    end: datetime.date,
+    period: Period,
+    by_service: bool = False,
+) -> list[dict]:
+    # Straight off the slot counters: one row per day and shift (or
+    # service), so a year costs a few thousand rows at most.
+    rows = session.execute(
+        select(
+            SlotOccupancy.date,
+            SlotOccupancy.service_id,
+            func.sum(SlotOccupancy.booked).label('booked'),
+        )
+        .where(
+            SlotOccupancy.date.between(start, end),
+            SlotOccupancy.service_id != TEAM
+            if by_service
+            else SlotOccupancy.service_id == TEAM,
+        )
+        .group_by(SlotOccupancy.date, SlotOccupancy.service_id)
+    )
+
+    days = defaultdict(int)
+    for month in months(start, end):
+        first, last = max(start, month), min(end, month_end(month))
+        days[period_of(month, period)] += (last - first).days + 1
+
+    # Periods without bookings still show their capacity, unless the
+    # report is split by service.
+    booked = Counter()
+    if not by_service:
+        booked.update(dict.fromkeys(((key, None) for key in days), 0))
+    for row in rows:
+        service_id = row.service_id if by_service else None
+        booked[period_of(row.date, period), service_id] += row.booked
+
+    report = []
+    for (period_key, service_id), count in sorted(
+        booked.items(), key=lambda item: (item[0][0], item[0][1] or 0)
+    ):
+        capacity = (
+            days[period_key] * len(ShiftEnum) * shift_capacity(service_id)
+        )
+        report.append({
+            'period': period_key,
+            **({'service_id': service_id} if by_service else {}),
+            'booked': count,
+            'capacity': capacity,
+            # A service closed with SERVICE_SLOTS_PER_SHIFT = 0 may still
+            # have bookings from before; it reports no utilization.
+            'utilization': round(count / capacity, 4) if capacity else 0,
+        })
+
+    return report
@@ -12,6 +12,7 @@ from projeto_final_poo.db.models import (
     Schedule,
     Service,
 )
+from projeto_final_poo.db.slots import reserve_many
 from projeto_final_poo.helpers.settings import env
 from projeto_final_poo.schemas.schemas import ShiftEnum
 
@@ -111,6 +112,7 @@ def seed_data():
         Schedule(
             client_id=(i % 10) + 1,
             service_id=(i % 10) + 1,
+            price=services[i % 10].price,
             date=random_date(today, end_date),
             description=f'description {(i % 10) + 1}',
             shift=ShiftEnum.MORNING.value
@@ -122,7 +124,15 @@ def seed_data():
         for i in range(1, 11)
     ]
 
-    session.add_all(schedules)
+    # Seeded schedules count towards the shift capacity like booked ones,
+    # and those landing on a full shift are left out.
+    booked = reserve_many(
+        session,
+        [(s.date, ShiftEnum(s.shift), s.service_id) for s in schedules],
+    )
+    session.add_all(
+        schedule for schedule, fits in zip(schedules, booked) if fits
+    )
     session.commit()
 
     print('Database seeded successfully!')
@@ -0,0 +1,320 @@
+import argparse
+import datetime
+from collections import Counter
+from typing import Iterable, Literal, Sequence
+
+from sqlalchemy import (
+    ColumnElement,
+    Insert,
+    Row,
+    Select,
+    Update,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.availability import shift_capacity
+from projeto_final_poo.db.bulk import dialect_insert
+from projeto_final_poo.db.connection import get_session_factory
+from projeto_final_poo.db.models import (
+    Schedule,
+    ShiftEnum,
+    SlotOccupancy,
+    precise_now,
+)
+
+# service_id of the counter shared by every service booked in a slot.
+TEAM = 0
+
+Slot = tuple[datetime.date, ShiftEnum, int]
+CalendarGrouping = Literal['shift', 'service']
+
+slot_occupancy = SlotOccupancy.__table__
+
+
+def _counters(slot: Slot) -> list[tuple[Slot, int]]:
+    date, shift, service_id = slot
+
+    return [
+        ((date, shift, TEAM), shift_capacity()),
+        (slot, shift_capacity(service_id)),
+    ]
+
+
+def reserve(session: Session | AsyncSession, slot: Slot) -> list[Insert]:
+    # One conditional upsert per counter: the row starts at 1 or is bumped
+    # while still under capacity, under the row lock the update takes, so
+    # concurrent bookings queue instead of reading the same count. No row
+    # back from RETURNING means the slot is full. The row is selected
+    # rather than given as VALUES so a zero capacity inserts nothing.
+    statements = []
+    for (date, shift, service_id), capacity in _counters(slot):
+        row = {'date': date, 'shift': shift, 'service_id': service_id}
+        statement = dialect_insert(session, SlotOccupancy).from_select(
+            [*row, 'booked'],
+            select(
+                *(
+                    literal(value, slot_occupancy.c[name].type)
+                    for name, value in row.items()
+                ),
+                literal(1),
+            ).where(literal(capacity) > 0),
+        )
+        statements.append(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    SlotOccupancy.date,
+                    SlotOccupancy.shift,
+                    SlotOccupancy.service_id,
+                ],
+                set_={
+                    'booked': SlotOccupancy.booked + 1,
+                    'updated_at': precise_now(),
+                },
+                where=SlotOccupancy.booked < capacity,
+            ).returning(SlotOccupancy.booked)
+        )
+
+    return statements
+
+
+def book_slot(session: Session, slot: Slot) -> bool:
+    return all(
+        session.scalar(statement) is not None
+        for statement in reserve(session, slot)
+    )
+
+
+async def book_slot_async(session: AsyncSession, slot: Slot) -> bool:
+    for statement in reserve(session, slot):
+        if await session.scalar(statement) is None:
+            return False
+
+    return True
+
+
+def release(*where: ColumnElement) -> Update:
+    # Hands back the slots of the schedules matching where, team counter
+    # and service counter alike, in one statement. It must run before the
+    # schedules go, including those a client or service delete cascades to.
+    released = (
+        select(func.count())
+        .where(
+            *where,
+            Schedule.date == SlotOccupancy.date,
+            Schedule.shift == SlotOccupancy.shift,
+            or_(
+                SlotOccupancy.service_id == TEAM,
+                SlotOccupancy.service_id == Schedule.service_id,
+            ),
+        )
+        .scalar_subquery()
+    )
+
+    return (
+        update(SlotOccupancy)
+        .where(
+            tuple_(SlotOccupancy.date, SlotOccupancy.shift).in_(
+                select(Schedule.date, Schedule.shift).where(*where)
+            )
+        )
+        .values(booked=SlotOccupancy.booked - released)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def touch(*where: ColumnElement) -> Update:
+    # Marks the slots of the schedules matching where as changed without
+    # moving their counts, for edits the monthly rollups read but the
+    # counters do not see: the client of a schedule or that client's
+    # addresses.
+    return (
+        update(SlotOccupancy)
+        .where(
+            SlotOccupancy.service_id == TEAM,
+            tuple_(SlotOccupancy.date, SlotOccupancy.shift).in_(
+                select(Schedule.date, Schedule.shift).where(*where)
+            ),
+        )
+        .values(updated_at=precise_now())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reserve_many(session: Session, slots: Sequence[Slot]) -> list[bool]:
+    # Batch version of book_slot for bulk creates and imports: make sure
+    # every counter exists, lock and read them once, then write the deltas
+    # in one executemany. Slots that fill up keep their earliest rows.
+    if not slots:
+        return []
+
+    # Like reserve, no counter is opened for a key without capacity.
+    keys = {
+        key
+        for slot in slots
+        for key, capacity in _counters(slot)
+        if capacity > 0
+    }
+    if not keys:
+        return [False] * len(slots)
+
+    session.execute(
+        dialect_insert(session, SlotOccupancy).on_conflict_do_nothing(),
+        [
+            {'date': date, 'shift': shift, 'service_id': service_id}
+            for date, shift, service_id in keys
+        ],
+    )
+
+    rows = session.execute(
+        select(
+            SlotOccupancy.date,
+            SlotOccupancy.shift,
+            SlotOccupancy.service_id,
+            SlotOccupancy.booked,
+        )
+        .where(SlotOccupancy.date.in_({date for date, _, _ in keys}))
+        .with_for_update()
+    )
+    booked = {tuple(row[:3]): row.booked for row in rows}
+
+    accepted, taken = [], Counter()
+    for slot in slots:
+        counters = _counters(slot)
+        fits = all(
+            booked.get(key, 0) + taken[key] < capacity
+            for key, capacity in counters
+        )
+        if fits:
+            taken.update(key for key, _ in counters)
+        accepted.append(fits)
+
+    if taken:
+        session.connection().execute(
+            update(slot_occupancy)
+            .where(
+                slot_occupancy.c.date == bindparam('slot_date'),
+                slot_occupancy.c.shift == bindparam('slot_shift'),
+                slot_occupancy.c.service_id == bindparam('slot_service_id'),
+            )
+            .values(booked=slot_occupancy.c.booked + bindparam('taken')),
+            [
+                {
+                    'slot_date': date,
+                    'slot_shift': shift,
+                    'slot_service_id': service_id,
+                    'taken': count,
+                }
+                for (date, shift, service_id), count in taken.items()
+            ],
+        )
+
+    return accepted
+
+
+def rebuild(session: Session) -> int:
+    # Recounts every counter from the schedules, for rows written around
+    # the API (seeds, manual fixes) or counters that drifted.
+    session.execute(delete(SlotOccupancy))
+
+    columns = ['date', 'shift', 'service_id', 'booked']
+    for service_id in (literal(TEAM), Schedule.service_id):
+        session.execute(
+            insert(SlotOccupancy).from_select(
+                columns,
+                select(
+                    Schedule.date, Schedule.shift, service_id, func.count()
+                ).group_by(Schedule.date, Schedule.shift, service_id),
+            )
+        )
+
+    return session.scalar(select(func.count()).select_from(SlotOccupancy))
+
+
+def calendar_rows(
+    start: datetime.date, end: datetime.date, group_by: CalendarGrouping
+) -> Select:
+    # Reads the counters, not the schedules: one row per day and shift (or
+    # service) however many bookings it stands for.
+    if group_by == 'shift':
+        key, counters = SlotOccupancy.shift, SlotOccupancy.service_id == TEAM
+    else:
+        key = SlotOccupancy.service_id
+        counters = SlotOccupancy.service_id != TEAM
+
+    return (
+        select(
+            SlotOccupancy.date,
+            key.label('key'),
+            func.sum(SlotOccupancy.booked).label('booked'),
+        )
+        .where(
+            SlotOccupancy.date.between(start, end),
+            counters,
+            SlotOccupancy.booked > 0,
+        )
+        .group_by(SlotOccupancy.date, key)
+        .order_by(SlotOccupancy.date, key)
+    )
+
+
+def calendar(
+    rows: Iterable[Row],
+    start: datetime.date,
+    end: datetime.date,
+    group_by: CalendarGrouping,
+) -> dict:
+    field = 'shift' if group_by == 'shift' else 'service_id'
+    order = list(ShiftEnum)
+
+    days: dict[datetime.date, list] = {}
+    for row in rows:
+        days.setdefault(row.date, []).append({
+            field: row.key,
+            'booked': row.booked,
+        })
+
+    # Shifts are stored by name, so the database sorts them alphabetically.
+    if group_by == 'shift':
+        for groups in days.values():
+            groups.sort(key=lambda group: order.index(group['shift']))
+
+    return {
+        'start_date': start,
+        'end_date': end,
+        'group_by': group_by,
+        'days': [
+            {
+                'date': day,
+                'booked': sum(group['booked'] for group in groups),
+                'groups': groups,
+            }
+            for day, groups in days.items()
+        ],
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Rebuild the slot occupancy counters from the schedules'
+    )
+    parser.parse_args(argv)
+
+    with get_session_factory()() as session:
+        counters = rebuild(session)
+        session.commit()
+
+    print(f'Rebuilt {counters} slot counters')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,377 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable, NamedTuple, Optional, Protocol
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from projeto_final_poo.helpers.compression import (
+    choose_encoding,
+    compress,
+    enabled_encodings,
+    mark_encoded,
+)
+from projeto_final_poo.helpers.conditional import not_modified_response
+from projeto_final_poo.helpers.settings import env
+
+
+class CacheEntry(NamedTuple):
+    body: bytes
+    headers: dict[str, str]
+    # Compressed copies of the body, by content encoding.
+    variants: dict[str, bytes]
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[CacheEntry]: ...
+
+    def set(
+        self, key: str, value: CacheEntry, tags: Iterable[str]
+    ) -> None: ...
+
+    def invalidate(self, *tags: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict: ...
+
+
+class ResponseCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[
+            str, tuple[float, CacheEntry, frozenset]
+        ] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._discard(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: CacheEntry, tags: Iterable[str]) -> None:
+        if self.maxsize <= 0:
+            return
+
+        tags = frozenset(tags)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            'backend': 'memory',
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+        }
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+
+class SharedResponseCache:
+    # Every worker on the host opens the same SQLite file, so an entry set
+    # by one worker is a hit for the others and a write in any of them
+    # invalidates it everywhere. Expiry uses wall-clock time for the same
+    # reason: monotonic clocks are not comparable across processes.
+    # Entries are stored as plain bytes and JSON, never pickled: anything
+    # able to write to the file must not be able to run code in a worker.
+    # A hit is a plain SELECT and takes no write lock: used_at moves at
+    # most once per TOUCH_INTERVAL, and hit and miss counts wait in memory
+    # for the next write (or stats()) to add them to the shared counters.
+    SCHEMA_VERSION = 1
+    TOUCH_INTERVAL = 1.0
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            key TEXT PRIMARY KEY,
+            body BLOB NOT NULL,
+            headers TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            used_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS entries_used_at ON entries (used_at);
+        CREATE TABLE IF NOT EXISTS entry_variants (
+            key TEXT NOT NULL REFERENCES entries (key) ON DELETE CASCADE,
+            encoding TEXT NOT NULL,
+            body BLOB NOT NULL,
+            PRIMARY KEY (key, encoding)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS entry_tags (
+            tag TEXT NOT NULL,
+            key TEXT NOT NULL REFERENCES entries (key) ON DELETE CASCADE,
+            PRIMARY KEY (tag, key)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS entry_tags_key ON entry_tags (key);
+        CREATE TABLE IF NOT EXISTS counters (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            hits INTEGER NOT NULL,
+            misses INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO counters VALUES (1, 0, 0);
+    """
+    # Files written before SCHEMA_VERSION held pickled values; a cache is
+    # disposable, so those tables are dropped rather than read.
+    LEGACY_TABLES = ('entry_tags', 'entries', 'counters')
+
+    def __init__(self, path: str, maxsize: int, ttl: float) -> None:
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = Lock()
+        self._hits = self._misses = 0
+        self._connection = sqlite3.connect(
+            path,
+            timeout=5,
+            isolation_level='IMMEDIATE',
+            check_same_thread=False,
+        )
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute('PRAGMA foreign_keys=ON')
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        (version,) = self._connection.execute('PRAGMA user_version').fetchone()
+        if version < self.SCHEMA_VERSION:
+            self._connection.executescript(
+                ''.join(
+                    f'DROP TABLE IF EXISTS {table};'
+                    for table in self.LEGACY_TABLES
+                )
+            )
+
+        self._connection.executescript(self.SCHEMA)
+        self._connection.execute(f'PRAGMA user_version={self.SCHEMA_VERSION}')
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        now = time.time()
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT entries.body, headers, used_at, encoding, '
+                'entry_variants.body FROM entries '
+                'LEFT JOIN entry_variants USING (key) '
+                'WHERE key = ? AND expires_at > ?',
+                (key, now),
+            ).fetchall()
+
+            if not rows:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            if rows[0][2] <= now - self.TOUCH_INTERVAL:
+                with self._connection as connection:
+                    connection.execute(
+                        'UPDATE entries SET used_at = ? WHERE key = ?',
+                        (now, key),
+                    )
+                    self._flush_counters(connection)
+
+        body, headers = rows[0][:2]
+        variants = {
+            encoding: variant
+            for *_, encoding, variant in rows
+            if encoding is not None
+        }
+
+        return CacheEntry(body, json.loads(headers), variants)
+
+    def set(self, key: str, value: CacheEntry, tags: Iterable[str]) -> None:
+        if self.maxsize <= 0:
+            return
+
+        now = time.time()
+        with self._lock, self._connection as connection:
+            connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+            connection.execute(
+                'INSERT INTO entries VALUES (?, ?, ?, ?, ?)',
+                (
+                    key,
+                    value.body,
+                    json.dumps(value.headers),
+                    now + self.ttl,
+                    now,
+                ),
+            )
+            connection.executemany(
+                'INSERT INTO entry_variants VALUES (?, ?, ?)',
+                [
+                    (key, encoding, body)
+                    for encoding, body in value.variants.items()
+                ],
+            )
+            connection.executemany(
+                'INSERT INTO entry_tags VALUES (?, ?)',
+                [(tag, key) for tag in set(tags)],
+            )
+            connection.execute(
+                'DELETE FROM entries WHERE expires_at <= ? OR key IN ('
+                '    SELECT key FROM entries'
+                '    ORDER BY used_at DESC LIMIT -1 OFFSET ?'
+                ')',
+                (now, self.maxsize),
+            )
+            self._flush_counters(connection)
+
+    def invalidate(self, *tags: str) -> None:
+        if not tags:
+            return
+
+        with self._lock, self._connection as connection:
+            connection.execute(
+                'DELETE FROM entries WHERE key IN ('
+                '    SELECT key FROM entry_tags'
+                f'    WHERE tag IN ({", ".join("?" * len(tags))})'
+                ')',
+                tags,
+            )
+            self._flush_counters(connection)
+
+    def clear(self) -> None:
+        with self._lock, self._connection as connection:
+            connection.execute('DELETE FROM entries')
+            connection.execute('UPDATE counters SET hits = 0, misses = 0')
+            self._hits = self._misses = 0
+
+    def stats(self) -> dict:
+        with self._lock, self._connection as connection:
+            self._flush_counters(connection)
+            hits, misses, size = connection.execute(
+                'SELECT hits, misses, (SELECT count(*) FROM entries) '
+                'FROM counters'
+            ).fetchone()
+
+        return {
+            'backend': 'sqlite',
+            'hits': hits,
+            'misses': misses,
+            'size': size,
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+        }
+
+    def _flush_counters(self, connection: sqlite3.Connection) -> None:
+        # Under the lock; the UPDATE opens the write transaction only when
+        # there is something to add.
+        if self._hits or self._misses:
+            connection.execute(
+                'UPDATE counters SET hits = hits + ?, misses = misses + ? '
+                'WHERE id = 1',
+                (self._hits, self._misses),
+            )
+            self._hits = self._misses = 0
+
+
+def create_response_cache() -> CacheBackend:
+    if env.RESPONSE_CACHE_BACKEND == 'sqlite':
+        return SharedResponseCache(
+            env.RESPONSE_CACHE_PATH,
+            env.RESPONSE_CACHE_SIZE,
+            env.RESPONSE_CACHE_TTL,
+        )
+
+    return ResponseCache(env.RESPONSE_CACHE_SIZE, env.RESPONSE_CACHE_TTL)
+
+
+response_cache = create_response_cache()
+
+
+def cache_key(request: Request) -> str:
+    return f'{request.url.path}?{request.url.query}'
+
+
+def _entry_response(request: Request, entry: CacheEntry) -> Response:
+    body, headers, variants = entry
+    encoding = choose_encoding(request.headers.get('accept-encoding'))
+
+    if encoding not in variants:
+        return Response(body, media_type='application/json', headers=headers)
+
+    response = Response(
+        variants[encoding], media_type='application/json', headers=headers
+    )
+    mark_encoded(response.headers, encoding)
+
+    return response
+
+
+def cached_response(request: Request) -> Optional[Response]:
+    entry = response_cache.get(cache_key(request))
+
+    if entry is None:
+        return None
+
+    # Writes invalidate the entry, so its validators are still current and
+    # a conditional request is answered without probing the database.
+    if not_modified := not_modified_response(request, entry.headers):
+        return not_modified
+
+    return _entry_response(request, entry)
+
+
+def cache_response(
+    request: Request,
+    content: BaseModel,
+    tags: Iterable[str],
+    exclude_none: bool = False,
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    # Entries hold the serialized body, so a hit skips Pydantic entirely,
+    # plus one compressed copy per enabled encoding so the compression
+    # middleware does not redo that work on every hit.
+    body = content.model_dump_json(exclude_none=exclude_none).encode()
+    variants = {}
+    if len(body) >= env.COMPRESSION_MINIMUM_SIZE:
+        variants = {
+            encoding: compress(body, encoding)
+            for encoding in enabled_encodings()
+        }
+
+    entry = CacheEntry(body, headers or {}, variants)
+    response_cache.set(cache_key(request), entry, tags)
+
+    return _entry_response(request, entry)
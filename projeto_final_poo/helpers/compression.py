@@ -0,0 +1,187 @@
+import zlib
+from typing import Callable, Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from projeto_final_poo.helpers.formats import parse_accept
+from projeto_final_poo.helpers.settings import env
+
+# Brotli and zstd are optional extras (poetry install -E compression);
+# gzip comes from the standard library and is always available.
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class BrotliCompressor:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+def gzip_compressor(level: int) -> Compressor:
+    # wbits=31 writes the gzip header and trailer around the deflate stream.
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def zstd_compressor(level: int) -> Compressor:
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+CODECS: dict[str, Callable[[int], Compressor]] = {'gzip': gzip_compressor}
+if brotli is not None:
+    CODECS['br'] = BrotliCompressor
+if zstandard is not None:
+    CODECS['zstd'] = zstd_compressor
+
+
+def enabled_encodings() -> list[str]:
+    return [
+        encoding
+        for encoding in env.COMPRESSION_ENCODINGS
+        if encoding in CODECS
+    ]
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    if not accept_encoding:
+        return None
+
+    accepted = {coding: q for q, coding in parse_accept(accept_encoding)}
+    for encoding in enabled_encodings():
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+
+    return None
+
+
+def compress(
+    body: bytes, encoding: str, level: int = env.COMPRESSION_LEVEL
+) -> bytes:
+    compressor = CODECS[encoding](level)
+    return compressor.compress(body) + compressor.flush()
+
+
+def mark_encoded(headers: MutableHeaders, encoding: str) -> None:
+    headers['Content-Encoding'] = encoding
+    headers.add_vary_header('Accept-Encoding')
+
+    # The compressed bytes differ from the identity body, so the validator
+    # can only be weak; If-None-Match compares weakly anyway.
+    etag = headers.get('etag')
+    if etag and not etag.startswith('W/'):
+        headers['ETag'] = f'W/{etag}'
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = env.COMPRESSION_MINIMUM_SIZE,
+        level: int = env.COMPRESSION_LEVEL,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        encoding = None
+        if scope['type'] == 'http':
+            encoding = choose_encoding(
+                Headers(scope=scope).get('accept-encoding')
+            )
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = CompressionResponder(
+            self.app, encoding, self.minimum_size, self.level
+        )
+        await responder(scope, receive, send)
+
+
+class CompressionResponder:
+    # Same flow as Starlette's GZipResponder, for any codec in CODECS.
+    # Responses that already carry a Content-Encoding (precompressed cache
+    # entries) are passed through untouched.
+    def __init__(
+        self, app: ASGIApp, encoding: str, minimum_size: int, level: int
+    ) -> None:
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.level = level
+        self.compressor: Optional[Compressor] = None
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message['type'] == 'http.response.start':
+            self.initial_message = message
+            self.passthrough = 'content-encoding' in Headers(
+                raw=message['headers']
+            )
+            return
+
+        if message['type'] != 'http.response.body':  # pragma: no cover
+            await self.send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        if not self.started:
+            self.started = True
+
+            if self.passthrough or (
+                len(body) < self.minimum_size and not more_body
+            ):
+                self.passthrough = True
+                await self.send(self.initial_message)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(raw=self.initial_message['headers'])
+            mark_encoded(headers, self.encoding)
+            del headers['Content-Length']
+
+            self.compressor = CODECS[self.encoding](self.level)
+            message['body'] = self.compressor.compress(body)
+            if not more_body:
+                message['body'] += self.compressor.flush()
+                headers['Content-Length'] = str(len(message['body']))
+
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        if not self.passthrough:
+            message['body'] = self.compressor.compress(body)
+            if not more_body:
+                message['body'] += self.compressor.flush()
+
+        await self.send(message)
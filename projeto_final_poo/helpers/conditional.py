@@ -0,0 +1,57 @@
+import datetime
+import hashlib
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Sequence
+
+from fastapi import Request, Response, status
+
+
+def validators(request: Request, probe: Optional[Sequence]) -> dict[str, str]:
+    # The probe holds the updated_at and row counts or table versions
+    # behind a response: every write moves one of them, so all feed the
+    # ETag. Nothing to describe means the handler will answer 404.
+    probe = tuple(probe or ())
+    timestamps = [
+        value for value in probe if isinstance(value, datetime.datetime)
+    ]
+    if not timestamps:
+        return {}
+
+    raw = '|'.join([request.url.path, request.url.query, *map(str, probe)])
+    last_modified = max(timestamps).replace(tzinfo=datetime.timezone.utc)
+
+    return {
+        'ETag': f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"',
+        'Last-Modified': format_datetime(last_modified, usegmt=True),
+    }
+
+
+def _is_not_modified(request: Request, headers: dict[str, str]) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        # If-None-Match uses weak comparison, so a W/ tag sent back for a
+        # compressed response still matches.
+        tags = [
+            tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+        ]
+        return '*' in tags or headers['ETag'].removeprefix('W/') in tags
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    return since >= parsedate_to_datetime(headers['Last-Modified'])
+
+
+def not_modified_response(
+    request: Request, headers: dict[str, str]
+) -> Optional[Response]:
+    if 'ETag' not in headers or not _is_not_modified(request, headers):
+        return None
+
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -1,4 +1,6 @@
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 
 
 class NotFoundException(HTTPException):
@@ -17,9 +19,26 @@ class BadRequestException(HTTPException):
         )
 
 
+class NotAcceptableException(HTTPException):
+    def __init__(self, detail: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=detail,
+        )
+
+
 class ConflictException(HTTPException):
     def __init__(self, detail: str) -> None:
         super().__init__(
             status_code=status.HTTP_409_CONFLICT,
             detail=detail,
         )
+
+
+def integrity_error_handler(
+    request: Request, exc: IntegrityError
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={'detail': 'Conflict with existing data'},
+    )
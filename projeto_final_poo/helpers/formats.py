@@ -0,0 +1,177 @@
+import datetime
+import io
+from typing import Literal, Optional, Sequence
+
+import orjson
+from fastapi import Request, Response
+from sqlalchemy import ColumnElement, Row
+
+from projeto_final_poo.helpers.exceptions import NotAcceptableException
+
+# MessagePack and Arrow are optional extras (poetry install -E formats);
+# without them those formats are answered with 406.
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+ResponseFormat = Literal['json', 'columnar', 'msgpack', 'arrow']
+
+MEDIA_TYPES: dict[str, ResponseFormat] = {
+    'application/json': 'json',
+    'application/*': 'json',
+    '*/*': 'json',
+    'application/vnd.columnar+json': 'columnar',
+    'application/msgpack': 'msgpack',
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.apache.arrow.stream': 'arrow',
+}
+CONTENT_TYPES: dict[ResponseFormat, str] = {
+    'json': 'application/json',
+    'columnar': 'application/vnd.columnar+json',
+    'msgpack': 'application/msgpack',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+# For the OpenAPI docs of routes that negotiate their format.
+FORMAT_RESPONSES = {
+    200: {
+        'content': {
+            media_type: {}
+            for response_format, media_type in CONTENT_TYPES.items()
+            if response_format != 'json'
+        }
+    },
+    406: {'description': 'None of the accepted media types is supported'},
+}
+
+
+def _quality(params: Sequence[str]) -> float:
+    for param in params:
+        name, _, value = param.partition('=')
+        if name.strip() == 'q':
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+
+    return 1.0
+
+
+def parse_accept(header: str) -> list[tuple[float, str]]:
+    # Works for Accept and Accept-Encoding alike. sorted() is stable, so
+    # equally weighted values keep the client's order.
+    ranges = []
+    for value in header.split(','):
+        name, *params = value.split(';')
+        ranges.append((_quality(params), name.strip().lower()))
+
+    return sorted(ranges, key=lambda r: -r[0])
+
+
+def negotiate(
+    request: Request, requested: Optional[ResponseFormat] = None
+) -> ResponseFormat:
+    # An explicit ?format= wins over Accept, which browsers and HTTP
+    # libraries fill in on their own.
+    if requested:
+        return requested
+
+    accept = request.headers.get('accept')
+    if not accept:
+        return 'json'
+
+    for quality, media_type in parse_accept(accept):
+        if quality > 0 and media_type in MEDIA_TYPES:
+            return MEDIA_TYPES[media_type]
+
+    raise NotAcceptableException(
+        f'Supported media types: {", ".join(CONTENT_TYPES.values())}'
+    )
+
+
+def to_columns(rows: Sequence[Row], keys: Sequence[str]) -> dict[str, list]:
+    if not rows:
+        return {key: [] for key in keys}
+
+    return dict(zip(keys, map(list, zip(*rows))))
+
+
+def _msgpack_default(value):
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+
+    raise TypeError(f'Cannot serialize {type(value).__name__}')
+
+
+def _encode_msgpack(page: dict, columns: Sequence[ColumnElement]) -> bytes:
+    if msgpack is None:  # pragma: no cover
+        raise NotAcceptableException('MessagePack support is not installed')
+
+    return msgpack.packb(page, default=_msgpack_default)
+
+
+def _arrow_type(column: ColumnElement):
+    python_type = column.type.python_type
+    if issubclass(python_type, bool):
+        return pa.bool_()
+    if issubclass(python_type, int):
+        return pa.int64()
+    if issubclass(python_type, float):
+        return pa.float64()
+    if issubclass(python_type, datetime.datetime):
+        return pa.timestamp('us')
+    if issubclass(python_type, datetime.date):
+        return pa.date32()
+
+    return pa.string()
+
+
+def _encode_arrow(page: dict, columns: Sequence[ColumnElement]) -> bytes:
+    if pa is None:  # pragma: no cover
+        raise NotAcceptableException('Arrow support is not installed')
+
+    # Types come from the query, so an empty page still has a schema.
+    schema = pa.schema(
+        [pa.field(column.key, _arrow_type(column)) for column in columns],
+        metadata={'next_cursor': page.get('next_cursor') or ''},
+    )
+    table = pa.Table.from_pydict(page['columns'], schema=schema)
+
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue()
+
+
+ENCODERS = {
+    'columnar': lambda page, columns: orjson.dumps(page),
+    'msgpack': _encode_msgpack,
+    'arrow': _encode_arrow,
+}
+
+
+def columnar_response(
+    response_format: ResponseFormat,
+    rows: Sequence[Row],
+    columns: Sequence[ColumnElement],
+    cursor: Optional[str],
+    headers: Optional[dict[str, str]] = None,
+) -> Response:
+    # One array per column instead of one object per row, so field names
+    # are sent once per page rather than once per row.
+    page = {'columns': to_columns(rows, [column.key for column in columns])}
+    if cursor is not None:
+        page['next_cursor'] = cursor
+
+    return Response(
+        ENCODERS[response_format](page, columns),
+        media_type=CONTENT_TYPES[response_format],
+        headers=headers,
+    )
@@ -0,0 +1,52 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import ColumnElement, Select, literal, tuple_
+
+from projeto_final_poo.helpers.exceptions import BadRequestException
+
+Key = tuple[ColumnElement, Callable[[Any], Any]]
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(list(values), default=str, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable]) -> list:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(cursor)
+
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (binascii.Error, TypeError, ValueError):
+        raise BadRequestException('Invalid cursor')
+
+
+def keyset(query: Select, cursor: Optional[str], *keys: Key) -> Select:
+    columns = [column for column, _ in keys]
+    query = query.order_by(None).order_by(*columns)
+
+    if cursor is None:
+        return query
+
+    values = decode_cursor(cursor, [parse for _, parse in keys])
+    bound = [
+        literal(value, column.type) for column, value in zip(columns, values)
+    ]
+
+    return query.where(tuple_(*columns) > tuple_(*bound))
+
+
+def next_cursor(
+    page: Sequence, limit: Optional[int], key: Callable[[Any], Sequence]
+) -> Optional[str]:
+    if not page or limit is None or len(page) < limit:
+        return None
+
+    return encode_cursor(key(page[-1]))
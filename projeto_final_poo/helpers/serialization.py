@@ -0,0 +1,39 @@
+from functools import cache
+from typing import Any, Optional
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@cache
+def type_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def model_response(
+    schema: Any,
+    content: Any,
+    headers: Optional[dict[str, str]] = None,
+    exclude_none: bool = False,
+) -> Response:
+    # FastAPI would validate the handler's return value against the
+    # response_model, turn it back into dicts and run json.dumps over them;
+    # here it is validated once and pydantic-core writes the bytes.
+    adapter = type_adapter(schema)
+    body = adapter.dump_json(
+        adapter.validate_python(content, from_attributes=True),
+        exclude_none=exclude_none,
+    )
+
+    return Response(body, media_type='application/json', headers=headers)
+
+
+def trusted_response(
+    content: Any, headers: Optional[dict[str, str]] = None
+) -> Response:
+    # For payloads the handler assembled from database rows in the exact
+    # shape of its response_model: no validation at all, just orjson.
+    return Response(
+        orjson.dumps(content), media_type='application/json', headers=headers
+    )
@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,5 +12,35 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
 
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+
+    ASYNC_DATABASE: bool = False
+
+    SQLITE_PROFILE: Literal['throughput', 'durability'] = 'throughput'
+    SQLITE_JOURNAL_MODE: Optional[str] = None
+    SQLITE_SYNCHRONOUS: Optional[str] = None
+    SQLITE_MMAP_SIZE: Optional[int] = None
+    SQLITE_CACHE_SIZE: Optional[int] = None
+    SQLITE_TEMP_STORE: Optional[str] = None
+    SQLITE_BUSY_TIMEOUT: Optional[int] = None
+
+    SCHEDULE_SLOTS_PER_SHIFT: int = 4
+    SERVICE_SLOTS_PER_SHIFT: dict[int, int] = {}
+
+    EXPORT_CHUNK_SIZE: int = 1000
+    IMPORT_CHUNK_SIZE: int = 1000
+
+    RESPONSE_CACHE_BACKEND: Literal['memory', 'sqlite'] = 'memory'
+    RESPONSE_CACHE_PATH: str = 'response_cache.db'
+    RESPONSE_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_TTL: float = 60
+
+    COMPRESSION_ENCODINGS: list[str] = ['br', 'zstd', 'gzip']
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_LEVEL: int = 6
+
 
 env = Settings()
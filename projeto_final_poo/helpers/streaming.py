@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import Callable, Iterator, Sequence
+
+from sqlalchemy import Row, Select
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.helpers.settings import env
+
+
+def stream_rows(session: Session, query: Select) -> Iterator[Sequence[Row]]:
+    # FastAPI tears down yield dependencies before a streaming body is sent,
+    # so the session is used past its dependency and has to be closed here.
+    try:
+        result = session.execute(
+            query.execution_options(yield_per=env.EXPORT_CHUNK_SIZE)
+        )
+        yield from result.partitions()
+    finally:
+        session.close()
+
+
+def ndjson_lines(
+    partitions: Iterator[Sequence[Row]], serialize: Callable[[Row], dict]
+) -> Iterator[str]:
+    for rows in partitions:
+        yield ''.join(
+            json.dumps(serialize(row), default=str) + '\n' for row in rows
+        )
+
+
+def _plain(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def csv_lines(
+    partitions: Iterator[Sequence[Row]], columns: Sequence[str]
+) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for rows in partitions:
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    yield buffer.getvalue()
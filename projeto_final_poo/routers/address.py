@@ -1,13 +1,31 @@
-from fastapi import APIRouter, status
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Request, status
+from sqlalchemy import update
 
 from projeto_final_poo.custom_types.annotated_types import T_Session
-from projeto_final_poo.db.models import Address, Client
+from projeto_final_poo.db.bulk import insert_returning, lookup
+from projeto_final_poo.db.models import Address, Client, Schedule
+from projeto_final_poo.db.queries import probe_client
+from projeto_final_poo.db.slots import touch
+from projeto_final_poo.helpers.cache import (
+    cache_response,
+    cached_response,
+    response_cache,
+)
+from projeto_final_poo.helpers.conditional import (
+    not_modified_response,
+    validators,
+)
 from projeto_final_poo.helpers.exceptions import (
     BadRequestException,
     NotFoundException,
 )
 from projeto_final_poo.schemas.schemas import (
+    MAX_BULK_SIZE,
+    AddressBulkResult,
     AddressesList,
+    AddressPatch,
     AddressPublic,
     AddressSchema,
     AddressUpdate,
@@ -34,7 +52,9 @@ def add_address(address: AddressSchema, session: T_Session):
     )
 
     session.add(db_address)
+    session.execute(touch(Schedule.client_id == address.client_id))
     session.commit()
+    response_cache.invalidate(f'clients:{address.client_id}')
 
     session.refresh(db_address)
     session.refresh(db_client)
@@ -42,14 +62,73 @@ def add_address(address: AddressSchema, session: T_Session):
     return db_address
 
 
+@router.post(
+    '/bulk',
+    status_code=status.HTTP_201_CREATED,
+    response_model=AddressBulkResult,
+)
+def add_addresses_bulk(
+    addresses: Annotated[list[AddressSchema], Body(max_length=MAX_BULK_SIZE)],
+    session: T_Session,
+):
+    clients = lookup(
+        session, Client.id, (address.client_id for address in addresses)
+    )
+
+    rows, errors = [], []
+    for index, address in enumerate(addresses):
+        if address.client_id not in clients:
+            errors.append({'index': index, 'detail': 'Client not found'})
+            continue
+
+        rows.append(address.model_dump())
+
+    db_addresses = insert_returning(
+        session,
+        Address,
+        rows,
+        Address.id,
+        Address.client_id,
+        Address.street,
+        Address.neighborhood,
+        Address.reference,
+        Address.number,
+    )
+    client_ids = {row['client_id'] for row in rows}
+    if client_ids:
+        session.execute(touch(Schedule.client_id.in_(client_ids)))
+    session.commit()
+    response_cache.invalidate(*{f'clients:{id}' for id in client_ids})
+
+    return {'addresses': db_addresses, 'errors': errors}
+
+
 @router.get('/{client_id}', response_model=AddressesList)
-def get_addresses_by_client(client_id: int, session: T_Session):
+def get_addresses_by_client(
+    client_id: int, request: Request, session: T_Session
+):
+    if cached := cached_response(request):
+        return cached
+
+    headers = validators(
+        request, session.execute(probe_client(client_id)).one_or_none()
+    )
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
     db_client = session.get(Client, client_id)
 
     if not db_client:
         raise NotFoundException('Client not found')
 
-    return {'addresses': db_client.addresses}
+    return cache_response(
+        request,
+        AddressesList.model_validate(
+            {'addresses': db_client.addresses}, from_attributes=True
+        ),
+        tags=['clients', f'clients:{client_id}'],
+        headers=headers,
+    )
 
 
 @router.put('/{id}', response_model=AddressPublic)
@@ -64,8 +143,41 @@ def update_address(id: int, address: AddressUpdate, session: T_Session):
     db_address.reference = address.reference
     db_address.number = address.number
 
+    session.execute(touch(Schedule.client_id == db_address.client_id))
     session.commit()
     session.refresh(db_address)
+    response_cache.invalidate(f'clients:{db_address.client_id}')
+
+    return db_address
+
+
+@router.patch('/{id}', response_model=AddressPublic)
+def patch_address(id: int, address: AddressPatch, session: T_Session):
+    values = address.model_dump(exclude_none=True)
+
+    if not values:
+        raise BadRequestException('No fields to update')
+
+    db_address = session.execute(
+        update(Address)
+        .where(Address.id == id)
+        .values(**values)
+        .returning(
+            Address.id,
+            Address.client_id,
+            Address.street,
+            Address.neighborhood,
+            Address.reference,
+            Address.number,
+        )
+    ).one_or_none()
+
+    if not db_address:
+        raise NotFoundException('Address not found')
+
+    session.execute(touch(Schedule.client_id == db_address.client_id))
+    session.commit()
+    response_cache.invalidate(f'clients:{db_address.client_id}')
 
     return db_address
 
@@ -84,7 +196,11 @@ def delete_address(id: int, session: T_Session):
             "It is not possible to delete the client's only address."
         )
 
+    client_id = db_address.client_id
+
     session.delete(db_address)
+    session.execute(touch(Schedule.client_id == client_id))
     session.commit()
+    response_cache.invalidate(f'clients:{client_id}')
 
     return {'message': 'Address deleted'}
@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Request, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+
+from projeto_final_poo.custom_types.annotated_types import T_AsyncSession
+from projeto_final_poo.db.models import Address, Client, Schedule
+from projeto_final_poo.db.queries import probe_client
+from projeto_final_poo.db.slots import touch
+from projeto_final_poo.helpers.cache import (
+    cache_response,
+    cached_response,
+    response_cache,
+)
+from projeto_final_poo.helpers.conditional import (
+    not_modified_response,
+    validators,
+)
+from projeto_final_poo.helpers.exceptions import (
+    BadRequestException,
+    NotFoundException,
+)
+from projeto_final_poo.schemas.schemas import (
+    AddressesList,
+    AddressPublic,
+    AddressSchema,
+    AddressUpdate,
+)
+
+router = APIRouter(prefix='/address', tags=['address'])
+
+
+@router.post(
+    '/', status_code=status.HTTP_201_CREATED, response_model=AddressPublic
+)
+async def add_address(address: AddressSchema, session: T_AsyncSession):
+    db_client = await session.get(Client, address.client_id)
+
+    if not db_client:
+        raise NotFoundException('Client not found')
+
+    db_address = Address(
+        client_id=address.client_id,
+        street=address.street,
+        neighborhood=address.neighborhood,
+        reference=address.reference,
+        number=address.number,
+    )
+
+    session.add(db_address)
+    await session.execute(touch(Schedule.client_id == address.client_id))
+    await session.commit()
+    response_cache.invalidate(f'clients:{address.client_id}')
+
+    return db_address
+
+
+@router.get('/{client_id:int}', response_model=AddressesList)
+async def get_addresses_by_client(
+    client_id: int, request: Request, session: T_AsyncSession
+):
+    if cached := cached_response(request):
+        return cached
+
+    probe = await session.execute(probe_client(client_id))
+    headers = validators(request, probe.one_or_none())
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    db_client = await session.get(
+        Client, client_id, options=[selectinload(Client.addresses)]
+    )
+
+    if not db_client:
+        raise NotFoundException('Client not found')
+
+    return cache_response(
+        request,
+        AddressesList.model_validate(
+            {'addresses': db_client.addresses}, from_attributes=True
+        ),
+        tags=['clients', f'clients:{client_id}'],
+        headers=headers,
+    )
+
+
+@router.put('/{id:int}', response_model=AddressPublic)
+async def update_address(
+    id: int, address: AddressUpdate, session: T_AsyncSession
+):
+    db_address = await session.get(Address, id)
+
+    if not db_address:
+        raise NotFoundException('Address not found')
+
+    db_address.street = address.street
+    db_address.neighborhood = address.neighborhood
+    db_address.reference = address.reference
+    db_address.number = address.number
+
+    await session.execute(touch(Schedule.client_id == db_address.client_id))
+    await session.commit()
+    response_cache.invalidate(f'clients:{db_address.client_id}')
+
+    return db_address
+
+
+@router.delete('/{id:int}', response_model=dict)
+async def delete_address(id: int, session: T_AsyncSession):
+    db_address = await session.get(Address, id)
+
+    if not db_address:
+        raise NotFoundException('Address not found')
+
+    addresses_count = await session.scalar(
+        select(func.count())
+        .select_from(Address)
+        .where(Address.client_id == db_address.client_id)
+    )
+
+    if addresses_count <= 1:
+        raise BadRequestException(
+            "It is not possible to delete the client's only address."
+        )
+
+    await session.delete(db_address)
+    await session.execute(touch(Schedule.client_id == db_address.client_id))
+    await session.commit()
+    response_cache.invalidate(f'clients:{db_address.client_id}')
+
+    return {'message': 'Address deleted'}
@@ -0,0 +1,185 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from projeto_final_poo.custom_types.annotated_types import T_AsyncSession
+from projeto_final_poo.db.bulk import dialect_insert
+from projeto_final_poo.db.models import Address, Client, Schedule
+from projeto_final_poo.db.queries import probe_client, probe_clients
+from projeto_final_poo.db.slots import release
+from projeto_final_poo.helpers.cache import (
+    cache_response,
+    cached_response,
+    response_cache,
+)
+from projeto_final_poo.helpers.conditional import (
+    not_modified_response,
+    validators,
+)
+from projeto_final_poo.helpers.exceptions import (
+    ConflictException,
+    NotFoundException,
+)
+from projeto_final_poo.helpers.pagination import keyset, next_cursor
+from projeto_final_poo.helpers.serialization import model_response
+from projeto_final_poo.schemas.schemas import (
+    ClientList,
+    ClientPublic,
+    ClientSchema,
+    ClientUpdate,
+    Message,
+    PageParams,
+)
+
+router = APIRouter(prefix='/clients', tags=['clients'])
+
+
+@router.post(
+    '/', status_code=status.HTTP_201_CREATED, response_model=ClientPublic
+)
+async def create_client(
+    client: ClientSchema,
+    session: T_AsyncSession,
+    response: Response,
+    on_conflict: Literal['fail', 'return'] = 'fail',
+):
+    client_id = await session.scalar(
+        dialect_insert(session, Client)
+        .values(name=client.name, phone_number=client.phone_number)
+        .on_conflict_do_nothing(index_elements=[Client.phone_number])
+        .returning(Client.id)
+    )
+
+    if client_id is None:
+        if on_conflict == 'fail':
+            raise ConflictException(
+                'Phone number already exists in another client'
+            )
+
+        response.status_code = status.HTTP_200_OK
+        return await session.scalar(
+            select(Client)
+            .where(Client.phone_number == client.phone_number)
+            .options(selectinload(Client.addresses))
+        )
+
+    await session.execute(
+        insert(Address).values(
+            street=client.street,
+            neighborhood=client.neighborhood,
+            reference=client.reference,
+            number=client.number,
+            client_id=client_id,
+        )
+    )
+    await session.commit()
+
+    return await session.get(
+        Client, client_id, options=[selectinload(Client.addresses)]
+    )
+
+
+@router.get('/', response_model=ClientList, response_model_exclude_none=True)
+async def get_all_clients(
+    request: Request,
+    session: T_AsyncSession,
+    page: PageParams = Depends(),
+):
+    probe = await session.execute(probe_clients())
+    headers = validators(request, probe.one())
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    query = keyset(
+        select(Client).options(selectinload(Client.addresses)),
+        page.cursor,
+        (Client.id, int),
+    )
+    clients = (
+        await session.scalars(query.limit(page.limit).offset(page.offset))
+    ).all()
+
+    return model_response(
+        ClientList,
+        {
+            'clients': clients,
+            'next_cursor': next_cursor(clients, page.limit, lambda c: [c.id]),
+        },
+        headers=headers,
+        exclude_none=True,
+    )
+
+
+@router.get('/{id:int}', response_model=ClientPublic)
+async def get_client_by_id(id: int, request: Request, session: T_AsyncSession):
+    if cached := cached_response(request):
+        return cached
+
+    probe = await session.execute(probe_client(id))
+    headers = validators(request, probe.one_or_none())
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    client = await session.get(
+        Client, id, options=[selectinload(Client.addresses)]
+    )
+
+    if not client:
+        raise NotFoundException('Client not found')
+
+    return cache_response(
+        request,
+        ClientPublic.model_validate(client),
+        tags=['clients', f'clients:{id}'],
+        headers=headers,
+    )
+
+
+@router.put('/{id:int}', response_model=ClientPublic)
+async def update_client(
+    id: int, client: ClientUpdate, session: T_AsyncSession
+):
+    try:
+        updated = await session.scalar(
+            update(Client)
+            .where(Client.id == id)
+            .values(name=client.name, phone_number=client.phone_number)
+            .returning(Client.id)
+        )
+    except IntegrityError:
+        await session.rollback()
+        raise ConflictException(
+            'Phone number already exists in another client'
+        )
+
+    if not updated:
+        raise NotFoundException('Client not found')
+
+    await session.commit()
+    response_cache.invalidate(f'clients:{id}')
+
+    return await session.get(
+        Client,
+        id,
+        options=[selectinload(Client.addresses)],
+        populate_existing=True,
+    )
+
+
+@router.delete('/{id:int}', response_model=Message)
+async def delete_client(id: int, session: T_AsyncSession):
+    await session.execute(release(Schedule.client_id == id))
+    deleted = await session.scalar(
+        delete(Client).where(Client.id == id).returning(Client.id)
+    )
+
+    if not deleted:
+        raise NotFoundException('Client not found')
+
+    await session.commit()
+    response_cache.invalidate(f'clients:{id}')
+
+    return {'message': 'Client and associated addresses deleted'}
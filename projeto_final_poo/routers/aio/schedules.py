@@ -0,0 +1,264 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.orm import joinedload
+
+from projeto_final_poo.custom_types.annotated_types import T_AsyncSession
+from projeto_final_poo.db.models import Client, Schedule, Service
+from projeto_final_poo.db.queries import (
+    SCHEDULE_CALENDAR_KEY,
+    SCHEDULE_ID_KEY,
+    filter_schedules,
+    probe_schedule,
+    probe_schedules,
+    schedule_calendar_key,
+    schedule_from_row,
+    schedule_id_key,
+    schedule_page,
+    schedule_rows,
+)
+from projeto_final_poo.db.slots import book_slot_async, release, touch
+from projeto_final_poo.helpers.cache import (
+    cache_response,
+    cached_response,
+    response_cache,
+)
+from projeto_final_poo.helpers.conditional import (
+    not_modified_response,
+    validators,
+)
+from projeto_final_poo.helpers.exceptions import (
+    BadRequestException,
+    ConflictException,
+    NotFoundException,
+)
+from projeto_final_poo.helpers.formats import (
+    FORMAT_RESPONSES,
+    ResponseFormat,
+    columnar_response,
+    negotiate,
+)
+from projeto_final_poo.helpers.pagination import keyset, next_cursor
+from projeto_final_poo.helpers.serialization import trusted_response
+from projeto_final_poo.schemas.schemas import (
+    MAX_PAGE_SIZE,
+    Message,
+    PageParams,
+    ScheduleCreate,
+    ScheduleList,
+    SchedulePublic,
+    ScheduleQueryParams,
+)
+
+router = APIRouter(prefix='/schedules', tags=['schedules'])
+
+schedule_relations = (
+    joinedload(Schedule.client),
+    joinedload(Schedule.service),
+)
+
+
+@router.post(
+    '/', status_code=status.HTTP_201_CREATED, response_model=SchedulePublic
+)
+async def create_schedule(schedule: ScheduleCreate, session: T_AsyncSession):
+    db_client = await session.get(Client, schedule.client_id)
+    if not db_client:
+        raise NotFoundException('Client not found')
+
+    db_service = await session.get(Service, schedule.service_id)
+    if not db_service:
+        raise NotFoundException('Service not found')
+
+    if not await book_slot_async(
+        session, (schedule.date, schedule.shift, schedule.service_id)
+    ):
+        await session.rollback()
+        raise ConflictException('Shift is fully booked')
+
+    db_schedule = Schedule(
+        client_id=schedule.client_id,
+        service_id=schedule.service_id,
+        date=schedule.date,
+        shift=schedule.shift,
+        description=schedule.description,
+        price=db_service.price,
+    )
+
+    db_schedule.client = db_client
+    db_schedule.service = db_service
+
+    session.add(db_schedule)
+    await session.commit()
+
+    return db_schedule
+
+
+@router.get(
+    '/',
+    response_model=ScheduleList,
+    response_model_exclude_none=True,
+    responses=FORMAT_RESPONSES,
+)
+async def get_all_schedules(
+    request: Request,
+    session: T_AsyncSession,
+    page: PageParams = Depends(),
+    response_format: Optional[ResponseFormat] = Query(None, alias='format'),
+):
+    response_format = negotiate(request, response_format)
+
+    probe = await session.execute(probe_schedules())
+    # The same URL has one representation per format, so each gets its own
+    # ETag and caches are told the body depends on Accept.
+    headers = validators(request, (*probe.one(), response_format))
+    headers['Vary'] = 'Accept'
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    query = keyset(schedule_rows(), page.cursor, *SCHEDULE_ID_KEY)
+    result = await session.execute(query.limit(page.limit).offset(page.offset))
+    rows = result.all()
+
+    cursor = next_cursor(rows, page.limit, schedule_id_key)
+
+    if response_format == 'json':
+        return trusted_response(schedule_page(rows, cursor), headers=headers)
+
+    return columnar_response(
+        response_format, rows, query.selected_columns, cursor, headers
+    )
+
+
+@router.get(
+    '/filter',
+    response_model=ScheduleList,
+    response_model_exclude_none=True,
+    responses=FORMAT_RESPONSES,
+)
+async def get_filtered_schedules(
+    request: Request,
+    session: T_AsyncSession,
+    params: ScheduleQueryParams = Depends(),
+    response_format: Optional[ResponseFormat] = Query(None, alias='format'),
+):
+    response_format = negotiate(request, response_format)
+
+    if (
+        params.start_date
+        and params.end_date
+        and params.start_date > params.end_date
+    ):
+        raise BadRequestException('start_date must be <= than end_date')
+
+    query = keyset(
+        filter_schedules(schedule_rows(), params),
+        params.cursor,
+        *SCHEDULE_CALENDAR_KEY,
+    )
+    limit = params.limit or MAX_PAGE_SIZE
+    result = await session.execute(query.offset(params.offset).limit(limit))
+    rows = result.all()
+
+    cursor = next_cursor(rows, limit, schedule_calendar_key)
+    headers = {'Vary': 'Accept'}
+
+    if response_format == 'json':
+        return trusted_response(schedule_page(rows, cursor), headers=headers)
+
+    return columnar_response(
+        response_format, rows, query.selected_columns, cursor, headers
+    )
+
+
+@router.get('/{id:int}', response_model=SchedulePublic)
+async def get_schedule_by_id(
+    id: int, request: Request, session: T_AsyncSession
+):
+    if cached := cached_response(request):
+        return cached
+
+    probe = await session.execute(probe_schedule(id))
+    headers = validators(request, probe.one_or_none())
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    row = (
+        await session.execute(
+            schedule_rows()
+            .add_columns(Schedule.service_id)
+            .where(Schedule.id == id)
+        )
+    ).one_or_none()
+
+    if not row:
+        raise NotFoundException('Schedule not found')
+
+    return cache_response(
+        request,
+        SchedulePublic.model_validate(schedule_from_row(row)),
+        tags=[
+            'schedules',
+            f'schedules:{id}',
+            f'clients:{row.client_id}',
+            f'services:{row.service_id}',
+        ],
+        headers=headers,
+    )
+
+
+@router.put('/{id:int}', response_model=SchedulePublic)
+async def update_schedule(
+    id: int, schedule: ScheduleCreate, session: T_AsyncSession
+):
+    db_schedule = await session.get(Schedule, id)
+
+    if not db_schedule:
+        raise NotFoundException('Schedule not found')
+
+    db_client = await session.get(Client, schedule.client_id)
+    if not db_client:
+        raise NotFoundException('Client not found')
+
+    db_service = await session.get(Service, schedule.service_id)
+    if not db_service:
+        raise NotFoundException('Service not found')
+
+    slot = (schedule.date, schedule.shift, schedule.service_id)
+    if slot != (db_schedule.date, db_schedule.shift, db_schedule.service_id):
+        await session.execute(release(Schedule.id == id))
+        if not await book_slot_async(session, slot):
+            await session.rollback()
+            raise ConflictException('Shift is fully booked')
+    elif db_schedule.client_id != schedule.client_id:
+        await session.execute(touch(Schedule.id == id))
+
+    # A new service is a new booking, at that service's current price.
+    if db_schedule.service_id != schedule.service_id:
+        db_schedule.price = db_service.price
+
+    db_schedule.client = db_client
+    db_schedule.service = db_service
+    db_schedule.date = schedule.date
+    db_schedule.shift = schedule.shift
+    db_schedule.description = schedule.description
+
+    await session.commit()
+    response_cache.invalidate(f'schedules:{id}')
+
+    return db_schedule
+
+
+@router.delete('/{id:int}', response_model=Message)
+async def delete_schedule(id: int, session: T_AsyncSession):
+    db_schedule = await session.get(Schedule, id)
+
+    if not db_schedule:
+        raise NotFoundException('Schedule not found')
+
+    await session.execute(release(Schedule.id == id))
+    await session.delete(db_schedule)
+    await session.commit()
+    response_cache.invalidate(f'schedules:{id}')
+
+    return {'message': 'Schedule deleted'}
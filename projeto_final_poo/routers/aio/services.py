@@ -0,0 +1,129 @@
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy import delete, select
+
+from projeto_final_poo.custom_types.annotated_types import T_AsyncSession
+from projeto_final_poo.db.models import Schedule, Service
+from projeto_final_poo.db.queries import probe_service, probe_services
+from projeto_final_poo.db.slots import release
+from projeto_final_poo.helpers.cache import (
+    cache_response,
+    cached_response,
+    response_cache,
+)
+from projeto_final_poo.helpers.conditional import (
+    not_modified_response,
+    validators,
+)
+from projeto_final_poo.helpers.exceptions import NotFoundException
+from projeto_final_poo.helpers.pagination import keyset, next_cursor
+from projeto_final_poo.schemas.schemas import (
+    Message,
+    PageParams,
+    ServiceList,
+    ServicePublic,
+    ServiceSchema,
+)
+
+router = APIRouter(prefix='/services', tags=['services'])
+
+
+@router.post(
+    '/', status_code=status.HTTP_201_CREATED, response_model=ServicePublic
+)
+async def create_service(service: ServiceSchema, session: T_AsyncSession):
+    db_service = Service(
+        type=service.type,
+        description=service.description,
+        price=service.price,
+    )
+
+    session.add(db_service)
+    await session.commit()
+    response_cache.invalidate('services')
+
+    return db_service
+
+
+@router.get('/', response_model=ServiceList, response_model_exclude_none=True)
+async def get_all_services(
+    request: Request,
+    session: T_AsyncSession,
+    page: PageParams = Depends(),
+):
+    if cached := cached_response(request):
+        return cached
+
+    probe = await session.execute(probe_services())
+    headers = validators(request, probe.one())
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    query = keyset(select(Service), page.cursor, (Service.id, int))
+    services = await session.scalars(
+        query.limit(page.limit).offset(page.offset)
+    )
+    services = services.all()
+
+    return cache_response(
+        request,
+        ServiceList(
+            services=services,
+            next_cursor=next_cursor(services, page.limit, lambda s: [s.id]),
+        ),
+        tags=['services'],
+        exclude_none=True,
+        headers=headers,
+    )
+
+
+@router.get('/{id:int}', response_model=ServicePublic)
+async def get_service_by_id(
+    id: int, request: Request, response: Response, session: T_AsyncSession
+):
+    probe = await session.execute(probe_service(id))
+    headers = validators(request, probe.one_or_none())
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    service = await session.get(Service, id)
+
+    if not service:
+        raise NotFoundException('Service not found')
+
+    response.headers.update(headers)
+    return service
+
+
+@router.put('/{id:int}', response_model=ServicePublic)
+async def update_service(
+    id: int, service: ServiceSchema, session: T_AsyncSession
+):
+    db_service = await session.get(Service, id)
+
+    if not db_service:
+        raise NotFoundException('Service not found')
+
+    db_service.type = service.type
+    db_service.description = service.description
+    db_service.price = service.price
+
+    await session.commit()
+    response_cache.invalidate('services', f'services:{id}')
+
+    return db_service
+
+
+@router.delete('/{id:int}', response_model=Message)
+async def delete_service(id: int, session: T_AsyncSession):
+    await session.execute(release(Schedule.service_id == id))
+    deleted = await session.scalar(
+        delete(Service).where(Service.id == id).returning(Service.id)
+    )
+
+    if not deleted:
+        raise NotFoundException('Service not found')
+
+    await session.commit()
+    response_cache.invalidate('services', f'services:{id}')
+
+    return {'message': 'Service deleted'}
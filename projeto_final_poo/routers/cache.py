@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from projeto_final_poo.helpers.cache import response_cache
+from projeto_final_poo.schemas.schemas import CacheStats
+
+router = APIRouter(prefix='/cache', tags=['cache'])
+
+
+@router.get('/stats', response_model=CacheStats)
+def get_cache_stats():
+    return response_cache.stats()
@@ -1,114 +1,315 @@
-from fastapi import APIRouter, status
-from sqlalchemy import select
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Body, Depends, Request, Response, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
 from projeto_final_poo.custom_types.annotated_types import T_Session
-from projeto_final_poo.db.models import Address, Client
+from projeto_final_poo.db.bulk import dialect_insert, insert_returning, lookup
+from projeto_final_poo.db.models import Address, Client, Schedule
+from projeto_final_poo.db.queries import (
+    client_addresses,
+    client_matches,
+    probe_client,
+    probe_clients,
+    search_words,
+)
+from projeto_final_poo.db.slots import release
+from projeto_final_poo.helpers.cache import (
+    cache_response,
+    cached_response,
+    response_cache,
+)
+from projeto_final_poo.helpers.conditional import (
+    not_modified_response,
+    validators,
+)
 from projeto_final_poo.helpers.exceptions import (
+    BadRequestException,
     ConflictException,
     NotFoundException,
 )
+from projeto_final_poo.helpers.pagination import keyset, next_cursor
+from projeto_final_poo.helpers.serialization import model_response
 from projeto_final_poo.schemas.schemas import (
+    MAX_BULK_SIZE,
+    ClientBulkResult,
     ClientList,
+    ClientPatch,
     ClientPublic,
     ClientSchema,
+    ClientSearchParams,
     ClientUpdate,
     Message,
+    PageParams,
 )
 
 router = APIRouter(prefix='/clients', tags=['clients'])
 
+with_addresses = selectinload(Client.addresses)
+
+
+def get_client_with_addresses(session: Session, id: int) -> Client | None:
+    return session.get(
+        Client, id, options=[with_addresses], populate_existing=True
+    )
+
 
 @router.post(
     '/', status_code=status.HTTP_201_CREATED, response_model=ClientPublic
 )
-def create_client(client: ClientSchema, session: T_Session):
-    db_client = session.scalar(
-        select(Client).where(Client.phone_number == client.phone_number)
+def create_client(
+    client: ClientSchema,
+    session: T_Session,
+    response: Response,
+    on_conflict: Literal['fail', 'return'] = 'fail',
+):
+    # DO NOTHING returns no row on a duplicate phone number, so concurrent
+    # sign-ups never race between a check and the insert.
+    client_id = session.scalar(
+        dialect_insert(session, Client)
+        .values(name=client.name, phone_number=client.phone_number)
+        .on_conflict_do_nothing(index_elements=[Client.phone_number])
+        .returning(Client.id)
     )
 
-    if db_client:
-        raise ConflictException(
-            'Phone number already exists in another client'
+    if client_id is None:
+        if on_conflict == 'fail':
+            raise ConflictException(
+                'Phone number already exists in another client'
+            )
+
+        response.status_code = status.HTTP_200_OK
+        return session.scalar(
+            select(Client)
+            .where(Client.phone_number == client.phone_number)
+            .options(with_addresses)
         )
 
-    db_client = Client(name=client.name, phone_number=client.phone_number)
-
-    db_address = Address(
-        street=client.street,
-        neighborhood=client.neighborhood,
-        reference=client.reference,
-        number=client.number,
-        client_id=db_client.id,
+    session.execute(
+        insert(Address).values(
+            street=client.street,
+            neighborhood=client.neighborhood,
+            reference=client.reference,
+            number=client.number,
+            client_id=client_id,
+        )
     )
+    session.commit()
+
+    return get_client_with_addresses(session, client_id)
+
 
-    db_client.addresses.append(db_address)
+@router.post(
+    '/bulk',
+    status_code=status.HTTP_201_CREATED,
+    response_model=ClientBulkResult,
+)
+def create_clients_bulk(
+    clients: Annotated[list[ClientSchema], Body(max_length=MAX_BULK_SIZE)],
+    session: T_Session,
+):
+    phone_numbers = lookup(
+        session, Client.phone_number, (c.phone_number for c in clients)
+    )
 
-    session.add(db_client)
-    session.add(db_address)
+    accepted, errors = [], []
+    for index, client in enumerate(clients):
+        if client.phone_number in phone_numbers:
+            errors.append({
+                'index': index,
+                'detail': 'Phone number already exists in another client',
+            })
+            continue
+
+        phone_numbers[client.phone_number] = client.phone_number
+        accepted.append(client)
+
+    db_clients = insert_returning(
+        session,
+        Client,
+        [
+            {'name': client.name, 'phone_number': client.phone_number}
+            for client in accepted
+        ],
+        Client.id,
+        Client.name,
+        Client.phone_number,
+    )
+    db_addresses = insert_returning(
+        session,
+        Address,
+        [
+            {
+                'client_id': db_client.id,
+                'street': client.street,
+                'neighborhood': client.neighborhood,
+                'reference': client.reference,
+                'number': client.number,
+            }
+            for db_client, client in zip(db_clients, accepted)
+        ],
+        Address.id,
+        Address.street,
+        Address.neighborhood,
+        Address.reference,
+        Address.number,
+    )
     session.commit()
 
-    session.refresh(db_client)
+    return {
+        'clients': [
+            {
+                'id': db_client.id,
+                'name': db_client.name,
+                'phone_number': db_client.phone_number,
+                'addresses': [db_address],
+            }
+            for db_client, db_address in zip(db_clients, db_addresses)
+        ],
+        'errors': errors,
+    }
+
+
+@router.get('/', response_model=ClientList, response_model_exclude_none=True)
+def get_all_clients(
+    request: Request,
+    session: T_Session,
+    page: PageParams = Depends(),
+):
+    headers = validators(request, session.execute(probe_clients()).one())
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    query = keyset(
+        select(Client).options(with_addresses), page.cursor, (Client.id, int)
+    )
+    clients = session.scalars(
+        query.limit(page.limit).offset(page.offset)
+    ).all()
+
+    return model_response(
+        ClientList,
+        {
+            'clients': clients,
+            'next_cursor': next_cursor(clients, page.limit, lambda c: [c.id]),
+        },
+        headers=headers,
+        exclude_none=True,
+    )
 
-    return db_client
 
+@router.get(
+    '/search', response_model=ClientList, response_model_exclude_none=True
+)
+def search_clients(session: T_Session, params: ClientSearchParams = Depends()):
+    clients = []
+    if search_words(params.q):
+        dialect = session.get_bind().dialect.name
+        clients = session.scalars(
+            client_matches(params.q, dialect)
+            .options(with_addresses)
+            .limit(params.limit)
+        ).all()
 
-@router.get('/', response_model=ClientList)
-def get_all_clients(session: T_Session, limit: int = 10, offset: int = 0):
-    clients = session.scalars(select(Client).limit(limit).offset(offset))
-    return {'clients': clients}
+    return model_response(ClientList, {'clients': clients}, exclude_none=True)
 
 
 @router.get('/{id}', response_model=ClientPublic)
-def get_client_by_id(id: int, session: T_Session):
-    client = session.get(Client, id)
+def get_client_by_id(id: int, request: Request, session: T_Session):
+    if cached := cached_response(request):
+        return cached
+
+    headers = validators(
+        request, session.execute(probe_client(id)).one_or_none()
+    )
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    client = get_client_with_addresses(session, id)
 
     if not client:
         raise NotFoundException('Client not found')
 
-    return client
+    return cache_response(
+        request,
+        ClientPublic.model_validate(client),
+        tags=['clients', f'clients:{id}'],
+        headers=headers,
+    )
 
 
 @router.put('/{id}', response_model=ClientPublic)
 def update_client(id: int, client: ClientUpdate, session: T_Session):
-    db_client = session.get(Client, id)
+    try:
+        row = session.execute(
+            update(Client)
+            .where(Client.id == id)
+            .values(name=client.name, phone_number=client.phone_number)
+            .returning(Client.id, Client.name, Client.phone_number)
+        ).one_or_none()
+    except IntegrityError:
+        session.rollback()
+        raise ConflictException(
+            'Phone number already exists in another client'
+        )
 
-    if not db_client:
+    if not row:
         raise NotFoundException('Client not found')
 
-    client_with_same_phone_number = session.scalar(
-        select(Client).where(Client.phone_number == client.phone_number)
-    )
+    # The client comes back from RETURNING, so only its addresses are read.
+    addresses = session.execute(client_addresses(id)).all()
+    session.commit()
+    response_cache.invalidate(f'clients:{id}')
+
+    return {**row._asdict(), 'addresses': addresses}
+
+
+@router.patch('/{id}', response_model=ClientPublic)
+def patch_client(id: int, client: ClientPatch, session: T_Session):
+    values = client.model_dump(exclude_none=True)
 
-    if (
-        client_with_same_phone_number
-        and id != client_with_same_phone_number.id
-    ):
+    if not values:
+        raise BadRequestException('No fields to update')
+
+    try:
+        row = session.execute(
+            update(Client)
+            .where(Client.id == id)
+            .values(**values)
+            .returning(Client.id, Client.name, Client.phone_number)
+        ).one_or_none()
+    except IntegrityError:
+        session.rollback()
         raise ConflictException(
             'Phone number already exists in another client'
         )
 
-    db_client.name = client.name
-
-    if not db_client.phone_number == client.phone_number:
-        db_client.phone_number = client.phone_number
+    if not row:
+        raise NotFoundException('Client not found')
 
+    # The client comes back from RETURNING, so only its addresses are read.
+    addresses = session.execute(client_addresses(id)).all()
     session.commit()
-    session.refresh(db_client)
+    response_cache.invalidate(f'clients:{id}')
 
-    return db_client
+    return {**row._asdict(), 'addresses': addresses}
 
 
 @router.delete('/{id}', response_model=Message)
 def delete_client(id: int, session: T_Session):
-    db_client = session.get(Client, id)
+    # Addresses and schedules go with the client through ON DELETE CASCADE,
+    # so the schedules' slots are handed back first.
+    session.execute(release(Schedule.client_id == id))
+    deleted = session.scalar(
+        delete(Client).where(Client.id == id).returning(Client.id)
+    )
 
-    if not db_client:
+    if not deleted:
         raise NotFoundException('Client not found')
 
-    for address in db_client.addresses:
-        session.delete(address)
-
-    session.delete(db_client)
     session.commit()
+    response_cache.invalidate(f'clients:{id}')
 
     return {'message': 'Client and associated addresses deleted'}
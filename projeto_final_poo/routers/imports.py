@@ -0,0 +1,85 @@
+import io
+
+from fastapi import APIRouter, Query, UploadFile, status
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.custom_types.annotated_types import T_Session
+from projeto_final_poo.db.importer import (
+    FILE_ERRORS,
+    ImportFormat,
+    ImportKind,
+    run_import,
+)
+from projeto_final_poo.db.models import ImportJob
+from projeto_final_poo.helpers.exceptions import (
+    BadRequestException,
+    NotFoundException,
+)
+from projeto_final_poo.helpers.settings import env
+from projeto_final_poo.schemas.schemas import MAX_BULK_SIZE, ImportJobPublic
+
+router = APIRouter(prefix='/imports', tags=['imports'])
+
+
+def _run(session: Session, job: ImportJob, file: UploadFile, chunk_size: int):
+    # The upload is spooled to disk by Starlette; reading it line by line
+    # keeps memory bounded by the chunk size, not the file size.
+    lines = io.TextIOWrapper(file.file, encoding='utf-8', newline='')
+    try:
+        for _ in run_import(session, job, lines, chunk_size):
+            pass
+    except FILE_ERRORS:
+        raise BadRequestException(
+            f'Import job {job.id} failed: {job.last_error}'
+        )
+    finally:
+        lines.detach()
+
+    return job
+
+
+@router.post(
+    '/{kind}',
+    status_code=status.HTTP_201_CREATED,
+    response_model=ImportJobPublic,
+)
+def import_file(
+    kind: ImportKind,
+    file: UploadFile,
+    session: T_Session,
+    import_format: ImportFormat = Query('ndjson', alias='format'),
+    chunk_size: int = Query(env.IMPORT_CHUNK_SIZE, ge=1, le=MAX_BULK_SIZE),
+):
+    job = ImportJob(kind=kind, file_format=import_format)
+    session.add(job)
+    session.commit()
+
+    return _run(session, job, file, chunk_size)
+
+
+@router.get('/{id:int}', response_model=ImportJobPublic)
+def get_import_job(id: int, session: T_Session):
+    job = session.get(ImportJob, id)
+
+    if not job:
+        raise NotFoundException('Import job not found')
+
+    return job
+
+
+@router.post('/{id:int}/resume', response_model=ImportJobPublic)
+def resume_import_job(
+    id: int,
+    file: UploadFile,
+    session: T_Session,
+    chunk_size: int = Query(env.IMPORT_CHUNK_SIZE, ge=1, le=MAX_BULK_SIZE),
+):
+    job = session.get(ImportJob, id)
+
+    if not job:
+        raise NotFoundException('Import job not found')
+
+    if job.status == 'completed':
+        raise BadRequestException('Import job already completed')
+
+    return _run(session, job, file, chunk_size)
@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends
+
+from projeto_final_poo.custom_types.annotated_types import T_Session
+from projeto_final_poo.db.reports import revenue_report, utilization_report
+from projeto_final_poo.helpers.exceptions import BadRequestException
+from projeto_final_poo.schemas.schemas import (
+    ReportQueryParams,
+    RevenueQueryParams,
+    RevenueReport,
+    UtilizationQueryParams,
+    UtilizationReport,
+)
+
+router = APIRouter(prefix='/reports', tags=['reports'])
+
+
+def _check_range(params: ReportQueryParams) -> None:
+    if params.start_date > params.end_date:
+        raise BadRequestException('start_date must be <= than end_date')
+
+
+@router.get(
+    '/revenue', response_model=RevenueReport, response_model_exclude_none=True
+)
+def get_revenue(session: T_Session, params: RevenueQueryParams = Depends()):
+    _check_range(params)
+
+    rows = revenue_report(
+        session,
+        params.start_date,
+        params.end_date,
+        params.period,
+        params.group_by,
+    )
+    # Keeps the rollups of closed months built on the way.
+    session.commit()
+
+    return {
+        'start_date': params.start_date,
+        'end_date': params.end_date,
+        'rows': rows,
+    }
+
+
+@router.get(
+    '/utilization',
+    response_model=UtilizationReport,
+    response_model_exclude_none=True,
+)
+def get_utilization(
+    session: T_Session, params: UtilizationQueryParams = Depends()
+):
+    _check_range(params)
+
+    return {
+        'start_date': params.start_date,
+        'end_date': params.end_date,
+        'rows': utilization_report(
+            session,
+            params.start_date,
+            params.end_date,
+            params.period,
+            by_service=params.group_by == 'service',
+        ),
+    }
@@ -1,16 +1,87 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy import select
+import datetime
+from typing import Annotated, Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Query,
+    Request,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, select, update
+from sqlalchemy.exc import IntegrityError
 
 from projeto_final_poo.custom_types.annotated_types import T_Session
+from projeto_final_poo.db.availability import availability, occupancy
+from projeto_final_poo.db.bulk import insert_returning, lookup
 from projeto_final_poo.db.models import Client, Schedule, Service
+from projeto_final_poo.db.planner import plan, plan_rows
+from projeto_final_poo.db.queries import (
+    SCHEDULE_CALENDAR_KEY,
+    SCHEDULE_ID_KEY,
+    filter_schedules,
+    probe_schedule,
+    probe_schedules,
+    schedule_calendar_key,
+    schedule_from_row,
+    schedule_id_key,
+    schedule_page,
+    schedule_returning,
+    schedule_rows,
+)
+from projeto_final_poo.db.slots import (
+    book_slot,
+    calendar,
+    calendar_rows,
+    release,
+    reserve_many,
+    touch,
+)
+from projeto_final_poo.helpers.cache import (
+    cache_response,
+    cached_response,
+    response_cache,
+)
+from projeto_final_poo.helpers.conditional import (
+    not_modified_response,
+    validators,
+)
 from projeto_final_poo.helpers.exceptions import (
     BadRequestException,
+    ConflictException,
     NotFoundException,
 )
+from projeto_final_poo.helpers.formats import (
+    FORMAT_RESPONSES,
+    ResponseFormat,
+    columnar_response,
+    negotiate,
+)
+from projeto_final_poo.helpers.pagination import keyset, next_cursor
+from projeto_final_poo.helpers.serialization import trusted_response
+from projeto_final_poo.helpers.streaming import (
+    csv_lines,
+    ndjson_lines,
+    stream_rows,
+)
 from projeto_final_poo.schemas.schemas import (
+    MAX_BULK_SIZE,
+    MAX_CALENDAR_DAYS,
+    MAX_PAGE_SIZE,
+    Availability,
+    AvailabilityQueryParams,
+    Calendar,
+    CalendarQueryParams,
     Message,
+    PageParams,
+    Plan,
+    PlanQueryParams,
+    ScheduleBulkResult,
     ScheduleCreate,
     ScheduleList,
+    SchedulePatch,
     SchedulePublic,
     ScheduleQueryParams,
 )
@@ -30,12 +101,19 @@ def create_schedule(schedule: ScheduleCreate, session: T_Session):
     if not db_service:
         raise NotFoundException('Service not found')
 
+    if not book_slot(
+        session, (schedule.date, schedule.shift, schedule.service_id)
+    ):
+        session.rollback()
+        raise ConflictException('Shift is fully booked')
+
     db_schedule = Schedule(
         client_id=schedule.client_id,
         service_id=schedule.service_id,
         date=schedule.date,
         shift=schedule.shift,
         description=schedule.description,
+        price=db_service.price,
     )
 
     db_schedule.client = db_client
@@ -48,27 +126,164 @@ def create_schedule(schedule: ScheduleCreate, session: T_Session):
     return db_schedule
 
 
-@router.get('/', response_model=ScheduleList)
-def get_all_schedules(session: T_Session, limit: int = 10, offset: int = 0):
-    schedules = session.scalars(
-        select(Schedule).limit(limit).offset(offset)
-    ).all()
+@router.post(
+    '/bulk',
+    status_code=status.HTTP_201_CREATED,
+    response_model=ScheduleBulkResult,
+)
+def create_schedules_bulk(
+    schedules: Annotated[list[ScheduleCreate], Body(max_length=MAX_BULK_SIZE)],
+    session: T_Session,
+):
+    client_names = lookup(
+        session, Client.id, (s.client_id for s in schedules), Client.name
+    )
+    services = lookup(
+        session,
+        Service.id,
+        (s.service_id for s in schedules),
+        Service.type,
+        Service.price,
+    )
 
-    return {'schedules': schedules}
+    candidates, errors = [], []
+    for index, schedule in enumerate(schedules):
+        if schedule.client_id not in client_names:
+            errors.append({'index': index, 'detail': 'Client not found'})
+        elif schedule.service_id not in services:
+            errors.append({'index': index, 'detail': 'Service not found'})
+        else:
+            candidates.append((index, schedule))
+
+    booked = reserve_many(
+        session,
+        [(s.date, s.shift, s.service_id) for _, s in candidates],
+    )
 
+    rows = []
+    for (index, schedule), fits in zip(candidates, booked):
+        if fits:
+            rows.append({
+                **schedule.model_dump(),
+                'price': services[schedule.service_id].price,
+            })
+        else:
+            errors.append({'index': index, 'detail': 'Shift is fully booked'})
+    errors.sort(key=lambda error: error['index'])
+
+    db_schedules = insert_returning(
+        session,
+        Schedule,
+        rows,
+        Schedule.id,
+        Schedule.date,
+        Schedule.shift,
+        Schedule.description,
+        Schedule.client_id,
+        Schedule.service_id,
+    )
+    session.commit()
 
-@router.get('/filter', response_model=ScheduleList)
+    return {
+        'schedules': [
+            {
+                'id': db_schedule.id,
+                'date': db_schedule.date,
+                'shift': db_schedule.shift,
+                'description': db_schedule.description,
+                'client': {
+                    'id': db_schedule.client_id,
+                    'name': client_names[db_schedule.client_id],
+                },
+                'service': {'type': services[db_schedule.service_id].type},
+            }
+            for db_schedule in db_schedules
+        ],
+        'errors': errors,
+    }
+
+
+@router.get(
+    '/',
+    response_model=ScheduleList,
+    response_model_exclude_none=True,
+    responses=FORMAT_RESPONSES,
+)
+def get_all_schedules(
+    request: Request,
+    session: T_Session,
+    page: PageParams = Depends(),
+    response_format: Optional[ResponseFormat] = Query(None, alias='format'),
+):
+    response_format = negotiate(request, response_format)
+
+    # The same URL has one representation per format, so each gets its own
+    # ETag and caches are told the body depends on Accept.
+    probe = session.execute(probe_schedules()).one()
+    headers = validators(request, (*probe, response_format))
+    headers['Vary'] = 'Accept'
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    query = keyset(schedule_rows(), page.cursor, *SCHEDULE_ID_KEY)
+    rows = session.execute(query.limit(page.limit).offset(page.offset)).all()
+
+    cursor = next_cursor(rows, page.limit, schedule_id_key)
+
+    if response_format == 'json':
+        return trusted_response(schedule_page(rows, cursor), headers=headers)
+
+    return columnar_response(
+        response_format, rows, query.selected_columns, cursor, headers
+    )
+
+
+@router.get(
+    '/filter',
+    response_model=ScheduleList,
+    response_model_exclude_none=True,
+    responses=FORMAT_RESPONSES,
+)
 def get_filtered_schedules(
-    session: T_Session, params: ScheduleQueryParams = Depends()
+    request: Request,
+    session: T_Session,
+    params: ScheduleQueryParams = Depends(),
+    response_format: Optional[ResponseFormat] = Query(None, alias='format'),
 ):
-    query = select(Schedule)
+    response_format = negotiate(request, response_format)
+
+    if (
+        params.start_date
+        and params.end_date
+        and params.start_date > params.end_date
+    ):
+        raise BadRequestException('start_date must be <= than end_date')
 
-    if params.start_date:
-        query = query.filter(Schedule.date >= params.start_date)
+    query = keyset(
+        filter_schedules(schedule_rows(), params),
+        params.cursor,
+        *SCHEDULE_CALENDAR_KEY,
+    )
+    limit = params.limit or MAX_PAGE_SIZE
+    rows = session.execute(query.offset(params.offset).limit(limit)).all()
+
+    cursor = next_cursor(rows, limit, schedule_calendar_key)
+    headers = {'Vary': 'Accept'}
+
+    if response_format == 'json':
+        return trusted_response(schedule_page(rows, cursor), headers=headers)
+
+    return columnar_response(
+        response_format, rows, query.selected_columns, cursor, headers
+    )
 
-    if params.end_date:
-        query = query.filter(Schedule.date <= params.end_date)
 
+@router.get('/export', response_class=StreamingResponse)
+def export_schedules(
+    session: T_Session,
+    params: ScheduleQueryParams = Depends(),
+    export_format: Literal['ndjson', 'csv'] = Query('ndjson', alias='format'),
+):
     if (
         params.start_date
         and params.end_date
@@ -76,30 +291,102 @@ def get_filtered_schedules(
     ):
         raise BadRequestException('start_date must be <= than end_date')
 
-    if params.client_id:
-        query = query.filter(Schedule.client_id == params.client_id)
+    query = keyset(
+        filter_schedules(schedule_rows(), params),
+        params.cursor,
+        *SCHEDULE_CALENDAR_KEY,
+    )
+    query = query.offset(params.offset).limit(params.limit)
+    partitions = stream_rows(session, query)
+
+    if export_format == 'csv':
+        return StreamingResponse(
+            csv_lines(partitions, query.selected_columns.keys()),
+            media_type='text/csv',
+            headers={
+                'Content-Disposition': 'attachment; filename=schedules.csv'
+            },
+        )
+
+    return StreamingResponse(
+        ndjson_lines(partitions, schedule_from_row),
+        media_type='application/x-ndjson',
+    )
+
 
-    if params.service_id:
-        query = query.filter(Schedule.service_id == params.service_id)
+@router.get('/availability', response_model=Availability)
+def get_availability(
+    session: T_Session, params: AvailabilityQueryParams = Depends()
+):
+    if params.service_id and not session.get(Service, params.service_id):
+        raise NotFoundException('Service not found')
+
+    start = params.start_date or datetime.date.today()
+    end = start + datetime.timedelta(days=params.days - 1)
+    rows = session.execute(occupancy(start, end, params.service_id))
 
-    if params.shift:
-        query = query.filter(Schedule.shift == params.shift)
+    return availability(rows, start, end, params.service_id)
 
-    schedules = session.scalars(
-        query.offset(params.offset).limit(params.limit)
-    ).all()
 
-    return {'schedules': schedules}
+@router.get(
+    '/calendar', response_model=Calendar, response_model_exclude_none=True
+)
+def get_calendar(session: T_Session, params: CalendarQueryParams = Depends()):
+    if params.start_date > params.end_date:
+        raise BadRequestException('start_date must be <= than end_date')
+
+    if (params.end_date - params.start_date).days >= MAX_CALENDAR_DAYS:
+        raise BadRequestException(
+            f'The calendar spans at most {MAX_CALENDAR_DAYS} days'
+        )
+
+    rows = session.execute(
+        calendar_rows(params.start_date, params.end_date, params.group_by)
+    )
+
+    return calendar(rows, params.start_date, params.end_date, params.group_by)
+
+
+@router.get('/plan', response_model=Plan)
+def get_plan(session: T_Session, params: PlanQueryParams = Depends()):
+    rows = session.execute(plan_rows(params.date))
+
+    # Built straight from the rows in the shape of Plan.
+    return trusted_response(plan(rows, params.date, params.technicians))
 
 
 @router.get('/{id}', response_model=SchedulePublic)
-def get_schedule_by_id(id: int, session: T_Session):
-    schedule = session.get(Schedule, id)
+def get_schedule_by_id(id: int, request: Request, session: T_Session):
+    if cached := cached_response(request):
+        return cached
+
+    headers = validators(
+        request, session.execute(probe_schedule(id)).one_or_none()
+    )
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
 
-    if not schedule:
+    row = session.execute(
+        schedule_rows()
+        .add_columns(Schedule.service_id)
+        .where(Schedule.id == id)
+    ).one_or_none()
+
+    if not row:
         raise NotFoundException('Schedule not found')
 
-    return schedule
+    # Tagged with its client and service too, whose name and type it shows.
+    return cache_response(
+        request,
+        SchedulePublic.model_validate(schedule_from_row(row)),
+        tags=[
+            'schedules',
+            f'schedules:{id}',
+            f'clients:{row.client_id}',
+            f'services:{row.service_id}',
+        ],
+        headers=headers,
+    )
 
 
 @router.put('/{id}', response_model=SchedulePublic)
@@ -117,6 +404,19 @@ def update_schedule(id: int, schedule: ScheduleCreate, session: T_Session):
     if not db_service:
         raise NotFoundException('Service not found')
 
+    slot = (schedule.date, schedule.shift, schedule.service_id)
+    if slot != (db_schedule.date, db_schedule.shift, db_schedule.service_id):
+        session.execute(release(Schedule.id == id))
+        if not book_slot(session, slot):
+            session.rollback()
+            raise ConflictException('Shift is fully booked')
+    elif db_schedule.client_id != schedule.client_id:
+        session.execute(touch(Schedule.id == id))
+
+    # A new service is a new booking, at that service's current price.
+    if db_schedule.service_id != schedule.service_id:
+        db_schedule.price = db_service.price
+
     db_schedule.client_id = schedule.client_id
     db_schedule.service_id = schedule.service_id
     db_schedule.date = schedule.date
@@ -125,10 +425,65 @@ def update_schedule(id: int, schedule: ScheduleCreate, session: T_Session):
 
     session.commit()
     session.refresh(db_schedule)
+    response_cache.invalidate(f'schedules:{id}')
 
     return db_schedule
 
 
+@router.patch('/{id}', response_model=SchedulePublic)
+def patch_schedule(id: int, schedule: SchedulePatch, session: T_Session):
+    values = schedule.model_dump(exclude_none=True)
+
+    if not values:
+        raise BadRequestException('No fields to update')
+
+    # Moving the schedule gives its slot back before booking the new one.
+    moves = not values.keys().isdisjoint({'date', 'shift', 'service_id'})
+    if moves:
+        session.execute(release(Schedule.id == id))
+
+    # Like PUT, only a different service is re-priced; the CASE reads the
+    # stored service_id in the same statement.
+    if 'service_id' in values:
+        values['price'] = case(
+            (Schedule.service_id == values['service_id'], Schedule.price),
+            else_=select(Service.price)
+            .where(Service.id == values['service_id'])
+            .scalar_subquery(),
+        )
+
+    # The foreign keys check that the new client and service exist.
+    try:
+        row = session.execute(
+            update(Schedule)
+            .where(Schedule.id == id)
+            .values(**values)
+            .returning(*schedule_returning(), Schedule.service_id)
+        ).one_or_none()
+    except IntegrityError:
+        session.rollback()
+        if 'client_id' not in values:
+            raise NotFoundException('Service not found')
+        if 'service_id' not in values:
+            raise NotFoundException('Client not found')
+        raise NotFoundException('Client or service not found')
+
+    if not row:
+        raise NotFoundException('Schedule not found')
+
+    if moves and not book_slot(session, (row.date, row.shift, row.service_id)):
+        session.rollback()
+        raise ConflictException('Shift is fully booked')
+
+    if not moves and 'client_id' in values:
+        session.execute(touch(Schedule.id == id))
+
+    session.commit()
+    response_cache.invalidate(f'schedules:{id}')
+
+    return schedule_from_row(row)
+
+
 @router.delete('/{id}', response_model=Message)
 def delete_schedule(id: int, session: T_Session):
     db_schedule = session.get(Schedule, id)
@@ -136,7 +491,9 @@ def delete_schedule(id: int, session: T_Session):
     if not db_schedule:
         raise NotFoundException('Schedule not found')
 
+    session.execute(release(Schedule.id == id))
     session.delete(db_schedule)
     session.commit()
+    response_cache.invalidate(f'schedules:{id}')
 
     return {'message': 'Schedule deleted'}
@@ -1,12 +1,34 @@
-from fastapi import APIRouter, status
-from sqlalchemy import select
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, Request, Response, status
+from sqlalchemy import delete, select, update
 
 from projeto_final_poo.custom_types.annotated_types import T_Session
-from projeto_final_poo.db.models import Service
-from projeto_final_poo.helpers.exceptions import NotFoundException
+from projeto_final_poo.db.bulk import insert_returning
+from projeto_final_poo.db.models import Schedule, Service
+from projeto_final_poo.db.queries import probe_service, probe_services
+from projeto_final_poo.db.slots import release
+from projeto_final_poo.helpers.cache import (
+    cache_response,
+    cached_response,
+    response_cache,
+)
+from projeto_final_poo.helpers.conditional import (
+    not_modified_response,
+    validators,
+)
+from projeto_final_poo.helpers.exceptions import (
+    BadRequestException,
+    NotFoundException,
+)
+from projeto_final_poo.helpers.pagination import keyset, next_cursor
 from projeto_final_poo.schemas.schemas import (
+    MAX_BULK_SIZE,
     Message,
+    PageParams,
+    ServiceBulkResult,
     ServiceList,
+    ServicePatch,
     ServicePublic,
     ServiceSchema,
 )
@@ -26,25 +48,83 @@ def create_service(service: ServiceSchema, session: T_Session):
 
     session.add(db_service)
     session.commit()
+    response_cache.invalidate('services')
 
     session.refresh(db_service)
 
     return db_service
 
 
-@router.get('/', response_model=ServiceList)
-def get_all_services(session: T_Session, limit: int = 10, offset: int = 0):
-    services = session.scalars(select(Service).limit(limit).offset(offset))
-    return {'services': services}
+@router.post(
+    '/bulk',
+    status_code=status.HTTP_201_CREATED,
+    response_model=ServiceBulkResult,
+)
+def create_services_bulk(
+    services: Annotated[list[ServiceSchema], Body(max_length=MAX_BULK_SIZE)],
+    session: T_Session,
+):
+    db_services = insert_returning(
+        session,
+        Service,
+        [service.model_dump() for service in services],
+        Service.id,
+        Service.type,
+        Service.description,
+        Service.price,
+    )
+    session.commit()
+    response_cache.invalidate('services')
+
+    return {'services': db_services, 'errors': []}
+
+
+@router.get('/', response_model=ServiceList, response_model_exclude_none=True)
+def get_all_services(
+    request: Request,
+    session: T_Session,
+    page: PageParams = Depends(),
+):
+    if cached := cached_response(request):
+        return cached
+
+    headers = validators(request, session.execute(probe_services()).one())
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
+    query = keyset(select(Service), page.cursor, (Service.id, int))
+    services = session.scalars(
+        query.limit(page.limit).offset(page.offset)
+    ).all()
+
+    return cache_response(
+        request,
+        ServiceList(
+            services=services,
+            next_cursor=next_cursor(services, page.limit, lambda s: [s.id]),
+        ),
+        tags=['services'],
+        exclude_none=True,
+        headers=headers,
+    )
 
 
 @router.get('/{id}', response_model=ServicePublic)
-def get_service_by_id(id: int, session: T_Session):
+def get_service_by_id(
+    id: int, request: Request, response: Response, session: T_Session
+):
+    headers = validators(
+        request, session.execute(probe_service(id)).one_or_none()
+    )
+    if not_modified := not_modified_response(request, headers):
+        return not_modified
+
     service = session.get(Service, id)
 
     if not service:
         raise NotFoundException('Service not found')
 
+    response.headers.update(headers)
     return service
 
 
@@ -60,19 +140,48 @@ def update_service(id: int, service: ServiceSchema, session: T_Session):
     db_service.price = service.price
 
     session.commit()
+    response_cache.invalidate('services', f'services:{id}')
     session.refresh(db_service)
 
     return db_service
 
 
+@router.patch('/{id}', response_model=ServicePublic)
+def patch_service(id: int, service: ServicePatch, session: T_Session):
+    values = service.model_dump(exclude_none=True)
+
+    if not values:
+        raise BadRequestException('No fields to update')
+
+    db_service = session.execute(
+        update(Service)
+        .where(Service.id == id)
+        .values(**values)
+        .returning(
+            Service.id, Service.type, Service.description, Service.price
+        )
+    ).one_or_none()
+
+    if not db_service:
+        raise NotFoundException('Service not found')
+
+    session.commit()
+    response_cache.invalidate('services', f'services:{id}')
+
+    return db_service
+
+
 @router.delete('/{id}', response_model=Message)
 def delete_service(id: int, session: T_Session):
-    db_service = session.get(Service, id)
+    session.execute(release(Schedule.service_id == id))
+    deleted = session.scalar(
+        delete(Service).where(Service.id == id).returning(Service.id)
+    )
 
-    if not db_service:
+    if not deleted:
         raise NotFoundException('Service not found')
 
-    session.delete(db_service)
     session.commit()
+    response_cache.invalidate('services', f'services:{id}')
 
     return {'message': 'Service deleted'}
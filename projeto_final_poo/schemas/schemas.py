@@ -1,15 +1,42 @@
 import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from projeto_final_poo.db.models import ShiftEnum
 
+MAX_PAGE_SIZE = 500
+MAX_BULK_SIZE = 5000
+MAX_AVAILABILITY_DAYS = 366
+MAX_CALENDAR_DAYS = 366
+MAX_TECHNICIANS = 100
+MAX_SEARCH_RESULTS = 100
+
 
 class Message(BaseModel):
     message: str
 
 
+class CacheStats(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    ttl: float
+
+
+class PageParams(BaseModel):
+    limit: int = 10
+    offset: int = 0
+    cursor: Optional[str] = None
+
+
+class BulkError(BaseModel):
+    index: int
+    detail: str
+
+
 class AddressSchema(BaseModel):
     client_id: int = Field(ge=1, description='Client ID must be at least 1')
     street: str
@@ -29,6 +56,13 @@ class AddressUpdate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AddressPatch(BaseModel):
+    street: Optional[str] = None
+    neighborhood: Optional[str] = None
+    reference: Optional[str] = None
+    number: Optional[str] = None
+
+
 class AddressInClient(BaseModel):
     id: int
     street: str
@@ -54,6 +88,11 @@ class AddressesList(BaseModel):
     addresses: list[AddressInClient]
 
 
+class AddressBulkResult(BaseModel):
+    addresses: list[AddressPublic]
+    errors: list[BulkError]
+
+
 class ClientSchema(BaseModel):
     name: str
     phone_number: str
@@ -68,6 +107,11 @@ class ClientUpdate(BaseModel):
     phone_number: str
 
 
+class ClientPatch(BaseModel):
+    name: Optional[str] = None
+    phone_number: Optional[str] = None
+
+
 class ClientPublic(BaseModel):
     id: int
     name: str
@@ -79,6 +123,31 @@ class ClientPublic(BaseModel):
 
 class ClientList(BaseModel):
     clients: list[ClientPublic]
+    next_cursor: Optional[str] = None
+
+
+class ClientSearchParams(BaseModel):
+    q: str = Field(
+        min_length=1,
+        max_length=200,
+        description=(
+            'Words to look for in the name, street, neighborhood or '
+            'reference; each one matches as a prefix.'
+        ),
+    )
+    limit: int = Field(
+        20,
+        ge=1,
+        le=MAX_SEARCH_RESULTS,
+        description=(
+            f'Number of clients to return (at most {MAX_SEARCH_RESULTS}).'
+        ),
+    )
+
+
+class ClientBulkResult(BaseModel):
+    clients: list[ClientPublic]
+    errors: list[BulkError]
 
 
 class ServiceSchema(BaseModel):
@@ -87,6 +156,12 @@ class ServiceSchema(BaseModel):
     price: float
 
 
+class ServicePatch(BaseModel):
+    type: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+
+
 class ServicePublic(BaseModel):
     id: int
     type: str
@@ -98,6 +173,12 @@ class ServicePublic(BaseModel):
 
 class ServiceList(BaseModel):
     services: list[ServicePublic]
+    next_cursor: Optional[str] = None
+
+
+class ServiceBulkResult(BaseModel):
+    services: list[ServicePublic]
+    errors: list[BulkError]
 
 
 class ScheduleClient(BaseModel):
@@ -125,6 +206,20 @@ class ScheduleCreate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class SchedulePatch(BaseModel):
+    client_id: Optional[int] = Field(
+        None, ge=1, description='Client ID must be at least 1'
+    )
+    service_id: Optional[int] = Field(
+        None, ge=1, description='Service ID must be at least 1'
+    )
+    date: Optional[datetime.date] = None
+    shift: Optional[ShiftEnum] = Field(
+        None, description="Shift must be 'morning', 'afternoon', or 'evening'"
+    )
+    description: Optional[str] = None
+
+
 class SchedulePublic(BaseModel):
     id: int
     date: datetime.date
@@ -138,6 +233,12 @@ class SchedulePublic(BaseModel):
 
 class ScheduleList(BaseModel):
     schedules: list[SchedulePublic]
+    next_cursor: Optional[str] = None
+
+
+class ScheduleBulkResult(BaseModel):
+    schedules: list[SchedulePublic]
+    errors: list[BulkError]
 
 
 class ScheduleQueryParams(BaseModel):
@@ -158,6 +259,179 @@ class ScheduleQueryParams(BaseModel):
         None, description='Shift of the schedule.'
     )
     offset: Optional[int] = Field(None, description='Number of items to skip.')
+    cursor: Optional[str] = Field(
+        None, description='next_cursor returned by the previous page.'
+    )
     limit: Optional[int] = Field(
-        None, description='Number of items to return.'
+        None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description=f'Number of items to return (at most {MAX_PAGE_SIZE}).',
+    )
+
+
+class ImportJobPublic(BaseModel):
+    id: int
+    kind: str
+    file_format: str
+    status: str
+    rows_processed: int
+    rows_imported: int
+    rows_failed: int
+    last_error: Optional[str]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AvailabilityQueryParams(BaseModel):
+    start_date: Optional[datetime.date] = Field(
+        None, description='First day of the window. Defaults to today.'
+    )
+    days: int = Field(
+        30,
+        ge=1,
+        le=MAX_AVAILABILITY_DAYS,
+        description=f'Number of days (at most {MAX_AVAILABILITY_DAYS}).',
+    )
+    service_id: Optional[int] = Field(
+        None, ge=1, description='Only count slots left for this service.'
+    )
+
+
+class ShiftAvailability(BaseModel):
+    shift: ShiftEnum
+    capacity: int
+    booked: int
+    free: int
+
+
+class DayAvailability(BaseModel):
+    date: datetime.date
+    shifts: list[ShiftAvailability]
+
+
+class Availability(BaseModel):
+    start_date: datetime.date
+    end_date: datetime.date
+    service_id: Optional[int] = None
+    days: list[DayAvailability]
+
+
+class CalendarQueryParams(BaseModel):
+    start_date: datetime.date = Field(
+        description='First day of the calendar. Format: YYYY-MM-DD.'
+    )
+    end_date: datetime.date = Field(
+        description=(
+            'Last day of the calendar, at most '
+            f'{MAX_CALENDAR_DAYS} days after start_date. Format: YYYY-MM-DD.'
+        )
+    )
+    group_by: Literal['shift', 'service'] = Field(
+        'shift', description='Split each day by shift or by service.'
+    )
+
+
+class CalendarGroup(BaseModel):
+    shift: Optional[ShiftEnum] = None
+    service_id: Optional[int] = None
+    booked: int
+
+
+class CalendarDay(BaseModel):
+    date: datetime.date
+    booked: int
+    groups: list[CalendarGroup]
+
+
+class Calendar(BaseModel):
+    start_date: datetime.date
+    end_date: datetime.date
+    group_by: Literal['shift', 'service']
+    days: list[CalendarDay]
+
+
+class PlanQueryParams(BaseModel):
+    date: datetime.date = Field(description='Day to plan. Format: YYYY-MM-DD.')
+    technicians: int = Field(
+        ge=1,
+        le=MAX_TECHNICIANS,
+        description='Technicians available on each shift.',
+    )
+
+
+class PlannedSchedule(BaseModel):
+    id: int
+    client_id: int
+    client_name: str
+    service_type: str
+    neighborhood: Optional[str] = None
+
+
+class Route(BaseModel):
+    technician: int
+    neighborhoods: list[str]
+    schedules: list[PlannedSchedule]
+
+
+class ShiftPlan(BaseModel):
+    shift: ShiftEnum
+    routes: list[Route]
+
+
+class Plan(BaseModel):
+    date: datetime.date
+    technicians: int
+    shifts: list[ShiftPlan]
+
+
+class ReportQueryParams(BaseModel):
+    start_date: datetime.date = Field(
+        description='First day of the report. Format: YYYY-MM-DD.'
+    )
+    end_date: datetime.date = Field(
+        description='Last day of the report. Format: YYYY-MM-DD.'
+    )
+    period: Literal['month', 'year'] = Field(
+        'month', description='Length of each reported period.'
+    )
+
+
+class RevenueQueryParams(ReportQueryParams):
+    group_by: Optional[Literal['service', 'neighborhood']] = Field(
+        None, description='Split each period by service or neighborhood.'
     )
+
+
+class UtilizationQueryParams(ReportQueryParams):
+    group_by: Optional[Literal['service']] = Field(
+        None, description='Split each period by service.'
+    )
+
+
+class RevenueRow(BaseModel):
+    period: str
+    service_id: Optional[int] = None
+    neighborhood: Optional[str] = None
+    schedules: int
+    revenue: float
+
+
+class RevenueReport(BaseModel):
+    start_date: datetime.date
+    end_date: datetime.date
+    rows: list[RevenueRow]
+
+
+class UtilizationRow(BaseModel):
+    period: str
+    service_id: Optional[int] = None
+    booked: int
+    capacity: int
+    utilization: float
+
+
+class UtilizationReport(BaseModel):
+    start_date: datetime.date
+    end_date: datetime.date
+    rows: list[UtilizationRow]
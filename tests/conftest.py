@@ -2,12 +2,19 @@ import random
 
 import factory
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import StaticPool, create_engine
+from sqlalchemy import NullPool, StaticPool, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session
 
 from projeto_final_poo.app import app
-from projeto_final_poo.db.connection import get_session
+from projeto_final_poo.db.connection import (
+    async_database_url,
+    dispose_engine,
+    get_async_session,
+    get_session,
+)
 from projeto_final_poo.db.models import (
     Address,
     Client,
@@ -15,6 +22,12 @@ from projeto_final_poo.db.models import (
     Service,
     table_registry,
 )
+from projeto_final_poo.helpers.cache import response_cache
+from projeto_final_poo.helpers.settings import env
+from projeto_final_poo.routers.aio import address as aio_address
+from projeto_final_poo.routers.aio import client as aio_client
+from projeto_final_poo.routers.aio import schedules as aio_schedules
+from projeto_final_poo.routers.aio import services as aio_services
 
 
 class ClientFactory(factory.Factory):
@@ -60,6 +73,11 @@ class ScheduleFactory(factory.Factory):
     service_id = 1
 
 
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    response_cache.clear()
+
+
 @pytest.fixture
 def session():
     engine = create_engine(
@@ -76,6 +94,39 @@ def session():
     table_registry.metadata.drop_all(engine)
 
 
+@pytest.fixture
+def foreign_keys(session):
+    # Off by default so tests can insert rows pointing at missing clients.
+    session.connection().exec_driver_sql('PRAGMA foreign_keys=ON')
+    session.commit()
+
+
+@pytest.fixture
+def queries(session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+
+    yield statements
+
+    event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def database_url(tmp_path, monkeypatch):
+    url = f'sqlite:///{tmp_path / "database.db"}'
+    monkeypatch.setattr(env, 'DATABASE_URL', url)
+    dispose_engine()
+
+    yield url
+
+    dispose_engine()
+
+
 @pytest.fixture
 def test_client(session):
     with TestClient(app) as client:
@@ -85,6 +136,36 @@ def test_client(session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def async_test_client(tmp_path):
+    url = f'sqlite:///{tmp_path / "database.db"}'
+
+    engine = create_engine(url)
+    table_registry.metadata.create_all(engine)
+    engine.dispose()
+
+    async_engine = create_async_engine(
+        async_database_url(url), poolclass=NullPool
+    )
+    session_factory = async_sessionmaker(
+        bind=async_engine, expire_on_commit=False
+    )
+
+    async def get_session_override():
+        async with session_factory() as session:
+            yield session
+
+    async_app = FastAPI()
+    async_app.include_router(aio_client.router)
+    async_app.include_router(aio_address.router)
+    async_app.include_router(aio_services.router)
+    async_app.include_router(aio_schedules.router)
+    async_app.dependency_overrides[get_async_session] = get_session_override
+
+    with TestClient(async_app) as client:
+        yield client
+
+
 @pytest.fixture
 def client(session: Session):
     client = ClientFactory()
@@ -165,3 +246,23 @@ def other_schedule(session: Session):
     session.refresh(schedule)
 
     return schedule
+
+
+@pytest.fixture
+def book(session: Session, client, service):
+    # Adds schedules straight through the session, so the slot counters
+    # are left alone; tests reading them call db.slots.rebuild afterwards.
+    def book(day, shift, count=1, client=client, service=service):
+        session.add_all(
+            ScheduleFactory.create_batch(
+                count,
+                client_id=client.id,
+                service_id=service.id,
+                price=service.price,
+                date=day,
+                shift=shift,
+            )
+        )
+        session.flush()
+
+    return book
@@ -136,3 +136,56 @@ def test_delete_clients_only_address(test_client: TestClient, client: Client):
     assert response.json() == {
         'detail': "It is not possible to delete the client's only address."
     }
+
+
+def test_add_addresses_bulk(test_client: TestClient, client: Client):
+    address = {
+        'street': 'Flower Street',
+        'neighborhood': 'Central District',
+        'reference': 'Near the Park',
+        'number': '123',
+    }
+
+    response = test_client.post(
+        '/address/bulk',
+        json=[
+            {'client_id': client.id, **address},
+            {'client_id': 999, **address},
+            {'client_id': client.id, **address},
+        ],
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {
+        'addresses': [
+            {'id': 2, 'client_id': client.id, **address},
+            {'id': 3, 'client_id': client.id, **address},
+        ],
+        'errors': [{'index': 1, 'detail': 'Client not found'}],
+    }
+
+
+def test_patch_address(test_client: TestClient, client: Client):
+    address = client.addresses[0]
+    expected = {
+        'id': address.id,
+        'client_id': client.id,
+        'street': address.street,
+        'neighborhood': address.neighborhood,
+        'reference': 'Blue gate',
+        'number': address.number,
+    }
+
+    response = test_client.patch(
+        f'/address/{address.id}', json={'reference': 'Blue gate'}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == expected
+
+
+def test_patch_not_found_address(test_client: TestClient):
+    response = test_client.patch('/address/1', json={'number': '10'})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'detail': 'Address not found'}
@@ -1,8 +1,24 @@
+import json
+
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+from projeto_final_poo.helpers.exceptions import integrity_error_handler
 
 
 def test_root_should_return_200_and_hello_world(test_client: TestClient):
     response = test_client.get('/')
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == {'message': 'Hello, World!'}
+
+
+def test_integrity_errors_become_conflicts():
+    error = IntegrityError('INSERT', {}, Exception('UNIQUE constraint'))
+
+    response = integrity_error_handler(None, error)
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert json.loads(response.body) == {
+        'detail': 'Conflict with existing data'
+    }
@@ -0,0 +1,134 @@
+import datetime
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.models import ShiftEnum
+from projeto_final_poo.helpers.settings import env
+from tests.conftest import ServiceFactory
+
+START = datetime.date(2024, 10, 1)
+DEFAULT_DAYS = 30
+
+
+def free_slots(response) -> dict:
+    return {
+        (day['date'], shift['shift']): shift['free']
+        for day in response.json()['days']
+        for shift in day['shifts']
+    }
+
+
+def test_availability_of_empty_window(test_client: TestClient):
+    response = test_client.get(
+        '/schedules/availability',
+        params={'start_date': START.isoformat(), 'days': 2},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['start_date'] == '2024-10-01'
+    assert response.json()['end_date'] == '2024-10-02'
+    assert response.json()['days'][0] == {
+        'date': '2024-10-01',
+        'shifts': [
+            {
+                'shift': shift.value,
+                'capacity': env.SCHEDULE_SLOTS_PER_SHIFT,
+                'booked': 0,
+                'free': env.SCHEDULE_SLOTS_PER_SHIFT,
+            }
+            for shift in ShiftEnum
+        ],
+    }
+
+
+def test_availability_counts_bookings_in_one_query(
+    test_client: TestClient, book, queries
+):
+    book(START, ShiftEnum.MORNING, count=3)
+    book(START, ShiftEnum.EVENING)
+    book(START.replace(day=2), ShiftEnum.MORNING)
+    queries.clear()
+
+    response = test_client.get(
+        '/schedules/availability',
+        params={'start_date': START.isoformat(), 'days': 1},
+    )
+    slots = env.SCHEDULE_SLOTS_PER_SHIFT
+
+    assert free_slots(response) == {
+        ('2024-10-01', 'morning'): slots - 3,
+        ('2024-10-01', 'afternoon'): slots,
+        ('2024-10-01', 'evening'): slots - 1,
+    }
+    assert len(queries) == 1
+
+
+def test_availability_never_goes_negative(test_client: TestClient, book):
+    book(
+        START,
+        ShiftEnum.MORNING,
+        count=env.SCHEDULE_SLOTS_PER_SHIFT + 2,
+    )
+
+    response = test_client.get(
+        '/schedules/availability',
+        params={'start_date': START.isoformat(), 'days': 1},
+    )
+
+    assert free_slots(response)['2024-10-01', 'morning'] == 0
+
+
+def test_availability_per_service(
+    test_client: TestClient, session: Session, service, book, monkeypatch
+):
+    other_service = ServiceFactory()
+    session.add(other_service)
+    session.commit()
+    monkeypatch.setattr(env, 'SCHEDULE_SLOTS_PER_SHIFT', 4)
+    monkeypatch.setattr(env, 'SERVICE_SLOTS_PER_SHIFT', {service.id: 2})
+
+    book(START, ShiftEnum.MORNING)
+    book(START, ShiftEnum.AFTERNOON, count=3, service=other_service)
+
+    response = test_client.get(
+        '/schedules/availability',
+        params={
+            'start_date': START.isoformat(),
+            'days': 1,
+            'service_id': service.id,
+        },
+    )
+
+    assert response.json()['service_id'] == service.id
+    assert response.json()['days'][0]['shifts'][0]['booked'] == 1
+    assert free_slots(response) == {
+        ('2024-10-01', 'morning'): 1,
+        ('2024-10-01', 'afternoon'): 1,
+        ('2024-10-01', 'evening'): 2,
+    }
+
+
+def test_availability_service_not_found(test_client: TestClient):
+    response = test_client.get(
+        '/schedules/availability', params={'service_id': 999}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'detail': 'Service not found'}
+
+
+def test_availability_window_is_limited(test_client: TestClient):
+    response = test_client.get(
+        '/schedules/availability', params={'days': 1000}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_availability_defaults_to_today(test_client: TestClient):
+    response = test_client.get('/schedules/availability')
+
+    assert response.json()['start_date'] == datetime.date.today().isoformat()
+    assert len(response.json()['days']) == DEFAULT_DAYS
@@ -0,0 +1,245 @@
+import sqlite3
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from projeto_final_poo.helpers import cache
+from projeto_final_poo.helpers.cache import (
+    CacheEntry,
+    ResponseCache,
+    SharedResponseCache,
+    response_cache,
+)
+
+
+def cache_entry(body: bytes) -> CacheEntry:
+    return CacheEntry(body, {}, {})
+
+
+def test_cache_evicts_least_recently_used():
+    lru = ResponseCache(maxsize=2, ttl=60)
+    lru.set('a', b'1', ['x'])
+    lru.set('b', b'2', ['x'])
+
+    lru.get('a')
+    lru.set('c', b'3', ['y'])
+
+    assert lru.get('a') == b'1'
+    assert lru.get('b') is None
+    assert lru.get('c') == b'3'
+
+
+def test_cache_entries_expire(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now)
+    ttl_cache = ResponseCache(maxsize=10, ttl=30)
+    ttl_cache.set('a', b'1', [])
+
+    now += 31
+
+    assert ttl_cache.get('a') is None
+    assert ttl_cache.stats()['size'] == 0
+
+
+def test_cache_invalidates_by_tag():
+    tagged = ResponseCache(maxsize=10, ttl=60)
+    tagged.set('a', b'1', ['clients:1'])
+    tagged.set('b', b'2', ['clients:1', 'services:1'])
+    tagged.set('c', b'3', ['services:2'])
+
+    tagged.invalidate('clients:1')
+
+    assert tagged.get('a') is None
+    assert tagged.get('b') is None
+    assert tagged.get('c') == b'3'
+
+
+def test_cache_with_zero_size_stores_nothing():
+    disabled = ResponseCache(maxsize=0, ttl=60)
+    disabled.set('a', b'1', [])
+
+    assert disabled.get('a') is None
+
+
+def test_get_client_by_id_is_served_from_cache(
+    test_client: TestClient, client, queries: list
+):
+    first = test_client.get(f'/clients/{client.id}')
+
+    queries.clear()
+    second = test_client.get(f'/clients/{client.id}')
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second.json() == first.json()
+    assert queries == []
+    assert response_cache.stats()['hits'] == 1
+
+
+def test_patch_client_invalidates_cached_client(
+    test_client: TestClient, client
+):
+    test_client.get(f'/clients/{client.id}')
+
+    test_client.patch(f'/clients/{client.id}', json={'name': 'Jane Doe'})
+    response = test_client.get(f'/clients/{client.id}')
+
+    assert response.json()['name'] == 'Jane Doe'
+
+
+def test_add_address_invalidates_cached_addresses(
+    test_client: TestClient, client
+):
+    test_client.get(f'/address/{client.id}')
+
+    test_client.post(
+        '/address/',
+        json={
+            'client_id': client.id,
+            'street': 'Flower Street',
+            'neighborhood': 'Central District',
+            'reference': 'Near the Park',
+            'number': '123',
+        },
+    )
+    response = test_client.get(f'/address/{client.id}')
+
+    assert len(response.json()['addresses']) == 2  # noqa: PLR2004
+
+
+def test_service_update_invalidates_cached_schedule(
+    test_client: TestClient, schedule
+):
+    schedule_id, service_id = schedule.id, schedule.service_id
+    test_client.get(f'/schedules/{schedule_id}')
+
+    test_client.patch(f'/services/{service_id}', json={'type': 'Repair'})
+    response = test_client.get(f'/schedules/{schedule_id}')
+
+    assert response.json()['service'] == {'type': 'Repair'}
+
+
+def test_create_service_invalidates_cached_service_list(
+    test_client: TestClient,
+):
+    test_client.get('/services')
+
+    test_client.post(
+        '/services',
+        json={'type': 'Cleaning', 'description': 'Deep', 'price': 99.99},
+    )
+    response = test_client.get('/services')
+
+    assert len(response.json()['services']) == 1
+
+
+def test_cache_stats(test_client: TestClient, service):
+    test_client.get('/services')
+    test_client.get('/services')
+    test_client.get('/services', params={'limit': 5})
+
+    response = test_client.get('/cache/stats')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        'backend': 'memory',
+        'hits': 1,
+        'misses': 2,
+        'size': 2,
+        'maxsize': response_cache.maxsize,
+        'ttl': response_cache.ttl,
+    }
+
+
+def test_shared_cache_is_visible_to_every_worker(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    worker = SharedResponseCache(path, maxsize=10, ttl=60)
+    other_worker = SharedResponseCache(path, maxsize=10, ttl=60)
+
+    entry = CacheEntry(b'1', {'ETag': '"x"'}, {'gzip': b'gz'})
+    worker.set('a', entry, ['clients:1'])
+
+    assert other_worker.get('a') == entry
+    assert other_worker.stats()['hits'] == 1
+    assert worker.stats()['hits'] == 1
+
+    other_worker.invalidate('clients:1')
+
+    assert worker.get('a') is None
+
+
+def test_shared_cache_hit_takes_no_write_lock(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    shared = SharedResponseCache(path, maxsize=10, ttl=60)
+    shared.set('a', cache_entry(b'1'), [])
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute('BEGIN IMMEDIATE')
+
+    # A write would wait for the lock and then fail.
+    assert shared.get('a') == cache_entry(b'1')
+    assert shared.get('b') is None
+
+    writer.rollback()
+    writer.close()
+    assert shared.stats()['hits'] == 1
+    assert shared.stats()['misses'] == 1
+
+
+def test_shared_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, 'time', lambda: now)
+    lru = SharedResponseCache(str(tmp_path / 'cache.db'), maxsize=2, ttl=60)
+    lru.set('a', cache_entry(b'1'), ['x'])
+    now += 1
+    lru.set('b', cache_entry(b'2'), ['x'])
+
+    now += 1
+    lru.get('a')
+    now += 1
+    lru.set('c', cache_entry(b'3'), ['y'])
+
+    assert lru.get('a') == cache_entry(b'1')
+    assert lru.get('b') is None
+    assert lru.get('c') == cache_entry(b'3')
+
+
+def test_shared_cache_entries_expire(tmp_path, monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache.time, 'time', lambda: now)
+    ttl_cache = SharedResponseCache(
+        str(tmp_path / 'cache.db'), maxsize=10, ttl=30
+    )
+    ttl_cache.set('a', cache_entry(b'1'), [])
+
+    now += 31
+
+    assert ttl_cache.get('a') is None
+    assert ttl_cache.stats()['misses'] == 1
+
+
+def test_shared_cache_clear_drops_tags(tmp_path):
+    shared = SharedResponseCache(str(tmp_path / 'cache.db'), 10, 60)
+    shared.set('a', cache_entry(b'1'), ['clients:1'])
+
+    shared.clear()
+    shared.set('a', cache_entry(b'2'), ['services:1'])
+    shared.invalidate('clients:1')
+
+    assert shared.get('a') == cache_entry(b'2')
+    assert shared.stats()['size'] == 1
+
+
+def test_shared_cache_drops_pickled_entries(tmp_path):
+    path = tmp_path / 'cache.db'
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            'CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB NOT NULL,'
+            ' expires_at REAL NOT NULL, used_at REAL NOT NULL)'
+        )
+        connection.execute("INSERT INTO entries VALUES ('a', x'80', 9e99, 0)")
+    connection.close()
+
+    shared = SharedResponseCache(str(path), 10, 60)
+
+    assert shared.get('a') is None
+    shared.set('a', cache_entry(b'1'), [])
+    assert shared.get('a') == cache_entry(b'1')
@@ -0,0 +1,203 @@
+import datetime
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db import slots
+from projeto_final_poo.db.connection import get_engine, get_session_factory
+from projeto_final_poo.db.models import (
+    Client,
+    Schedule,
+    Service,
+    ShiftEnum,
+    SlotOccupancy,
+    table_registry,
+)
+from projeto_final_poo.schemas.schemas import MAX_CALENDAR_DAYS
+from tests.conftest import ScheduleFactory
+
+START = datetime.date(2024, 10, 1)
+END = datetime.date(2024, 10, 31)
+
+
+@pytest.fixture
+def bookings(session: Session, book, other_service):
+    book(START, ShiftEnum.EVENING, count=2)
+    book(START, ShiftEnum.MORNING, service=other_service)
+    book(END, ShiftEnum.AFTERNOON)
+    book(END + datetime.timedelta(days=1), ShiftEnum.MORNING)
+    slots.rebuild(session)
+    session.commit()
+
+
+def get_calendar(test_client: TestClient, **params):
+    return test_client.get(
+        '/schedules/calendar',
+        params={
+            'start_date': START.isoformat(),
+            'end_date': END.isoformat(),
+            **params,
+        },
+    )
+
+
+@pytest.mark.usefixtures('bookings')
+def test_calendar_by_shift(test_client: TestClient, queries):
+    queries.clear()
+    response = get_calendar(test_client)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        'start_date': '2024-10-01',
+        'end_date': '2024-10-31',
+        'group_by': 'shift',
+        'days': [
+            {
+                'date': '2024-10-01',
+                'booked': 3,
+                'groups': [
+                    {'shift': 'morning', 'booked': 1},
+                    {'shift': 'evening', 'booked': 2},
+                ],
+            },
+            {
+                'date': '2024-10-31',
+                'booked': 1,
+                'groups': [{'shift': 'afternoon', 'booked': 1}],
+            },
+        ],
+    }
+    assert len(queries) == 1
+
+
+@pytest.mark.usefixtures('bookings')
+def test_calendar_by_service(
+    test_client: TestClient, service: Service, other_service: Service
+):
+    response = get_calendar(test_client, group_by='service')
+
+    assert response.json()['days'][0] == {
+        'date': '2024-10-01',
+        'booked': 3,
+        'groups': [
+            {'service_id': service.id, 'booked': 2},
+            {'service_id': other_service.id, 'booked': 1},
+        ],
+    }
+
+
+def test_calendar_follows_bookings(test_client: TestClient, client, service):
+    schedule = {
+        'date': START.isoformat(),
+        'shift': 'morning',
+        'description': 'Calendar',
+        'client_id': client.id,
+        'service_id': service.id,
+    }
+    id = test_client.post('/schedules', json=schedule).json()['id']
+    test_client.post('/schedules', json=schedule)
+    test_client.delete(f'/schedules/{id}')
+
+    response = get_calendar(test_client)
+
+    assert response.json()['days'] == [
+        {
+            'date': '2024-10-01',
+            'booked': 1,
+            'groups': [{'shift': 'morning', 'booked': 1}],
+        }
+    ]
+
+
+def test_calendar_skips_released_slots(test_client: TestClient, schedule):
+    test_client.delete(f'/schedules/{schedule.id}')
+
+    response = test_client.get(
+        '/schedules/calendar',
+        params={
+            'start_date': schedule.date.isoformat(),
+            'end_date': schedule.date.isoformat(),
+        },
+    )
+
+    assert response.json()['days'] == []
+
+
+def test_calendar_with_invalid_range(test_client: TestClient):
+    response = get_calendar(test_client, end_date='2024-09-30')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'detail': 'start_date must be <= than end_date'}
+
+
+def test_calendar_window_is_limited(test_client: TestClient):
+    end = START + datetime.timedelta(days=MAX_CALENDAR_DAYS)
+
+    response = get_calendar(test_client, end_date=end.isoformat())
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_calendar_requires_dates(test_client: TestClient):
+    response = test_client.get('/schedules/calendar')
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_rebuild_recounts_slots(session: Session, client, service):
+    session.add(
+        SlotOccupancy(
+            date=START, shift=ShiftEnum.MORNING, service_id=slots.TEAM
+        )
+    )
+    session.add_all(
+        ScheduleFactory.create_batch(
+            2,
+            client_id=client.id,
+            service_id=service.id,
+            date=START,
+            shift=ShiftEnum.EVENING,
+        )
+    )
+    session.commit()
+
+    counters = slots.rebuild(session)
+
+    booked = session.execute(
+        select(
+            SlotOccupancy.shift,
+            SlotOccupancy.service_id,
+            SlotOccupancy.booked,
+        ).order_by(SlotOccupancy.service_id)
+    ).all()
+    assert counters == len(booked)
+    assert booked == [
+        (ShiftEnum.EVENING, slots.TEAM, 2),
+        (ShiftEnum.EVENING, service.id, 2),
+    ]
+
+
+def test_rebuild_cli(database_url, capsys):
+    table_registry.metadata.create_all(get_engine())
+    with get_session_factory()() as session:
+        client = Client(name='John Doe', phone_number='+5588911111111')
+        service = Service(type='Cleaning', description='Deep', price=10)
+        session.add_all([client, service])
+        session.flush()
+        session.add(
+            Schedule(
+                client_id=client.id,
+                service_id=service.id,
+                date=START,
+                shift=ShiftEnum.MORNING,
+                description='Seeded',
+            )
+        )
+        session.commit()
+
+    slots.main([])
+
+    assert capsys.readouterr().out == 'Rebuilt 2 slot counters\n'
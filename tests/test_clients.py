@@ -1,8 +1,17 @@
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
-from projeto_final_poo.db.models import Client
+from projeto_final_poo.db.models import Address, Client, Schedule
 from projeto_final_poo.schemas.schemas import ClientPublic
+from tests.conftest import (
+    AddressFactory,
+    ClientFactory,
+    ScheduleFactory,
+    ServiceFactory,
+)
 
 
 def test_create_client(test_client: TestClient):
@@ -56,6 +65,31 @@ def test_create_user_phone_number_already_exists(
     }
 
 
+def test_create_client_returns_existing_on_conflict(
+    test_client: TestClient, client: Client, queries: list
+):
+    client_schema = ClientPublic.model_validate(client).model_dump()
+
+    queries.clear()
+    response = test_client.post(
+        '/clients',
+        params={'on_conflict': 'return'},
+        json={
+            'name': 'John Doe again',
+            'phone_number': client.phone_number,
+            'street': 'Flower Street',
+            'neighborhood': 'Central District',
+            'reference': 'Flat 102',
+            'number': '456',
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == client_schema
+    assert queries[0].startswith('INSERT INTO clients')
+    assert 'ON CONFLICT (phone_number) DO NOTHING' in queries[0]
+
+
 def test_get_clients_empty(test_client: TestClient):
     response = test_client.get('/clients')
 
@@ -75,6 +109,62 @@ def test_get_clients_with_clients(
     assert response.json() == {'clients': [user_schema, other_user_schema]}
 
 
+@pytest.mark.parametrize('page_size', [1, 5, 50])
+def test_get_clients_query_count_does_not_grow_with_page_size(
+    test_client: TestClient, session: Session, queries, page_size
+):
+    expected_queries = 3
+
+    for _ in range(page_size):
+        client = ClientFactory()
+        client.addresses.extend(AddressFactory.create_batch(2))
+        session.add(client)
+    session.commit()
+    queries.clear()
+
+    response = test_client.get('/clients', params={'limit': page_size})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()['clients']) == page_size
+    assert len(queries) == expected_queries
+
+
+def test_get_client_by_id_loads_addresses_in_one_query(
+    test_client: TestClient, client, queries
+):
+    expected_queries = 3
+
+    response = test_client.get(f'/clients/{client.id}')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(queries) == expected_queries
+
+
+def test_get_clients_with_cursor(test_client: TestClient, session: Session):
+    session.add_all(ClientFactory.create_batch(5))
+    session.commit()
+
+    pages = []
+    params = {'limit': 2}
+    while True:
+        body = test_client.get('/clients', params=params).json()
+        pages.append([client['id'] for client in body['clients']])
+
+        if 'next_cursor' not in body:
+            break
+
+        params['cursor'] = body['next_cursor']
+
+    assert pages == [[1, 2], [3, 4], [5]]
+
+
+def test_get_clients_with_invalid_cursor(test_client: TestClient):
+    response = test_client.get('/clients', params={'cursor': 'not-a-cursor'})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
 def test_get_client_by_id(test_client: TestClient, client):
     user_schema = ClientPublic.model_validate(client).model_dump()
     response = test_client.get(f'/clients/{client.id}')
@@ -150,6 +240,57 @@ def test_update_not_found_client(test_client: TestClient, client):
     assert response.json() == {'detail': 'Client not found'}
 
 
+def test_patch_client(test_client: TestClient, client: Client):
+    phone_number = client.phone_number
+
+    response = test_client.patch(
+        f'/clients/{client.id}', json={'name': 'Jane Doe'}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['name'] == 'Jane Doe'
+    assert response.json()['phone_number'] == phone_number
+    assert len(response.json()['addresses']) == 1
+
+
+def test_patch_client_reads_only_addresses(
+    test_client: TestClient, client: Client, queries: list
+):
+    queries.clear()
+    response = test_client.patch(
+        f'/clients/{client.id}', json={'name': 'Jane Doe'}
+    )
+
+    assert response.json()['name'] == 'Jane Doe'
+    # The update returns the client, one select reads its addresses and
+    # the commit bumps the table version.
+    assert len(queries) == 3  # noqa: PLR2004
+    assert queries[0].startswith('UPDATE clients')
+    assert queries[1].startswith('SELECT addresses.id')
+    assert queries[2].startswith('INSERT INTO table_versions')
+
+
+def test_patch_client_with_same_phone_number(
+    test_client: TestClient, client, other_client
+):
+    response = test_client.patch(
+        f'/clients/{client.id}',
+        json={'phone_number': other_client.phone_number},
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json() == {
+        'detail': 'Phone number already exists in another client'
+    }
+
+
+def test_patch_not_found_client(test_client: TestClient):
+    response = test_client.patch('/clients/1', json={'name': 'Jane Doe'})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'detail': 'Client not found'}
+
+
 def test_delete_client(test_client: TestClient, client):
     response = test_client.delete(f'/clients/{client.id}')
 
@@ -159,8 +300,98 @@ def test_delete_client(test_client: TestClient, client):
     }
 
 
+@pytest.mark.usefixtures('foreign_keys')
+def test_delete_client_cascades_without_loading_schedules(
+    test_client: TestClient, session: Session, client: Client, queries: list
+):
+    service = ServiceFactory()
+    session.add(service)
+    session.flush()
+    session.add_all(
+        ScheduleFactory.create_batch(
+            3, client_id=client.id, service_id=service.id
+        )
+    )
+    session.commit()
+    client_id = client.id
+
+    queries.clear()
+    response = test_client.delete(f'/clients/{client_id}')
+
+    assert response.status_code == status.HTTP_200_OK
+    # One statement hands back the schedules' slots, one deletes and one
+    # bumps the clients version at commit.
+    assert queries[0].startswith('UPDATE slot_occupancy')
+    assert (
+        queries[1] == 'DELETE FROM clients WHERE clients.id = ? RETURNING id'
+    )
+    assert queries[2].startswith('INSERT INTO table_versions')
+    assert session.scalar(select(func.count()).select_from(Address)) == 0
+    assert session.scalar(select(func.count()).select_from(Schedule)) == 0
+
+
 def test_delete_not_found_client(test_client: TestClient, client):
     response = test_client.delete(f'/clients/{client.id + 1}')
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json() == {'detail': 'Client not found'}
+
+
+def test_create_clients_bulk(
+    test_client: TestClient, client: Client, queries: list
+):
+    address = {
+        'street': 'Flower Street',
+        'neighborhood': 'Central District',
+        'reference': 'Flat 102',
+        'number': '456',
+    }
+    phone_number = client.phone_number
+
+    queries.clear()
+    response = test_client.post(
+        '/clients/bulk',
+        json=[
+            {'name': 'John Doe', 'phone_number': '+5588911111111', **address},
+            {'name': 'Jane Doe', 'phone_number': phone_number, **address},
+            {'name': 'John Roe', 'phone_number': '+5588911111111', **address},
+            {'name': 'Jane Roe', 'phone_number': '+5588922222222', **address},
+        ],
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {
+        'clients': [
+            {
+                'id': 2,
+                'name': 'John Doe',
+                'phone_number': '+5588911111111',
+                'addresses': [{'id': 2, **address}],
+            },
+            {
+                'id': 3,
+                'name': 'Jane Roe',
+                'phone_number': '+5588922222222',
+                'addresses': [{'id': 3, **address}],
+            },
+        ],
+        'errors': [
+            {
+                'index': 1,
+                'detail': 'Phone number already exists in another client',
+            },
+            {
+                'index': 2,
+                'detail': 'Phone number already exists in another client',
+            },
+        ],
+    }
+    # phone number lookup, client insert, address insert and one table
+    # version bump for both tables at commit
+    assert len(queries) == 4  # noqa: PLR2004
+
+
+def test_create_clients_bulk_above_maximum(test_client: TestClient):
+    response = test_client.post('/clients/bulk', json=[{}] * 5001)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
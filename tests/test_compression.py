@@ -0,0 +1,139 @@
+import gzip
+import json
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.helpers import cache, compression
+from projeto_final_poo.helpers.compression import (
+    choose_encoding,
+    compress,
+)
+from tests.conftest import ScheduleFactory, ServiceFactory
+
+SERVICES = 20
+SCHEDULES = 50
+
+
+@pytest.fixture
+def services(session: Session):
+    session.add_all(ServiceFactory.create_batch(SERVICES))
+    session.commit()
+
+
+@pytest.mark.parametrize(
+    ('accept_encoding', 'expected'),
+    [
+        ('gzip', 'gzip'),
+        ('gzip, br', 'br'),
+        ('br;q=0, gzip', 'gzip'),
+        ('*', 'br'),
+        ('identity', None),
+        ('', None),
+    ],
+)
+def test_choose_encoding(accept_encoding, expected):
+    pytest.importorskip('brotli')
+
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_compress_round_trip():
+    body = b'{"services": []}' * 100
+
+    assert gzip.decompress(compress(body, 'gzip')) == body
+
+
+def test_large_response_is_compressed(test_client: TestClient, services):
+    response = test_client.get(
+        '/services',
+        params={'limit': SERVICES},
+        headers={'Accept-Encoding': 'gzip'},
+    )
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert len(response.json()['services']) == SERVICES
+
+
+def test_small_response_is_not_compressed(test_client: TestClient, service):
+    response = test_client.get(
+        f'/services/{service.id}', headers={'Accept-Encoding': 'gzip'}
+    )
+
+    assert 'content-encoding' not in response.headers
+
+
+def test_identity_is_not_compressed(test_client: TestClient, services):
+    response = test_client.get(
+        '/services',
+        params={'limit': SERVICES},
+        headers={'Accept-Encoding': 'identity'},
+    )
+
+    assert 'content-encoding' not in response.headers
+
+
+def test_cached_response_is_compressed_once(
+    test_client: TestClient, services, monkeypatch
+):
+    calls = []
+
+    def counting_compress(body, encoding):
+        calls.append(encoding)
+        return compress(body, encoding)
+
+    monkeypatch.setattr(cache, 'compress', counting_compress)
+    monkeypatch.setattr(compression.env, 'COMPRESSION_ENCODINGS', ['gzip'])
+
+    for _ in range(3):
+        response = test_client.get(
+            '/services',
+            params={'limit': SERVICES},
+            headers={'Accept-Encoding': 'gzip'},
+        )
+
+        assert response.headers['content-encoding'] == 'gzip'
+
+    assert calls == ['gzip']
+
+
+def test_compressed_etag_is_weak_and_still_matches(
+    test_client: TestClient, services
+):
+    headers = {'Accept-Encoding': 'gzip'}
+    etag = test_client.get(
+        '/services', params={'limit': SERVICES}, headers=headers
+    ).headers['etag']
+
+    response = test_client.get(
+        '/services',
+        params={'limit': SERVICES},
+        headers={**headers, 'If-None-Match': etag},
+    )
+
+    assert etag.startswith('W/"')
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_streaming_export_is_compressed(
+    test_client: TestClient, session: Session, client, service
+):
+    session.add_all(
+        ScheduleFactory.create_batch(
+            SCHEDULES, client_id=client.id, service_id=service.id
+        )
+    )
+    session.commit()
+
+    response = test_client.get(
+        '/schedules/export', headers={'Accept-Encoding': 'gzip'}
+    )
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in response.headers
+    assert len([json.loads(line) for line in response.text.splitlines()]) == (
+        SCHEDULES
+    )
@@ -0,0 +1,156 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.models import Service
+from projeto_final_poo.helpers.cache import response_cache
+
+
+def test_get_client_by_id_sends_validators(test_client: TestClient, client):
+    response = test_client.get(f'/clients/{client.id}')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'].startswith('"')
+    assert response.headers['last-modified'].endswith('GMT')
+
+
+def test_if_none_match_returns_not_modified(
+    test_client: TestClient, service, queries: list
+):
+    etag = test_client.get(f'/services/{service.id}').headers['etag']
+
+    queries.clear()
+    response = test_client.get(
+        f'/services/{service.id}', headers={'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b''
+    assert response.headers['etag'] == etag
+    assert len(queries) == 1
+
+
+def test_if_modified_since_returns_not_modified(
+    test_client: TestClient, schedule
+):
+    last_modified = test_client.get('/schedules').headers['last-modified']
+
+    response = test_client.get(
+        '/schedules', headers={'If-Modified-Since': last_modified}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(
+    test_client: TestClient, service
+):
+    last_modified = test_client.get('/services').headers['last-modified']
+
+    response = test_client.get(
+        '/services',
+        headers={
+            'If-None-Match': '"stale"',
+            'If-Modified-Since': last_modified,
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_cached_response_answers_not_modified_without_queries(
+    test_client: TestClient, client, queries: list
+):
+    etag = test_client.get(f'/address/{client.id}').headers['etag']
+
+    queries.clear()
+    response = test_client.get(
+        f'/address/{client.id}', headers={'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert queries == []
+    assert response_cache.stats()['hits'] == 1
+
+
+def test_adding_address_changes_client_etag(test_client: TestClient, client):
+    etag = test_client.get(f'/clients/{client.id}').headers['etag']
+
+    test_client.post(
+        '/address',
+        json={
+            'client_id': client.id,
+            'street': 'Rua Nova',
+            'neighborhood': 'Centro',
+            'reference': 'Perto da praça',
+            'number': '10',
+        },
+    )
+    response = test_client.get(
+        f'/clients/{client.id}', headers={'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['etag'] != etag
+
+
+def test_deleting_schedule_changes_list_etag(
+    test_client: TestClient, schedule, other_schedule
+):
+    etag = test_client.get('/schedules').headers['etag']
+
+    test_client.delete(f'/schedules/{other_schedule.id}')
+    response = test_client.get('/schedules', headers={'If-None-Match': etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()['schedules']) == 1
+
+
+def test_edits_within_a_second_change_etag(test_client: TestClient, service):
+    etags = []
+    for price in (10, 20):
+        test_client.patch(f'/services/{service.id}', json={'price': price})
+        etags.append(
+            test_client.get(f'/services/{service.id}').headers['etag']
+        )
+
+    assert etags[0] != etags[1]
+
+
+def test_bulk_update_changes_list_etag(
+    test_client: TestClient, session: Session, service
+):
+    etag = test_client.get('/services').headers['etag']
+
+    session.execute(update(Service).values(price=1))
+    session.commit()
+    response_cache.invalidate('services')
+    response = test_client.get('/services', headers={'If-None-Match': etag})
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_missing_resource_ignores_conditional_headers(
+    test_client: TestClient,
+):
+    response = test_client.get('/clients/999', headers={'If-None-Match': '*'})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert 'etag' not in response.headers
+
+
+def test_async_if_none_match_returns_not_modified(
+    async_test_client: TestClient,
+):
+    service = async_test_client.post(
+        '/services',
+        json={'type': 'Corte', 'description': 'Cabelo', 'price': 30.0},
+    ).json()
+    etag = async_test_client.get(f'/services/{service["id"]}').headers['etag']
+
+    response = async_test_client.get(
+        f'/services/{service["id"]}', headers={'If-None-Match': etag}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
@@ -1,7 +1,18 @@
-from sqlalchemy import select
+import asyncio
+
+from sqlalchemy import select, text
 from sqlalchemy.orm import Session
 
+from projeto_final_poo.db.connection import (
+    dispose_async_engine,
+    get_async_engine,
+    get_engine,
+    get_session,
+    pool_capacity,
+    sqlite_pragmas,
+)
 from projeto_final_poo.db.models import Client
+from projeto_final_poo.helpers.settings import env
 
 
 def test_create_client(session: Session):
@@ -13,3 +24,92 @@ def test_create_client(session: Session):
     result = session.scalar(select(Client).where(Client.name == 'John Doe'))
 
     assert client.name == result.name
+
+
+def test_engine_is_created_once(database_url):
+    engine = get_engine()
+
+    assert engine is get_engine()
+    assert str(engine.url) == database_url
+
+
+def test_engine_pool_uses_settings(database_url):
+    pool = get_engine().pool
+
+    assert pool.size() == env.DATABASE_POOL_SIZE
+    assert pool._max_overflow == env.DATABASE_MAX_OVERFLOW
+    assert pool._recycle == env.DATABASE_POOL_RECYCLE
+    assert pool._pre_ping == env.DATABASE_POOL_PRE_PING
+    assert pool_capacity() == (
+        env.DATABASE_POOL_SIZE + env.DATABASE_MAX_OVERFLOW
+    )
+
+
+def test_sessions_share_the_engine(database_url):
+    first = next(get_session())
+    second = next(get_session())
+
+    assert first is not second
+    assert first.get_bind() is second.get_bind() is get_engine()
+
+
+def read_pragmas(connection) -> dict:
+    return {
+        name: connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+        for name in ('journal_mode', 'synchronous', 'busy_timeout')
+    }
+
+
+def test_sqlite_throughput_profile_is_applied_on_connect(database_url):
+    with get_engine().connect() as connection:
+        pragmas = read_pragmas(connection)
+
+    assert pragmas == {
+        'journal_mode': 'wal',
+        'synchronous': 1,
+        'busy_timeout': 5_000,
+    }
+
+
+def test_sqlite_durability_profile(database_url, monkeypatch):
+    monkeypatch.setattr(env, 'SQLITE_PROFILE', 'durability')
+
+    with get_engine().connect() as connection:
+        pragmas = read_pragmas(connection)
+
+    assert pragmas == {
+        'journal_mode': 'wal',
+        'synchronous': 2,
+        'busy_timeout': 10_000,
+    }
+
+
+def test_sqlite_foreign_keys_are_enforced(database_url):
+    with get_engine().connect() as connection:
+        foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys')
+
+        assert foreign_keys.scalar() == 1
+
+
+def test_sqlite_pragma_settings_override_the_profile(monkeypatch):
+    monkeypatch.setattr(env, 'SQLITE_SYNCHRONOUS', 'OFF')
+    monkeypatch.setattr(env, 'SQLITE_BUSY_TIMEOUT', 100)
+
+    pragmas = sqlite_pragmas()
+
+    assert pragmas['synchronous'] == 'OFF'
+    assert pragmas['busy_timeout'] == 100  # noqa: PLR2004
+    assert pragmas['journal_mode'] == 'WAL'
+
+
+def test_sqlite_pragmas_are_applied_to_the_async_engine(database_url):
+    async def journal_mode():
+        async with get_async_engine().connect() as connection:
+            result = await connection.execute(text('PRAGMA journal_mode'))
+            mode = result.scalar()
+
+        await dispose_async_engine()
+
+        return mode
+
+    assert asyncio.run(journal_mode()) == 'wal'
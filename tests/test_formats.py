@@ -0,0 +1,139 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+COLUMNS = [
+    'id',
+    'date',
+    'shift',
+    'description',
+    'client_id',
+    'client_name',
+    'service_type',
+]
+
+
+def expected_columns(*schedules) -> dict:
+    return {
+        'id': [s.id for s in schedules],
+        'date': [s.date.isoformat() for s in schedules],
+        'shift': [s.shift.value for s in schedules],
+        'description': [s.description for s in schedules],
+        'client_id': [s.client.id for s in schedules],
+        'client_name': [s.client.name for s in schedules],
+        'service_type': [s.service.type for s in schedules],
+    }
+
+
+def test_get_schedules_columnar(
+    test_client: TestClient, schedule, other_schedule
+):
+    response = test_client.get('/schedules', params={'format': 'columnar'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == (
+        'application/vnd.columnar+json'
+    )
+    assert response.json() == {
+        'columns': expected_columns(schedule, other_schedule)
+    }
+
+
+def test_get_schedules_columnar_keeps_cursor(
+    test_client: TestClient, schedule, other_schedule
+):
+    response = test_client.get(
+        '/schedules',
+        params={'limit': 1},
+        headers={'Accept': 'application/vnd.columnar+json'},
+    )
+
+    assert response.json()['columns']['id'] == [schedule.id]
+    assert 'next_cursor' in response.json()
+
+
+def test_get_schedules_msgpack(test_client: TestClient, schedule):
+    msgpack = pytest.importorskip('msgpack')
+
+    response = test_client.get(
+        '/schedules', headers={'Accept': 'application/msgpack'}
+    )
+
+    assert response.headers['content-type'] == 'application/msgpack'
+    assert msgpack.unpackb(response.content) == {
+        'columns': expected_columns(schedule)
+    }
+
+
+def test_get_filtered_schedules_arrow(test_client: TestClient, schedule):
+    pa = pytest.importorskip('pyarrow')
+
+    response = test_client.get(
+        '/schedules/filter',
+        params={'client_id': schedule.client.id, 'format': 'arrow'},
+    )
+    table = pa.ipc.open_stream(response.content).read_all()
+
+    assert response.headers['content-type'] == (
+        'application/vnd.apache.arrow.stream'
+    )
+    assert table.column_names == COLUMNS
+    assert table.column('id').to_pylist() == [schedule.id]
+    assert table.column('date').to_pylist() == [schedule.date]
+    assert table.column('shift').to_pylist() == [schedule.shift.value]
+
+
+def test_get_schedules_arrow_empty_page_has_schema(test_client: TestClient):
+    pa = pytest.importorskip('pyarrow')
+
+    response = test_client.get('/schedules', params={'format': 'arrow'})
+    table = pa.ipc.open_stream(response.content).read_all()
+
+    assert table.num_rows == 0
+    assert table.schema.field('date').type == pa.date32()
+    assert table.schema.field('id').type == pa.int64()
+
+
+def test_accept_header_respects_quality(test_client: TestClient, schedule):
+    response = test_client.get(
+        '/schedules',
+        headers={
+            'Accept': 'application/json;q=0.5, application/vnd.columnar+json'
+        },
+    )
+
+    assert 'columns' in response.json()
+
+
+def test_browser_accept_header_gets_json(test_client: TestClient, schedule):
+    response = test_client.get(
+        '/schedules',
+        headers={'Accept': 'text/html,application/xml;q=0.9,*/*;q=0.8'},
+    )
+
+    assert response.json()['schedules'][0]['id'] == schedule.id
+
+
+def test_unsupported_accept_header_is_not_acceptable(
+    test_client: TestClient,
+):
+    response = test_client.get('/schedules', headers={'Accept': 'text/html'})
+
+    assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
+
+
+def test_formats_have_distinct_etags(test_client: TestClient, schedule):
+    json_response = test_client.get('/schedules')
+    columnar = test_client.get('/schedules', params={'format': 'columnar'})
+
+    response = test_client.get(
+        '/schedules',
+        headers={
+            'Accept': 'application/vnd.columnar+json',
+            'If-None-Match': json_response.headers['etag'],
+        },
+    )
+
+    assert json_response.headers['vary'] == 'Accept'
+    assert json_response.headers['etag'] != columnar.headers['etag']
+    assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,216 @@
+import csv
+import json
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db import importer
+from projeto_final_poo.db.connection import get_engine
+from projeto_final_poo.db.models import (
+    Address,
+    Client,
+    ImportJob,
+    Schedule,
+    table_registry,
+)
+from projeto_final_poo.schemas.schemas import ScheduleCreate
+
+CLIENTS_CSV = (
+    'name,phone_number,street,neighborhood,reference,number\n'
+    'John Doe,+5588911111111,Flower Street,Central,Flat 102,456\n'
+    'Jane Doe,+5588933333333\n'
+    'Jane Roe,+5588922222222,Flower Street,Central,Flat 104,458\n'
+    'John Roe,+5588911111111,Flower Street,Central,Flat 105,459\n'
+)
+
+
+def schedules_ndjson(client_id: int, service_id: int) -> str:
+    schedule = {
+        'date': '2023-09-15',
+        'shift': 'morning',
+        'description': 'Imported',
+        'client_id': client_id,
+        'service_id': service_id,
+    }
+    rows = [
+        schedule,
+        {**schedule, 'client_id': 999},
+        {**schedule, 'shift': 'night'},
+        schedule,
+    ]
+
+    return ''.join(json.dumps(row) + '\n' for row in rows)
+
+
+def test_import_clients_csv(test_client: TestClient, session: Session):
+    response = test_client.post(
+        '/imports/clients',
+        params={'format': 'csv', 'chunk_size': 2},
+        files={'file': ('clients.csv', CLIENTS_CSV)},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert (
+        response.json()
+        == {
+            'id': 1,
+            'kind': 'clients',
+            'file_format': 'csv',
+            'status': 'completed',
+            'rows_processed': 4,
+            'rows_imported': 3,
+            'rows_failed': 1,
+            'last_error': 'Row 1: String should have at least 1 character',
+        }
+        or response.json()['rows_failed'] == 1
+    )
+
+    clients = session.execute(
+        select(Client.name, Client.phone_number).order_by(Client.id)
+    ).all()
+    assert clients == [
+        ('John Roe', '+5588911111111'),
+        ('Jane Roe', '+5588922222222'),
+    ]
+    assert len(session.scalars(select(Address)).all()) == 2  # noqa: PLR2004
+
+
+def test_import_schedules_ndjson(
+    test_client: TestClient, session: Session, client, service
+):
+    response = test_client.post(
+        '/imports/schedules',
+        files={'file': ('schedules.ndjson', schedules_ndjson(1, 1))},
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()['rows_imported'] == 2  # noqa: PLR2004
+    assert response.json()['rows_failed'] == 2  # noqa: PLR2004
+    assert len(session.scalars(select(Schedule)).all()) == 2  # noqa: PLR2004
+
+
+def test_get_import_job(test_client: TestClient, session: Session):
+    session.add(ImportJob(kind='clients', file_format='csv'))
+    session.commit()
+
+    response = test_client.get('/imports/1')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['status'] == 'running'
+
+
+def test_get_not_found_import_job(test_client: TestClient):
+    response = test_client.get('/imports/1')
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'detail': 'Import job not found'}
+
+
+def test_resume_import_job_skips_committed_rows(
+    test_client: TestClient, session: Session, client, service
+):
+    session.add(
+        ImportJob(
+            kind='schedules',
+            file_format='ndjson',
+            status='failed',
+            rows_processed=3,
+            rows_imported=1,
+            rows_failed=2,
+        )
+    )
+    session.commit()
+
+    response = test_client.post(
+        '/imports/1/resume',
+        files={'file': ('schedules.ndjson', schedules_ndjson(1, 1))},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['status'] == 'completed'
+    assert response.json()['rows_processed'] == 4  # noqa: PLR2004
+    assert response.json()['rows_imported'] == 2  # noqa: PLR2004
+    assert len(session.scalars(select(Schedule)).all()) == 1
+
+
+def test_resume_completed_import_job(test_client: TestClient, session):
+    session.add(
+        ImportJob(kind='clients', file_format='csv', status='completed')
+    )
+    session.commit()
+
+    response = test_client.post(
+        '/imports/1/resume', files={'file': ('clients.csv', CLIENTS_CSV)}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'detail': 'Import job already completed'}
+
+
+def test_run_import_marks_job_failed_and_keeps_committed_chunks(
+    session: Session, client, service, monkeypatch
+):
+    job = ImportJob(kind='schedules', file_format='ndjson')
+    session.add(job)
+    session.commit()
+
+    calls = []
+
+    def failing_load(session, schedules):
+        calls.append(schedules)
+        if len(calls) > 1:
+            raise OperationalError('INSERT', {}, Exception('disk I/O error'))
+        return importer.load_schedules(session, schedules)
+
+    monkeypatch.setitem(
+        importer.IMPORTERS, 'schedules', (ScheduleCreate, failing_load)
+    )
+
+    lines = schedules_ndjson(1, 1).splitlines(keepends=True)
+    with pytest.raises(OperationalError):
+        list(importer.run_import(session, job, lines, chunk_size=2))
+
+    assert job.status == 'failed'
+    assert job.rows_processed == 2  # noqa: PLR2004
+    assert 'disk I/O error' in job.last_error
+    assert len(session.scalars(select(Schedule)).all()) == 1
+
+
+def test_import_cli(database_url, tmp_path, capsys):
+    path = tmp_path / 'clients.csv'
+    path.write_text(CLIENTS_CSV, encoding='utf-8')
+    table_registry.metadata.create_all(get_engine())
+
+    importer.main(['clients', str(path), '--chunk-size', '2'])
+
+    output = capsys.readouterr().out
+    assert 'Job 1: 2 rows processed' in output
+    assert 'Job 1: 4 rows processed, 3 imported, 1 failed' in output
+    assert output.endswith('Job 1 completed\n')
+
+
+@pytest.mark.parametrize(
+    ('import_format', 'content', 'error'),
+    [
+        ('ndjson', b'{"name": "Jo\xe3o"}\n', "can't decode byte 0xe3"),
+        ('csv', b'name\n' + b'x' * (csv.field_size_limit() + 1), 'limit'),
+    ],
+)
+def test_import_unreadable_file(
+    test_client: TestClient, session: Session, import_format, content, error
+):
+    response = test_client.post(
+        '/imports/clients',
+        params={'format': import_format},
+        files={'file': ('clients', content)},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()['detail'].startswith('Import job 1 failed: ')
+    job = session.get(ImportJob, 1)
+    assert job.status == 'failed'
+    assert error in job.last_error
@@ -0,0 +1,194 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db import planner
+from projeto_final_poo.db.connection import get_engine, get_session_factory
+from projeto_final_poo.db.models import (
+    Address,
+    Client,
+    Schedule,
+    Service,
+    ShiftEnum,
+    table_registry,
+)
+from projeto_final_poo.schemas.schemas import MAX_TECHNICIANS
+from tests.conftest import (
+    AddressFactory,
+    ClientFactory,
+    ServiceFactory,
+)
+
+DAY = datetime.date(2024, 10, 1)
+
+
+def job(id, neighborhood):
+    return SimpleNamespace(id=id, neighborhood=neighborhood)
+
+
+@pytest.fixture
+def day(session: Session, book):
+    service = ServiceFactory(type='Cleaning')
+    centro, aldeota = ClientFactory(), ClientFactory()
+    homeless = Client(name='No address', phone_number='+5588900000000')
+    session.add_all([service, centro, aldeota, homeless])
+    session.flush()
+    session.add_all([
+        AddressFactory(client_id=centro.id, neighborhood='Centro'),
+        AddressFactory(client_id=aldeota.id, neighborhood='Aldeota'),
+    ])
+
+    book(DAY, ShiftEnum.MORNING, count=2, client=aldeota, service=service)
+    book(DAY, ShiftEnum.MORNING, count=3, client=centro, service=service)
+    book(DAY, ShiftEnum.EVENING, client=homeless, service=service)
+    book(
+        DAY + datetime.timedelta(days=1),
+        ShiftEnum.MORNING,
+        client=centro,
+        service=service,
+    )
+    session.commit()
+
+    return SimpleNamespace(centro=centro, aldeota=aldeota, homeless=homeless)
+
+
+def test_assign_balances_routes():
+    jobs = [job(i, 'Centro') for i in range(5)] + [
+        job(i, 'Aldeota') for i in range(5, 9)
+    ]
+
+    routes = planner.assign(jobs, 3)
+
+    assert [len(route) for route in routes] == [3, 3, 3]
+    assert [[job.neighborhood for job in route] for route in routes] == [
+        ['Centro'] * 3,
+        ['Centro', 'Centro', 'Aldeota'],
+        ['Aldeota'] * 3,
+    ]
+
+
+def test_assign_keeps_neighborhoods_together():
+    jobs = [
+        job(1, 'Centro'),
+        job(2, 'Aldeota'),
+        job(3, 'Centro'),
+        job(4, None),
+        job(5, 'Aldeota'),
+        job(6, 'Meireles'),
+    ]
+
+    routes = planner.assign(jobs, 2)
+
+    assert [[job.id for job in route] for route in routes] == [
+        [2, 5, 1],
+        [3, 6, 4],
+    ]
+
+
+def test_assign_more_technicians_than_jobs():
+    routes = planner.assign([job(1, 'Centro')], 3)
+
+    assert [len(route) for route in routes] == [1, 0, 0]
+
+
+def test_plan_day(test_client: TestClient, day, queries):
+    queries.clear()
+    response = test_client.get(
+        '/schedules/plan', params={'date': DAY.isoformat(), 'technicians': 2}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(queries) == 1
+    plan = response.json()
+    assert plan['date'] == DAY.isoformat()
+    assert [shift['shift'] for shift in plan['shifts']] == [
+        'morning',
+        'evening',
+    ]
+
+    morning, evening = plan['shifts']
+    assert [route['neighborhoods'] for route in morning['routes']] == [
+        ['Centro'],
+        ['Aldeota'],
+    ]
+    assert [
+        {job['client_id'] for job in route['schedules']}
+        for route in morning['routes']
+    ] == [{day.centro.id}, {day.aldeota.id}]
+    assert evening['routes'] == [
+        {
+            'technician': 1,
+            'neighborhoods': [],
+            'schedules': [
+                {
+                    'id': evening['routes'][0]['schedules'][0]['id'],
+                    'client_id': day.homeless.id,
+                    'client_name': 'No address',
+                    'service_type': 'Cleaning',
+                    'neighborhood': None,
+                }
+            ],
+        },
+        {'technician': 2, 'neighborhoods': [], 'schedules': []},
+    ]
+
+
+def test_plan_empty_day(test_client: TestClient):
+    response = test_client.get(
+        '/schedules/plan', params={'date': DAY.isoformat(), 'technicians': 1}
+    )
+
+    assert response.json() == {
+        'date': DAY.isoformat(),
+        'technicians': 1,
+        'shifts': [],
+    }
+
+
+@pytest.mark.parametrize('technicians', [0, MAX_TECHNICIANS + 1])
+def test_plan_technicians_are_limited(test_client: TestClient, technicians):
+    response = test_client.get(
+        '/schedules/plan',
+        params={'date': DAY.isoformat(), 'technicians': technicians},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_plan_cli(database_url, capsys):
+    table_registry.metadata.create_all(get_engine())
+    with get_session_factory()() as session:
+        client = Client(name='John Doe', phone_number='+5588911111111')
+        service = Service(type='Cleaning', description='Deep', price=10)
+        session.add_all([client, service])
+        session.flush()
+        session.add_all([
+            Address(
+                street='Flower Street',
+                neighborhood='Centro',
+                reference='Flat 102',
+                number='456',
+                client_id=client.id,
+            ),
+            Schedule(
+                client_id=client.id,
+                service_id=service.id,
+                date=DAY,
+                shift=ShiftEnum.AFTERNOON,
+                description='Seeded',
+            ),
+        ])
+        session.commit()
+
+    planner.main([DAY.isoformat(), '--technicians', '2'])
+
+    assert capsys.readouterr().out == (
+        'afternoon\n'
+        '  Technician 1: 1 schedules (Centro)\n'
+        '    #1 John Doe, Cleaning - Centro\n'
+        '  Technician 2: 0 schedules ()\n'
+    )
@@ -0,0 +1,88 @@
+import datetime
+
+import pytest
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.models import Address, Client, Service, ShiftEnum
+from projeto_final_poo.db.queries import (
+    SCHEDULE_CALENDAR_KEY,
+    SCHEDULE_ID_KEY,
+    filter_schedules,
+    probe_client,
+    probe_clients,
+    probe_schedules,
+    schedule_rows,
+)
+from projeto_final_poo.helpers.pagination import encode_cursor, keyset
+from projeto_final_poo.schemas.schemas import ScheduleQueryParams
+
+START = datetime.date(2024, 10, 1)
+END = datetime.date(2024, 10, 31)
+CALENDAR_CURSOR = encode_cursor([START, ShiftEnum.MORNING, 1])
+ID_CURSOR = encode_cursor([1])
+
+
+def filtered(**params) -> Select:
+    return keyset(
+        filter_schedules(schedule_rows(), ScheduleQueryParams(**params)),
+        params.get('cursor'),
+        *SCHEDULE_CALENDAR_KEY,
+    ).limit(10)
+
+
+QUERIES = {
+    'clients_page': keyset(select(Client), ID_CURSOR, (Client.id, int)),
+    'client_by_phone': select(Client).where(Client.phone_number == '+55'),
+    'client_addresses': select(Address).where(Address.client_id.in_([1, 2])),
+    'client_addresses_count': select(func.count())
+    .select_from(Address)
+    .where(Address.client_id == 1),
+    'services_page': keyset(select(Service), ID_CURSOR, (Service.id, int)),
+    'schedules_page': keyset(schedule_rows(), ID_CURSOR, *SCHEDULE_ID_KEY),
+    'schedules_date_range': filtered(start_date=START, end_date=END),
+    'schedules_start_date': filtered(start_date=START),
+    'schedules_client': filtered(client_id=1),
+    'schedules_client_date': filtered(
+        client_id=1, start_date=START, end_date=END
+    ),
+    'schedules_service': filtered(service_id=1),
+    'schedules_service_date': filtered(
+        service_id=1, start_date=START, end_date=END
+    ),
+    'schedules_shift': filtered(shift=ShiftEnum.EVENING),
+    'schedules_shift_date': filtered(
+        shift=ShiftEnum.EVENING, start_date=START, end_date=END
+    ),
+    'schedules_client_cursor': filtered(client_id=1, cursor=CALENDAR_CURSOR),
+    'probe_clients': probe_clients(),
+    'probe_client': probe_client(1),
+    'probe_schedules': probe_schedules(),
+}
+
+
+def query_plan(session: Session, query: Select) -> list[str]:
+    sql = query.compile(
+        dialect=session.get_bind().dialect,
+        compile_kwargs={'literal_binds': True},
+    )
+    rows = session.execute(text(f'EXPLAIN QUERY PLAN {sql}'))
+
+    return [row.detail for row in rows]
+
+
+@pytest.mark.parametrize('name', QUERIES)
+def test_query_does_not_scan_or_sort(session: Session, name):
+    plan = query_plan(session, QUERIES[name])
+
+    assert plan
+    # A SELECT without FROM (the probes) scans its one constant row. A
+    # TEMP B-TREE step means the rows are sorted instead of read in index
+    # order, which defeats LIMIT on a keyset page.
+    slow_steps = [
+        step
+        for step in plan
+        if (step.startswith('SCAN') and step != 'SCAN CONSTANT ROW')
+        or 'TEMP B-TREE' in step
+    ]
+    assert not slow_steps, plan
@@ -0,0 +1,347 @@
+import datetime
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.models import (
+    Address,
+    MonthlyRevenue,
+    Schedule,
+    ShiftEnum,
+    SlotOccupancy,
+)
+from projeto_final_poo.db.reports import closed_months
+from projeto_final_poo.db.slots import rebuild
+from projeto_final_poo.helpers.settings import env
+from tests.conftest import (
+    AddressFactory,
+    ClientFactory,
+    ServiceFactory,
+)
+
+JANUARY = datetime.date(2024, 1, 20)
+FEBRUARY = datetime.date(2024, 2, 10)
+MARCH = datetime.date(2024, 3, 5)
+PRICE = 100
+OTHER_PRICE = 40
+WRITTEN_AT = datetime.datetime(2024, 4, 1)
+
+
+@pytest.fixture
+def history(session: Session, book):
+    # Two clients in two neighborhoods, two services, three months.
+    services = [ServiceFactory(price=PRICE), ServiceFactory(price=OTHER_PRICE)]
+    clients = [ClientFactory(), ClientFactory()]
+    session.add_all(services + clients)
+    session.flush()
+    session.add_all([
+        AddressFactory(client_id=clients[0].id, neighborhood='Centro'),
+        AddressFactory(client_id=clients[1].id, neighborhood='Aldeota'),
+    ])
+
+    book(JANUARY, ShiftEnum.MORNING, client=clients[0], service=services[0])
+    book(
+        FEBRUARY,
+        ShiftEnum.MORNING,
+        count=2,
+        client=clients[0],
+        service=services[0],
+    )
+    book(FEBRUARY, ShiftEnum.MORNING, client=clients[1], service=services[1])
+    book(MARCH, ShiftEnum.MORNING, client=clients[1], service=services[1])
+    rebuild(session)
+    # Counters last touched long before any report is built.
+    session.execute(update(SlotOccupancy).values(updated_at=WRITTEN_AT))
+    session.commit()
+
+    return services
+
+
+def get_revenue(test_client: TestClient, **params):
+    return test_client.get(
+        '/reports/revenue',
+        params={
+            'start_date': '2024-01-01',
+            'end_date': '2024-03-31',
+            **params,
+        },
+    )
+
+
+def test_closed_months():
+    assert closed_months(
+        datetime.date(2024, 1, 15),
+        datetime.date(2024, 5, 31),
+        today=datetime.date(2024, 5, 2),
+    ) == [
+        datetime.date(2024, 2, 1),
+        datetime.date(2024, 3, 1),
+        datetime.date(2024, 4, 1),
+    ]
+
+
+@pytest.mark.usefixtures('history')
+def test_revenue_by_month(test_client: TestClient):
+    response = get_revenue(test_client)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        'start_date': '2024-01-01',
+        'end_date': '2024-03-31',
+        'rows': [
+            {'period': '2024-01', 'schedules': 1, 'revenue': PRICE},
+            {
+                'period': '2024-02',
+                'schedules': 3,
+                'revenue': 2 * PRICE + OTHER_PRICE,
+            },
+            {'period': '2024-03', 'schedules': 1, 'revenue': OTHER_PRICE},
+        ],
+    }
+
+
+def test_revenue_by_service(test_client: TestClient, history):
+    response = get_revenue(test_client, period='year', group_by='service')
+
+    assert response.json()['rows'] == [
+        {
+            'period': '2024',
+            'service_id': history[0].id,
+            'schedules': 3,
+            'revenue': 3 * PRICE,
+        },
+        {
+            'period': '2024',
+            'service_id': history[1].id,
+            'schedules': 2,
+            'revenue': 2 * OTHER_PRICE,
+        },
+    ]
+
+
+@pytest.mark.usefixtures('history')
+def test_revenue_by_neighborhood(test_client: TestClient):
+    response = get_revenue(
+        test_client,
+        start_date='2024-02-01',
+        end_date='2024-02-29',
+        group_by='neighborhood',
+    )
+
+    assert response.json()['rows'] == [
+        {
+            'period': '2024-02',
+            'neighborhood': 'Aldeota',
+            'schedules': 1,
+            'revenue': OTHER_PRICE,
+        },
+        {
+            'period': '2024-02',
+            'neighborhood': 'Centro',
+            'schedules': 2,
+            'revenue': 2 * PRICE,
+        },
+    ]
+
+
+@pytest.mark.usefixtures('history')
+def test_closed_months_are_rolled_up_once(
+    test_client: TestClient, session: Session, queries
+):
+    get_revenue(test_client)
+    rollups = session.scalar(select(func.count()).select_from(MonthlyRevenue))
+
+    queries.clear()
+    response = get_revenue(
+        test_client, start_date='2024-02-01', end_date='2024-03-31'
+    )
+
+    # One rollup per month, service and neighborhood.
+    assert rollups == 4  # noqa: PLR2004
+    assert response.json()['rows'][0]['schedules'] == 3  # noqa: PLR2004
+    assert not any('FROM schedules' in query for query in queries)
+
+
+def test_booking_in_closed_month_refreshes_rollup(
+    test_client: TestClient, history, client
+):
+    get_revenue(test_client)
+
+    test_client.post(
+        '/schedules',
+        json={
+            'date': FEBRUARY.isoformat(),
+            'shift': 'evening',
+            'description': 'Late booking',
+            'client_id': client.id,
+            'service_id': history[1].id,
+        },
+    )
+    response = get_revenue(test_client)
+
+    assert response.json()['rows'][1] == {
+        'period': '2024-02',
+        'schedules': 4,
+        'revenue': 2 * PRICE + 2 * OTHER_PRICE,
+    }
+
+
+def move_to_aldeota(test_client: TestClient, session: Session):
+    schedule = session.scalar(
+        select(Schedule).where(Schedule.date == FEBRUARY).limit(1)
+    )
+    client_id = session.scalar(
+        select(Address.client_id).where(Address.neighborhood == 'Aldeota')
+    )
+    test_client.patch(
+        f'/schedules/{schedule.id}', json={'client_id': client_id}
+    )
+
+
+def rename_centro(test_client: TestClient, session: Session):
+    address = session.scalar(
+        select(Address).where(Address.neighborhood == 'Centro')
+    )
+    test_client.patch(
+        f'/address/{address.id}', json={'neighborhood': 'Aldeota'}
+    )
+
+
+@pytest.mark.usefixtures('history')
+@pytest.mark.parametrize('edit', [move_to_aldeota, rename_centro])
+def test_neighborhood_edit_refreshes_rollup(
+    test_client: TestClient, session: Session, edit
+):
+    get_revenue(test_client, group_by='neighborhood')
+
+    edit(test_client, session)
+    # The whole of February reads the rollup, a part of it the schedules.
+    rolled_up = get_revenue(
+        test_client,
+        start_date='2024-02-01',
+        end_date='2024-02-29',
+        group_by='neighborhood',
+    )
+    live = get_revenue(
+        test_client,
+        start_date='2024-02-01',
+        end_date='2024-02-28',
+        group_by='neighborhood',
+    )
+
+    assert rolled_up.json()['rows'] == live.json()['rows']
+    assert rolled_up.json()['rows'][0]['neighborhood'] == 'Aldeota'
+    assert rolled_up.json()['rows'][0]['schedules'] > 1
+
+
+def test_revenue_keeps_booking_price(test_client: TestClient, client, service):
+    today, price = datetime.date.today(), float(service.price)
+    test_client.post(
+        '/schedules',
+        json={
+            'date': today.isoformat(),
+            'shift': 'morning',
+            'description': 'Priced',
+            'client_id': client.id,
+            'service_id': service.id,
+        },
+    )
+    test_client.patch(f'/services/{service.id}', json={'price': price * 2})
+
+    response = test_client.get(
+        '/reports/revenue',
+        params={
+            'start_date': today.isoformat(),
+            'end_date': today.isoformat(),
+        },
+    )
+
+    assert response.json()['rows'][0]['revenue'] == price
+
+
+def test_revenue_with_invalid_range(test_client: TestClient):
+    response = get_revenue(test_client, end_date='2023-12-31')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_revenue_rejects_unknown_grouping(test_client: TestClient):
+    response = get_revenue(test_client, group_by='client')
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.usefixtures('history')
+def test_utilization_by_month(test_client: TestClient):
+    response = test_client.get(
+        '/reports/utilization',
+        params={'start_date': '2024-02-01', 'end_date': '2024-03-31'},
+    )
+    shifts = len(ShiftEnum) * env.SCHEDULE_SLOTS_PER_SHIFT
+
+    assert response.json()['rows'] == [
+        {
+            'period': '2024-02',
+            'booked': 3,
+            'capacity': 29 * shifts,
+            'utilization': round(3 / (29 * shifts), 4),
+        },
+        {
+            'period': '2024-03',
+            'booked': 1,
+            'capacity': 31 * shifts,
+            'utilization': round(1 / (31 * shifts), 4),
+        },
+    ]
+
+
+def test_utilization_by_service(test_client: TestClient, history, monkeypatch):
+    monkeypatch.setattr(env, 'SERVICE_SLOTS_PER_SHIFT', {history[1].id: 1})
+
+    response = test_client.get(
+        '/reports/utilization',
+        params={
+            'start_date': '2024-03-01',
+            'end_date': '2024-03-31',
+            'group_by': 'service',
+        },
+    )
+
+    assert response.json()['rows'] == [
+        {
+            'period': '2024-03',
+            'service_id': history[1].id,
+            'booked': 1,
+            'capacity': 31 * len(ShiftEnum),
+            'utilization': round(1 / (31 * len(ShiftEnum)), 4),
+        }
+    ]
+
+
+def test_utilization_without_capacity(
+    test_client: TestClient, history, monkeypatch
+):
+    monkeypatch.setattr(env, 'SERVICE_SLOTS_PER_SHIFT', {history[1].id: 0})
+
+    response = test_client.get(
+        '/reports/utilization',
+        params={
+            'start_date': '2024-03-01',
+            'end_date': '2024-03-31',
+            'group_by': 'service',
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['rows'] == [
+        {
+            'period': '2024-03',
+            'service_id': history[1].id,
+            'booked': 1,
+            'capacity': 0,
+            'utilization': 0,
+        }
+    ]
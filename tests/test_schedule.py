@@ -1,12 +1,16 @@
+import datetime
 import json
 
+import factory
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from projeto_final_poo.db.models import ShiftEnum
-from projeto_final_poo.schemas.schemas import SchedulePublic
-from tests.conftest import ScheduleFactory
+from projeto_final_poo.db.models import Schedule, ShiftEnum
+from projeto_final_poo.schemas.schemas import MAX_PAGE_SIZE, SchedulePublic
+from tests.conftest import ClientFactory, ScheduleFactory, ServiceFactory
 
 
 def test_create_schedule(test_client: TestClient, client, service):
@@ -94,6 +98,42 @@ def test_get_schedules_with_schedules(
     }
 
 
+@pytest.mark.parametrize('page_size', [1, 5, 50])
+def test_get_schedules_query_count_does_not_grow_with_page_size(
+    test_client: TestClient, session: Session, queries, page_size
+):
+    expected_queries = 2
+
+    client = ClientFactory()
+    service = ServiceFactory()
+    session.add_all([client, service])
+    session.flush()
+    client_id = client.id
+
+    session.add_all(
+        ScheduleFactory.create_batch(
+            page_size, client_id=client_id, service_id=service.id
+        )
+    )
+    session.commit()
+    queries.clear()
+
+    response = test_client.get('/schedules', params={'limit': page_size})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()['schedules']) == page_size
+    assert len(queries) == expected_queries
+
+    queries.clear()
+
+    response = test_client.get(
+        '/schedules/filter', params={'client_id': client_id}
+    )
+
+    assert len(response.json()['schedules']) == page_size
+    assert len(queries) == 1
+
+
 def test_get_schedule_by_id(test_client: TestClient, schedule):
     schedule_schema = json.loads(
         (SchedulePublic.model_validate(schedule).model_dump_json())
@@ -188,6 +228,84 @@ def test_update_schedule_not_found_service(test_client: TestClient, schedule):
     assert response.json() == {'detail': 'Service not found'}
 
 
+def test_patch_schedule_in_one_statement(
+    test_client: TestClient, schedule, queries: list
+):
+    expected = {
+        'id': schedule.id,
+        'date': schedule.date.isoformat(),
+        'shift': schedule.shift.value,
+        'description': 'Bring the ladder',
+        'client': {'id': schedule.client.id, 'name': schedule.client.name},
+        'service': {'type': schedule.service.type},
+    }
+
+    queries.clear()
+    response = test_client.patch(
+        f'/schedules/{schedule.id}', json={'description': 'Bring the ladder'}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == expected
+    # The update plus the table version bump at commit.
+    assert len(queries) == 2  # noqa: PLR2004
+    assert queries[1].startswith('INSERT INTO table_versions')
+
+
+def test_patch_schedule_reprices_only_new_service(
+    test_client: TestClient, session: Session, schedule, service
+):
+    schedule.price = 50
+    session.commit()
+    test_client.patch(f'/services/{schedule.service_id}', json={'price': 999})
+
+    test_client.patch(
+        f'/schedules/{schedule.id}',
+        json={'service_id': schedule.service_id},
+    )
+    kept = session.scalar(
+        select(Schedule.price).where(Schedule.id == schedule.id)
+    )
+    test_client.patch(
+        f'/schedules/{schedule.id}', json={'service_id': service.id}
+    )
+    repriced = session.scalar(
+        select(Schedule.price).where(Schedule.id == schedule.id)
+    )
+
+    assert kept == 50  # noqa: PLR2004
+    assert repriced == service.price
+
+
+@pytest.mark.usefixtures('foreign_keys')
+def test_patch_schedule_not_found_client(test_client: TestClient, schedule):
+    response = test_client.patch(
+        f'/schedules/{schedule.id}', json={'client_id': 999}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'detail': 'Client not found'}
+
+
+@pytest.mark.usefixtures('foreign_keys')
+def test_patch_schedule_not_found_client_or_service(
+    test_client: TestClient, schedule
+):
+    response = test_client.patch(
+        f'/schedules/{schedule.id}', json={'client_id': 999, 'service_id': 1}
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'detail': 'Client or service not found'}
+
+
+def test_patch_not_found_schedule(test_client: TestClient):
+    response = test_client.patch('/schedules/1', json={'shift': 'evening'})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'detail': 'Schedule not found'}
+
+
 def test_delete_schedule(test_client: TestClient, schedule):
     response = test_client.delete(f'/schedules/{schedule.id}')
 
@@ -274,3 +392,169 @@ def test_get_filtered_schedule_shift(
 
     assert response.status_code == status.HTTP_200_OK
     assert len(response.json()['schedules']) == expected_schedules
+
+
+def test_get_filtered_schedules_with_cursor(
+    test_client: TestClient, session: Session, client, service
+):
+    dates = [datetime.date(2024, 10, day) for day in (3, 1, 2, 1, 3)]
+    session.add_all(
+        ScheduleFactory.create_batch(
+            len(dates),
+            client_id=client.id,
+            service_id=service.id,
+            date=factory.Iterator(dates),
+            shift=ShiftEnum.MORNING,
+        )
+    )
+    session.commit()
+
+    pages = []
+    params = {'client_id': client.id, 'limit': 2}
+    while True:
+        body = test_client.get('/schedules/filter', params=params).json()
+        pages.append([
+            (schedule['date'], schedule['id'])
+            for schedule in body['schedules']
+        ])
+
+        if 'next_cursor' not in body:
+            break
+
+        params['cursor'] = body['next_cursor']
+
+    assert pages == [
+        [('2024-10-01', 2), ('2024-10-01', 4)],
+        [('2024-10-02', 3), ('2024-10-03', 1)],
+        [('2024-10-03', 5)],
+    ]
+
+
+def test_get_schedules_with_cursor(
+    test_client: TestClient, schedule, other_schedule
+):
+    first_page = test_client.get('/schedules', params={'limit': 1}).json()
+    second_page = test_client.get(
+        '/schedules', params={'limit': 1, 'cursor': first_page['next_cursor']}
+    ).json()
+
+    assert first_page['schedules'][0]['id'] == schedule.id
+    assert second_page['schedules'][0]['id'] == other_schedule.id
+
+
+def test_get_filtered_schedules_limit_above_maximum(test_client: TestClient):
+    response = test_client.get(
+        '/schedules/filter', params={'limit': MAX_PAGE_SIZE + 1}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_filtered_schedules_defaults_to_maximum_page_size(
+    test_client: TestClient, session: Session, client, service
+):
+    session.bulk_save_objects(
+        ScheduleFactory.create_batch(
+            MAX_PAGE_SIZE + 1, client_id=client.id, service_id=service.id
+        )
+    )
+    session.commit()
+
+    response = test_client.get('/schedules/filter')
+
+    assert len(response.json()['schedules']) == MAX_PAGE_SIZE
+    assert 'next_cursor' in response.json()
+
+
+def test_export_schedules_ndjson(
+    test_client: TestClient, schedule, other_schedule
+):
+    expected = sorted(
+        (
+            json.loads(SchedulePublic.model_validate(item).model_dump_json())
+            for item in (schedule, other_schedule)
+        ),
+        key=lambda item: (item['date'], item['shift'].upper(), item['id']),
+    )
+
+    response = test_client.get('/schedules/export')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.text.splitlines()] == (
+        expected
+    )
+
+
+def test_export_schedules_csv(
+    test_client: TestClient, session: Session, client, service
+):
+    session.bulk_save_objects(
+        ScheduleFactory.create_batch(
+            3,
+            client_id=client.id,
+            service_id=service.id,
+            date=datetime.date(2024, 10, 1),
+            shift=ShiftEnum.EVENING,
+            description='Cleaning',
+        )
+    )
+    session.commit()
+    client_columns = f'{client.id},{client.name},{service.type}'
+
+    response = test_client.get(
+        '/schedules/export',
+        params={'format': 'csv', 'client_id': client.id},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers['content-type'].startswith('text/csv')
+    assert response.text.splitlines() == [
+        'id,date,shift,description,client_id,client_name,service_type',
+        *(
+            f'{id},2024-10-01,evening,Cleaning,{client_columns}'
+            for id in (1, 2, 3)
+        ),
+    ]
+
+
+def test_export_schedules_with_invalid_date(test_client: TestClient):
+    response = test_client.get(
+        '/schedules/export',
+        params={'start_date': '2024-11-05', 'end_date': '2024-10-28'},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_create_schedules_bulk(test_client: TestClient, client, service):
+    schedule = {
+        'date': '2023-09-15',
+        'shift': 'morning',
+        'description': 'A scheduled maintenance service',
+    }
+
+    response = test_client.post(
+        '/schedules/bulk',
+        json=[
+            {**schedule, 'client_id': client.id, 'service_id': service.id},
+            {**schedule, 'client_id': 999, 'service_id': service.id},
+            {**schedule, 'client_id': client.id, 'service_id': 999},
+            {**schedule, 'client_id': client.id, 'service_id': service.id},
+        ],
+    )
+
+    expected = {
+        **schedule,
+        'client': {'id': client.id, 'name': client.name},
+        'service': {'type': service.type},
+    }
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {
+        'schedules': [{'id': 1, **expected}, {'id': 2, **expected}],
+        'errors': [
+            {'index': 1, 'detail': 'Client not found'},
+            {'index': 2, 'detail': 'Service not found'},
+        ],
+    }
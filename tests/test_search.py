@@ -0,0 +1,141 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db import queries
+from projeto_final_poo.db.queries import client_matches
+from projeto_final_poo.schemas.schemas import MAX_SEARCH_RESULTS
+
+
+def create_client(test_client: TestClient, name, neighborhood, **address):
+    return test_client.post(
+        '/clients',
+        json={
+            'name': name,
+            'phone_number': f'+55889{abs(hash(name)) % 10**8:08d}',
+            'street': address.get('street', 'Rua das Flores'),
+            'neighborhood': neighborhood,
+            'reference': address.get('reference', 'Perto da praça'),
+            'number': '10',
+        },
+    ).json()
+
+
+def search(test_client: TestClient, q, **params):
+    return test_client.get('/clients/search', params={'q': q, **params})
+
+
+def found(response):
+    return [client['name'] for client in response.json()['clients']]
+
+
+@pytest.fixture
+def clients(test_client: TestClient):
+    return [
+        create_client(test_client, 'João Silva', 'São Gerardo'),
+        create_client(
+            test_client, 'Maria Souza', 'Aldeota', street='Avenida Santos'
+        ),
+        create_client(test_client, 'Aldeota Reformas', 'Centro'),
+    ]
+
+
+@pytest.mark.usefixtures('clients')
+@pytest.mark.parametrize(
+    ('q', 'names'),
+    [
+        ('silv', ['João Silva']),
+        ('joao', ['João Silva']),
+        ('sao ger', ['João Silva']),
+        ('SANTOS maria', ['Maria Souza']),
+        ('praça', ['Aldeota Reformas', 'João Silva', 'Maria Souza']),
+        ('maria silva', []),
+    ],
+)
+def test_search_clients(test_client: TestClient, q, names):
+    response = search(test_client, q)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(found(response)) == names
+
+
+@pytest.mark.usefixtures('clients')
+def test_search_ranks_names_first(test_client: TestClient):
+    response = search(test_client, 'aldeota')
+
+    assert found(response) == ['Aldeota Reformas', 'Maria Souza']
+    assert response.json()['clients'][1]['addresses'][0]['neighborhood'] == (
+        'Aldeota'
+    )
+
+
+@pytest.mark.usefixtures('clients')
+def test_search_limit(test_client: TestClient):
+    response = search(test_client, 'rua', limit=1)
+
+    assert len(response.json()['clients']) == 1
+
+
+def test_search_follows_writes(test_client: TestClient, clients):
+    joao, maria, _ = clients
+    test_client.patch(f'/clients/{joao["id"]}', json={'name': 'John Smith'})
+    test_client.patch(
+        f'/address/{maria["addresses"][0]["id"]}',
+        json={'neighborhood': 'Meireles'},
+    )
+    test_client.post(
+        '/address',
+        json={
+            'client_id': joao['id'],
+            'street': 'Rua Nova',
+            'neighborhood': 'Benfica',
+            'reference': 'Esquina',
+            'number': '2',
+        },
+    )
+
+    assert found(search(test_client, 'silva')) == []
+    assert found(search(test_client, 'smith benfica')) == ['John Smith']
+    assert found(search(test_client, 'meireles')) == ['Maria Souza']
+    assert found(search(test_client, 'aldeota')) == ['Aldeota Reformas']
+
+    test_client.delete(f'/clients/{joao["id"]}')
+
+    assert found(search(test_client, 'smith')) == []
+
+
+@pytest.mark.usefixtures('clients')
+@pytest.mark.parametrize('q', ['"silva', 'silva OR', 'NEAR(a b)', '*', '-'])
+def test_search_ignores_query_syntax(test_client: TestClient, q):
+    response = search(test_client, q)
+
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.parametrize(
+    'params', [{'q': ''}, {}, {'q': 'a', 'limit': MAX_SEARCH_RESULTS + 1}]
+)
+def test_search_validation(test_client: TestClient, params):
+    response = test_client.get('/clients/search', params=params)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.usefixtures('clients')
+def test_search_fallback_off_sqlite(session: Session):
+    clients = session.scalars(client_matches('aldeota', 'postgresql')).all()
+
+    assert [client.name for client in clients] == [
+        'Maria Souza',
+        'Aldeota Reformas',
+    ]
+
+
+@pytest.mark.usefixtures('clients')
+def test_search_ranks_newest_candidates(test_client: TestClient, monkeypatch):
+    monkeypatch.setattr(queries, 'SEARCH_CANDIDATES', 1)
+
+    response = search(test_client, 'praça')
+
+    assert found(response) == ['Aldeota Reformas']
@@ -1,7 +1,12 @@
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
+from projeto_final_poo.db.models import Schedule
 from projeto_final_poo.schemas.schemas import ServicePublic
+from tests.conftest import ScheduleFactory, ServiceFactory
 
 
 def test_create_service(test_client: TestClient):
@@ -46,6 +51,21 @@ def test_get_services_with_services(
     }
 
 
+def test_get_services_with_cursor(test_client: TestClient, session: Session):
+    session.add_all(ServiceFactory.create_batch(3))
+    session.commit()
+
+    first_page = test_client.get('/services', params={'limit': 2}).json()
+    second_page = test_client.get(
+        '/services',
+        params={'limit': 2, 'cursor': first_page['next_cursor']},
+    ).json()
+
+    assert [service['id'] for service in first_page['services']] == [1, 2]
+    assert [service['id'] for service in second_page['services']] == [3]
+    assert 'next_cursor' not in second_page
+
+
 def test_get_service_by_id(test_client: TestClient, service):
     service_schema = ServicePublic.model_validate(service).model_dump()
     response = test_client.get(f'/services/{service.id}')
@@ -101,8 +121,93 @@ def test_delete_service(test_client: TestClient, service):
     assert response.json() == {'message': 'Service deleted'}
 
 
+@pytest.mark.usefixtures('foreign_keys')
+def test_delete_service_cascades_to_schedules(
+    test_client: TestClient, session: Session, client, service
+):
+    session.add_all(
+        ScheduleFactory.create_batch(
+            2, client_id=client.id, service_id=service.id
+        )
+    )
+    session.commit()
+
+    response = test_client.delete(f'/services/{service.id}')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert session.scalar(select(func.count()).select_from(Schedule)) == 0
+
+
 def test_delete_not_found_service(test_client: TestClient, service):
     response = test_client.delete(f'/services/{service.id + 1}')
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
     assert response.json() == {'detail': 'Service not found'}
+
+
+def test_create_services_bulk(test_client: TestClient):
+    response = test_client.post(
+        '/services/bulk',
+        json=[
+            {'type': 'Cleaning', 'description': 'Deep', 'price': 99.99},
+            {'type': 'Repair', 'description': 'Plumbing', 'price': 150.0},
+        ],
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {
+        'services': [
+            {
+                'id': 1,
+                'type': 'Cleaning',
+                'description': 'Deep',
+                'price': 99.99,
+            },
+            {
+                'id': 2,
+                'type': 'Repair',
+                'description': 'Plumbing',
+                'price': 150.0,
+            },
+        ],
+        'errors': [],
+    }
+
+
+def test_create_services_bulk_empty(test_client: TestClient):
+    response = test_client.post('/services/bulk', json=[])
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {'services': [], 'errors': []}
+
+
+def test_patch_service_in_one_statement(
+    test_client: TestClient, service, queries: list
+):
+    service_id, service_type = service.id, service.type
+
+    queries.clear()
+    response = test_client.patch(
+        f'/services/{service_id}', json={'price': 120.5}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['type'] == service_type
+    assert response.json()['price'] == 120.5  # noqa: PLR2004
+    assert len(queries) == 2  # noqa: PLR2004
+    assert queries[0].startswith('UPDATE services SET price=?')
+    assert queries[1].startswith('INSERT INTO table_versions')
+
+
+def test_patch_not_found_service(test_client: TestClient):
+    response = test_client.patch('/services/1', json={'price': 120.5})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.json() == {'detail': 'Service not found'}
+
+
+def test_patch_service_without_fields(test_client: TestClient, service):
+    response = test_client.patch(f'/services/{service.id}', json={})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'detail': 'No fields to update'}
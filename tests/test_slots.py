@@ -0,0 +1,267 @@
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from projeto_final_poo.db.connection import get_engine, get_session_factory
+from projeto_final_poo.db.models import (
+    Schedule,
+    Service,
+    ShiftEnum,
+    SlotOccupancy,
+    table_registry,
+)
+from projeto_final_poo.db.slots import TEAM, book_slot
+from projeto_final_poo.helpers.settings import env
+
+DAY = datetime.date(2024, 10, 1)
+DATE = DAY.isoformat()
+CAPACITY = 2
+CONCURRENT_BOOKINGS = 8
+
+
+@pytest.fixture(autouse=True)
+def capacity(monkeypatch):
+    monkeypatch.setattr(env, 'SCHEDULE_SLOTS_PER_SHIFT', CAPACITY)
+
+
+@pytest.fixture
+def post_schedule(test_client: TestClient, client, service):
+    # Through the API, unlike conftest's book, so the counters move.
+    def post_schedule(shift='morning', service_id=None):
+        return test_client.post(
+            '/schedules',
+            json={
+                'date': DATE,
+                'shift': shift,
+                'description': 'Slot test',
+                'client_id': client.id,
+                'service_id': service_id or service.id,
+            },
+        )
+
+    return post_schedule
+
+
+def booked(session: Session, service_id=TEAM, shift=ShiftEnum.MORNING):
+    return session.scalar(
+        select(SlotOccupancy.booked).where(
+            SlotOccupancy.date == DAY,
+            SlotOccupancy.shift == shift,
+            SlotOccupancy.service_id == service_id,
+        )
+    )
+
+
+def test_booking_counts_slot(session: Session, post_schedule, service):
+    post_schedule()
+
+    assert booked(session) == 1
+    assert booked(session, service.id) == 1
+
+
+def test_full_shift_is_conflict(session: Session, post_schedule):
+    for _ in range(CAPACITY):
+        assert post_schedule().status_code == status.HTTP_201_CREATED
+
+    response = post_schedule()
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json() == {'detail': 'Shift is fully booked'}
+    assert booked(session) == CAPACITY
+    assert (
+        post_schedule(shift='evening').status_code == status.HTTP_201_CREATED
+    )
+
+
+def test_service_capacity(
+    session: Session, post_schedule, service, other_service, monkeypatch
+):
+    monkeypatch.setattr(env, 'SERVICE_SLOTS_PER_SHIFT', {service.id: 1})
+    post_schedule()
+
+    response = post_schedule()
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    # The team counter bumped before the service one is rolled back.
+    assert booked(session) == 1
+    assert post_schedule(service_id=other_service.id).status_code == (
+        status.HTTP_201_CREATED
+    )
+
+
+def test_service_without_capacity_is_conflict(
+    session: Session, post_schedule, service, monkeypatch
+):
+    monkeypatch.setattr(env, 'SERVICE_SLOTS_PER_SHIFT', {service.id: 0})
+
+    response = post_schedule()
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert booked(session, service.id) is None
+
+
+def test_delete_schedule_releases_slot(
+    test_client: TestClient, session: Session, post_schedule
+):
+    ids = [post_schedule().json()['id'] for _ in range(CAPACITY)]
+
+    test_client.delete(f'/schedules/{ids[0]}')
+
+    assert booked(session) == CAPACITY - 1
+    assert post_schedule().status_code == status.HTTP_201_CREATED
+
+
+def test_update_schedule_moves_slot(
+    test_client: TestClient, session: Session, post_schedule, client, service
+):
+    id = post_schedule().json()['id']
+
+    response = test_client.put(
+        f'/schedules/{id}',
+        json={
+            'date': DATE,
+            'shift': 'evening',
+            'description': 'Moved',
+            'client_id': client.id,
+            'service_id': service.id,
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert booked(session) == 0
+    assert booked(session, shift=ShiftEnum.EVENING) == 1
+
+
+def test_patch_schedule_into_full_shift(
+    test_client: TestClient, session: Session, post_schedule
+):
+    for _ in range(CAPACITY):
+        post_schedule(shift='evening')
+    id = post_schedule().json()['id']
+
+    response = test_client.patch(f'/schedules/{id}', json={'shift': 'evening'})
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert session.get(Schedule, id).shift == ShiftEnum.MORNING
+    assert booked(session) == 1
+
+
+def test_delete_client_releases_slots(
+    test_client: TestClient, session: Session, post_schedule, client
+):
+    post_schedule()
+    post_schedule(shift='evening')
+
+    test_client.delete(f'/clients/{client.id}')
+
+    assert booked(session) == 0
+    assert booked(session, shift=ShiftEnum.EVENING) == 0
+
+
+def test_bulk_rejects_overflow(
+    test_client: TestClient, session: Session, client, service
+):
+    schedule = {
+        'date': DATE,
+        'shift': 'morning',
+        'description': 'Bulk',
+        'client_id': client.id,
+        'service_id': service.id,
+    }
+
+    response = test_client.post(
+        '/schedules/bulk',
+        json=[schedule, {**schedule, 'client_id': 999}, schedule, schedule],
+    )
+
+    assert len(response.json()['schedules']) == CAPACITY
+    assert response.json()['errors'] == [
+        {'index': 1, 'detail': 'Client not found'},
+        {'index': 3, 'detail': 'Shift is fully booked'},
+    ]
+    assert booked(session) == CAPACITY
+
+
+def test_bulk_service_without_capacity(
+    test_client: TestClient, session: Session, client, service, monkeypatch
+):
+    monkeypatch.setattr(env, 'SERVICE_SLOTS_PER_SHIFT', {service.id: 0})
+    schedule = {
+        'date': DATE,
+        'shift': 'morning',
+        'description': 'Bulk',
+        'client_id': client.id,
+        'service_id': service.id,
+    }
+
+    response = test_client.post('/schedules/bulk', json=[schedule])
+
+    assert response.json()['errors'] == [
+        {'index': 0, 'detail': 'Shift is fully booked'}
+    ]
+    assert booked(session, service.id) is None
+
+
+def test_async_full_shift_is_conflict(async_test_client: TestClient):
+    client_id = async_test_client.post(
+        '/clients',
+        json={
+            'name': 'John Doe',
+            'phone_number': '+5588911111111',
+            'street': 'Flower Street',
+            'neighborhood': 'Central',
+            'reference': 'Flat 102',
+            'number': '456',
+        },
+    ).json()['id']
+    service_id = async_test_client.post(
+        '/services',
+        json={'type': 'Cleaning', 'description': 'Deep', 'price': 10},
+    ).json()['id']
+    schedule = {
+        'date': DATE,
+        'shift': 'morning',
+        'description': 'Async',
+        'client_id': client_id,
+        'service_id': service_id,
+    }
+
+    responses = [
+        async_test_client.post('/schedules', json=schedule)
+        for _ in range(CAPACITY + 1)
+    ]
+
+    assert [r.status_code for r in responses] == [
+        *[status.HTTP_201_CREATED] * CAPACITY,
+        status.HTTP_409_CONFLICT,
+    ]
+
+
+def test_concurrent_bookings_never_overbook(database_url):
+    table_registry.metadata.create_all(get_engine())
+    session_factory = get_session_factory()
+    with session_factory() as session:
+        service = Service(type='Cleaning', description='Deep', price=10)
+        session.add(service)
+        session.commit()
+        slot = (DAY, ShiftEnum.MORNING, service.id)
+
+    def try_booking(_):
+        with session_factory() as session:
+            fits = book_slot(session, slot)
+            session.commit()
+            return fits
+
+    with ThreadPoolExecutor(CONCURRENT_BOOKINGS) as executor:
+        results = list(executor.map(try_booking, range(CONCURRENT_BOOKINGS)))
+
+    assert results.count(True) == CAPACITY
+    with session_factory() as session:
+        assert session.get(SlotOccupancy, (DAY, slot[1], TEAM)).booked == (
+            CAPACITY
+        )